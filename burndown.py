@@ -0,0 +1,240 @@
+"""Replay issue changelogs into daily burndown and scope change metrics"""
+from typing import List, Dict, Optional, Iterable
+from datetime import date, datetime, timedelta
+from metrics_calculator import COMPLETED_STATUSES
+
+
+class BurndownReplayer:
+    """Rebuild daily committed/remaining story points for a sprint from changelogs
+
+    Changelogs are consumed as a stream of per-issue records
+    ({'issue_id': ..., 'histories': [...]}). Each change is reduced to a delta
+    in a per-day bucket, so memory stays proportional to the number of issues
+    and sprint days rather than the changelog volume.
+    """
+
+    def __init__(self, sprint_id: int, start_date, end_date,
+                 story_point_fields: List[str], sprint_field_id: str):
+        """Initialize replayer for one sprint"""
+        self.sprint_id = str(sprint_id)
+        self.start_date = self._parse_date(start_date)
+        self.end_date = self._parse_date(end_date)
+        self.story_point_fields = set(story_point_fields)
+        self.sprint_field_id = sprint_field_id
+
+        if not self.start_date or not self.end_date:
+            raise ValueError(f"Sprint {sprint_id} has no start/end date")
+
+        # Stop at today for sprints that are still running
+        last_day = min(self.end_date, date.today())
+        self.day_count = max((last_day - self.start_date).days, 0) + 1
+
+        self.committed_deltas = [0.0] * self.day_count
+        self.remaining_deltas = [0.0] * self.day_count
+        self.scope_deltas = [0.0] * self.day_count
+        self.scope_added = 0.0
+        self.scope_removed = 0.0
+        self.re_estimated_points = 0.0
+        self.re_estimate_count = 0
+
+    def replay(self, issues: List[Dict], changelog_stream: Iterable[Dict]) -> Dict:
+        """Replay a changelog stream against the sprint's final issue states
+
+        An issue's records must arrive together (JiraClient.iter_issue_changelogs
+        merges pages per batch); each issue is replayed as soon as the next
+        one starts, so only one issue's history is held at a time. Issues
+        removed from the sprint arrive with their final state under 'issue'.
+        """
+        final_states = {str(issue.get('id')): issue for issue in issues if issue.get('id')}
+        replayed = set()
+        pending_id = None
+        pending_issue = None
+        pending_histories = []
+
+        for record in changelog_stream:
+            issue_id = str(record.get('issue_id'))
+            if issue_id != pending_id:
+                if pending_id is not None:
+                    self._replay_pending(final_states, pending_id, pending_issue, pending_histories)
+                    replayed.add(pending_id)
+                if issue_id in replayed:
+                    raise ValueError(f"Changelog records for issue {issue_id} are not contiguous")
+                pending_id = issue_id
+                pending_issue = None
+                pending_histories = []
+            pending_issue = pending_issue or record.get('issue')
+            pending_histories.extend(record.get('histories', []))
+
+        if pending_id is not None:
+            self._replay_pending(final_states, pending_id, pending_issue, pending_histories)
+
+        # Issues without any relevant changes were committed unchanged from the start
+        for issue in final_states.values():
+            self._replay_issue(issue, [])
+
+        return self.result()
+
+    def result(self) -> Dict:
+        """Build daily burndown series from the accumulated deltas"""
+        committed = []
+        remaining = []
+        committed_total = 0.0
+        remaining_total = 0.0
+        for day in range(self.day_count):
+            committed_total += self.committed_deltas[day]
+            remaining_total += self.remaining_deltas[day]
+            committed.append(round(committed_total, 2))
+            remaining.append(round(remaining_total, 2))
+
+        sprint_days = max((self.end_date - self.start_date).days, 1)
+        initial_commitment = committed[0] if committed else 0
+        ideal = [
+            round(max(initial_commitment * (1 - day / sprint_days), 0), 2)
+            for day in range(self.day_count)
+        ]
+        net_change = self.scope_added - self.scope_removed
+
+        return {
+            'days': [(self.start_date + timedelta(days=day)).isoformat() for day in range(self.day_count)],
+            'committed': committed,
+            'remaining': remaining,
+            'ideal': ideal,
+            'daily_scope_change': [round(delta, 2) for delta in self.scope_deltas],
+            'initial_commitment': initial_commitment,
+            'scope_added': round(self.scope_added, 2),
+            'scope_removed': round(self.scope_removed, 2),
+            're_estimated_points': round(self.re_estimated_points, 2),
+            're_estimate_count': self.re_estimate_count,
+            'scope_change_percent': round(net_change / initial_commitment * 100, 2) if initial_commitment > 0 else 0
+        }
+
+    def _replay_pending(self, final_states: Dict[str, Dict], issue_id: str, removed_issue: Optional[Dict],
+                        histories: List[Dict]):
+        """Replay a merged issue record against its final state"""
+        issue = final_states.pop(issue_id, None)
+        if issue is not None:
+            self._replay_issue(issue, histories)
+        else:
+            # Not on the final issue list, so the issue ended outside the sprint
+            self._replay_issue(removed_issue, histories, in_sprint=False)
+
+    def _replay_issue(self, issue: Optional[Dict], histories: List[Dict], in_sprint: bool = True):
+        """Replay one issue's changes into the day buckets, starting from its final state"""
+        histories = sorted(histories, key=lambda h: self._parse_datetime(h.get('created')) or datetime.min)
+
+        if issue is not None:
+            points = issue.get('story_points') or 0
+            done = (issue.get('status') or '').lower() in COMPLETED_STATUSES
+        else:
+            points, done, in_sprint = 0, False, False
+
+        # Initial state is the 'from' value of the first change to each field
+        seen = set()
+        for history in histories:
+            for item in history.get('items', []):
+                kind = self._item_kind(item)
+                if kind is None or kind in seen:
+                    continue
+                seen.add(kind)
+                if kind == 'points':
+                    points = self._to_points(item.get('fromString'))
+                elif kind == 'status':
+                    done = (item.get('fromString') or '').lower() in COMPLETED_STATUSES
+                elif kind == 'sprint':
+                    in_sprint = self.sprint_id in self._sprint_ids(item.get('from'))
+
+        committed, remaining = self._contribution(points, done, in_sprint)
+        self.committed_deltas[0] += committed
+        self.remaining_deltas[0] += remaining
+
+        for history in histories:
+            changed_at = self._parse_datetime(history.get('created'))
+            if changed_at is None:
+                continue
+            day = (changed_at.date() - self.start_date).days
+            if day >= self.day_count:
+                continue
+            day = max(day, 0)
+
+            old_points = points
+            old_in_sprint = in_sprint
+            for item in history.get('items', []):
+                kind = self._item_kind(item)
+                if kind == 'points':
+                    points = self._to_points(item.get('toString'))
+                elif kind == 'status':
+                    done = (item.get('toString') or '').lower() in COMPLETED_STATUSES
+                elif kind == 'sprint':
+                    in_sprint = self.sprint_id in self._sprint_ids(item.get('to'))
+
+            new_committed, new_remaining = self._contribution(points, done, in_sprint)
+            committed_delta = new_committed - committed
+            self.committed_deltas[day] += committed_delta
+            self.remaining_deltas[day] += new_remaining - remaining
+            committed, remaining = new_committed, new_remaining
+
+            # Only changes after the sprint started count as scope change
+            if changed_at.date() <= self.start_date or committed_delta == 0:
+                continue
+            self.scope_deltas[day] += committed_delta
+            if old_in_sprint and in_sprint and points != old_points:
+                self.re_estimated_points += committed_delta
+                self.re_estimate_count += 1
+            elif committed_delta > 0:
+                self.scope_added += committed_delta
+            else:
+                self.scope_removed += -committed_delta
+
+    def _item_kind(self, item: Dict) -> Optional[str]:
+        """Classify a changelog item as a points, status or sprint change"""
+        field_id = item.get('fieldId')
+        field = (item.get('field') or '').lower()
+        if field_id == self.sprint_field_id or field == 'sprint':
+            return 'sprint'
+        if field_id in self.story_point_fields or field in ('story points', 'story point estimate'):
+            return 'points'
+        if field_id == 'status' or field == 'status':
+            return 'status'
+        return None
+
+    def _contribution(self, points: float, done: bool, in_sprint: bool):
+        """Committed and remaining points contributed by an issue state"""
+        committed = points if in_sprint else 0
+        return committed, (0 if done else committed)
+
+    def _sprint_ids(self, value) -> List[str]:
+        """Parse a Sprint field changelog value ("123, 456") into sprint ids"""
+        if not value:
+            return []
+        return [part.strip() for part in str(value).split(',') if part.strip()]
+
+    def _to_points(self, value) -> float:
+        """Parse a story points changelog value"""
+        try:
+            return float(value) if value not in (None, '') else 0
+        except (ValueError, TypeError):
+            return 0
+
+    def _parse_datetime(self, value) -> Optional[datetime]:
+        """Parse a changelog timestamp (ISO string or epoch milliseconds)"""
+        if isinstance(value, (int, float)):
+            return datetime(1970, 1, 1) + timedelta(seconds=value / 1000 if value > 1e11 else value)
+        if isinstance(value, str) and value:
+            try:
+                return datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S')
+            except ValueError:
+                return None
+        return None
+
+    def _parse_date(self, value) -> Optional[date]:
+        """Parse a sprint start/end date"""
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        if isinstance(value, str) and value:
+            try:
+                return datetime.strptime(value.split('T')[0], '%Y-%m-%d').date()
+            except ValueError:
+                return None
+        return None
@@ -0,0 +1,451 @@
+"""Chart specifications and matplotlib rendering for reports
+
+A chart spec is a plain dict describing what to draw, independent of the
+backend that draws it:
+
+    {
+        'type': 'bar' | 'line',
+        'title': str,
+        'y_label': str,
+        'categories': [str, ...],
+        'series': [{'name': str, 'values': [...], 'colors': [...] or 'color': str,
+                    'dashed': bool, 'marker': bool}, ...],
+        'value_format': '{:.1f}' or None,   # data labels on bars
+        'annotation': str or None,          # highlighted note inside the plot
+        'legend': bool,
+        'rotate_labels': bool,
+        'overlap': bool                     # bar series share positions instead of being grouped
+    }
+"""
+import io
+import os
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Optional
+from metrics_cache import stable_hash
+import config
+
+
+BASELINE_COLOR = '#FF6B6B'
+POST_AI_COLOR = '#4ECDC4'
+
+# Part of chart cache keys; bump when draw_chart output changes so cached images are re-rendered
+CHART_RENDER_VERSION = 2
+
+# Shared process pool for CPU-bound matplotlib rendering (created on first use)
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def velocity_chart_spec(improvement: Dict) -> Dict:
+    """Spec for baseline vs post-AI velocity chart"""
+    return {
+        'type': 'bar',
+        'title': 'Velocity Comparison',
+        'y_label': 'Story Points',
+        'categories': ['Baseline\n(Before AI)', 'Post-AI'],
+        'series': [{
+            'name': 'Velocity',
+            'values': [improvement.get('baseline_velocity', 0), improvement.get('post_ai_velocity', 0)],
+            'colors': [BASELINE_COLOR, POST_AI_COLOR]
+        }],
+        'value_format': '{:.1f}'
+    }
+
+
+def defect_chart_spec(defect_metrics: Dict) -> Dict:
+    """Spec for baseline vs post-AI average defects chart"""
+    return {
+        'type': 'bar',
+        'title': 'Defect Comparison',
+        'y_label': 'Average Defects',
+        'categories': ['Baseline\n(Before AI)', 'Post-AI'],
+        'series': [{
+            'name': 'Average Defects',
+            'values': [defect_metrics.get('baseline_avg_defects', 0), defect_metrics.get('post_ai_avg_defects', 0)],
+            'colors': [BASELINE_COLOR, POST_AI_COLOR]
+        }],
+        'value_format': '{:.1f}'
+    }
+
+
+def ai_comparison_chart_spec(current_metrics: Dict) -> Dict:
+    """Spec for estimated (without AI) vs actual (with AI) story points chart"""
+    time_saved = current_metrics.get('time_saved_total', 0)
+    annotation = None
+    if time_saved > 0:
+        annotation = f"Time Saved: {time_saved} SP ({current_metrics.get('time_saved_percent', 0)}%)"
+
+    return {
+        'type': 'bar',
+        'title': 'AI Impact: Story Points Comparison',
+        'y_label': 'Story Points',
+        'categories': ['Estimated\n(Without AI)', 'Actual\n(With AI)'],
+        'series': [{
+            'name': 'Story Points',
+            'values': [
+                current_metrics.get('ai_story_points_committed', 0),
+                current_metrics.get('committed_story_points', 0)
+            ],
+            'colors': [BASELINE_COLOR, POST_AI_COLOR]
+        }],
+        'value_format': '{:.1f} SP',
+        'annotation': annotation
+    }
+
+
+def burndown_chart_spec(burndown: Dict) -> Dict:
+    """Spec for daily burndown line chart"""
+    return {
+        'type': 'line',
+        'title': 'Daily Burndown',
+        'y_label': 'Story Points',
+        'categories': [day[5:] for day in burndown.get('days', [])],  # MM-DD
+        'series': [
+            {'name': 'Committed', 'values': burndown.get('committed', []), 'color': BASELINE_COLOR},
+            {'name': 'Remaining', 'values': burndown.get('remaining', []), 'color': POST_AI_COLOR, 'marker': True},
+            {'name': 'Ideal', 'values': burndown.get('ideal', []), 'color': '#999999', 'dashed': True}
+        ],
+        'legend': True,
+        'rotate_labels': True
+    }
+
+
+def scope_change_chart_spec(history: List[Dict]) -> Dict:
+    """Spec for per-sprint scope added/removed chart"""
+    return {
+        'type': 'bar',
+        'title': 'Scope Change per Sprint',
+        'y_label': 'Story Points',
+        'categories': [sprint['sprint_name'] for sprint in history],
+        'series': [
+            {'name': 'Added', 'values': [sprint['scope_added'] for sprint in history], 'color': BASELINE_COLOR},
+            {'name': 'Removed', 'values': [-sprint['scope_removed'] for sprint in history], 'color': POST_AI_COLOR}
+        ],
+        'overlap': True,
+        'legend': True,
+        'rotate_labels': True
+    }
+
+
+def team_velocity_chart_spec(teams: List[Dict]) -> Dict:
+    """Spec for per-team baseline vs post-AI velocity chart (portfolio roll-up)"""
+    return {
+        'type': 'bar',
+        'title': 'Velocity by Team',
+        'y_label': 'Story Points',
+        'categories': [team['team'] for team in teams],
+        'series': [
+            {'name': 'Baseline', 'values': [team['velocity_improvement']['baseline_velocity'] for team in teams],
+             'color': BASELINE_COLOR},
+            {'name': 'Post-AI', 'values': [team['velocity_improvement']['post_ai_velocity'] for team in teams],
+             'color': POST_AI_COLOR}
+        ],
+        'legend': True,
+        'rotate_labels': len(teams) > 4
+    }
+
+
+class ChartCache:
+    """On-disk LRU cache of rendered chart images
+    
+    Entries are keyed by a hash of the chart spec (type, values, labels, ...),
+    the chart size and DPI. File modification times track recency; the least
+    recently used images are evicted once the cache exceeds max_bytes.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        """Initialize chart cache"""
+        self.cache_dir = cache_dir or os.path.join(config.Config.CACHE_DIR, 'charts')
+        self.max_bytes = max_bytes if max_bytes is not None else config.Config.CHART_CACHE_MAX_MB * 1024 * 1024
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def key(self, spec: Dict, width: float, height: float, dpi: int, optimize: bool = False) -> str:
+        """Build cache key for a chart spec rendered at a given size"""
+        return stable_hash({
+            'spec': spec, 'width': round(width, 3), 'height': round(height, 3), 'dpi': dpi, 'optimize': optimize,
+            'version': CHART_RENDER_VERSION
+        })
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Get cached image bytes, marking the entry as recently used"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path, None)
+        except OSError:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return data
+    
+    def put(self, key: str, data: bytes):
+        """Store image bytes and evict old entries if over the size limit"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+            self._evict()
+        except OSError as e:
+            print(f"WARNING: Could not write chart cache entry: {e}")
+    
+    def render(self, spec: Dict, width: float, height: float, dpi: Optional[int] = None,
+               optimize: Optional[bool] = None) -> bytes:
+        """Render a chart spec to PNG, reusing a cached image when available"""
+        dpi, optimize = _image_settings(dpi, optimize)
+        key = self.key(spec, width, height, dpi, optimize)
+        data = self.get(key)
+        if data is None:
+            data = render_chart_png(spec, width, height, dpi, optimize)
+            self.put(key, data)
+        return data
+    
+    def _evict(self):
+        """Remove least recently used entries until under max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.png'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+    
+    def _path(self, key: str) -> str:
+        """Get on-disk path for a key"""
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Get the shared chart rendering process pool, creating it on first use"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            # Spawn (rather than fork) so workers are safe to start from threaded callers
+            _render_pool = ProcessPoolExecutor(
+                max_workers=config.Config.CHART_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            atexit.register(shutdown_render_pool)
+        return _render_pool
+
+
+def shutdown_render_pool():
+    """Shut down the shared rendering pool"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=True)
+            _render_pool = None
+
+
+def submit_chart_render(spec: Dict, width: float, height: float, dpi: Optional[int] = None,
+                        cache: Optional[ChartCache] = None, optimize: Optional[bool] = None) -> Future:
+    """Render a chart spec to PNG bytes in the process pool
+    
+    Returns a Future. Cached images resolve immediately; newly rendered ones
+    are written to the cache when they complete. With CHART_RENDER_WORKERS=0
+    charts are rendered in-process.
+    """
+    dpi, optimize = _image_settings(dpi, optimize)
+    key = None
+    if cache is not None:
+        key = cache.key(spec, width, height, dpi, optimize)
+        data = cache.get(key)
+        if data is not None:
+            future = Future()
+            future.set_result(data)
+            return future
+    
+    future = None
+    if config.Config.CHART_RENDER_WORKERS > 0:
+        try:
+            future = get_render_pool().submit(render_chart_png, spec, width, height, dpi, optimize)
+        except BrokenProcessPool:
+            # Drop the broken pool so the next call starts a fresh one
+            print("WARNING: Chart rendering pool is broken, rendering in-process")
+            shutdown_render_pool()
+    if future is None:
+        future = Future()
+        try:
+            future.set_result(render_chart_png(spec, width, height, dpi, optimize))
+        except Exception as e:
+            future.set_exception(e)
+    
+    if cache is not None:
+        def store(done: Future):
+            if not done.cancelled() and done.exception() is None:
+                cache.put(key, done.result())
+        future.add_done_callback(store)
+    return future
+
+
+def _figure(width: float, height: float):
+    """Create a standalone figure and axes (width/height in inches)
+
+    Figures are built with the object API rather than pyplot, which keeps
+    global figure state, so charts can be rendered from several threads at
+    once. matplotlib is imported on first use so metrics-only commands skip it.
+    """
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(width, height))
+    return fig, fig.add_subplot()
+
+
+def _svg_settings():
+    """Apply the SVG output settings once per process
+
+    The SVG backend only reads these from rcParams. They are set to fixed
+    values and never restored, so concurrent renders always see the same
+    settings (a temporary rc_context would race with other threads).
+    """
+    global _svg_configured
+    with _svg_settings_lock:
+        if not _svg_configured:
+            import matplotlib
+            # Fixed salt keeps element ids (and so the output) stable across runs
+            matplotlib.rcParams['svg.hashsalt'] = 'velocity-report'
+            matplotlib.rcParams['svg.fonttype'] = 'none'
+            _svg_configured = True
+
+
+_svg_configured = False
+_svg_settings_lock = threading.Lock()
+
+
+def _image_settings(dpi: Optional[int], optimize: Optional[bool]):
+    """Resolve image DPI and PNG optimization, defaulting to the configured values"""
+    return (dpi or config.Config.CHART_IMAGE_DPI,
+            config.Config.CHART_PNG_OPTIMIZE if optimize is None else optimize)
+
+
+def render_chart_png(spec: Dict, width: float, height: float, dpi: Optional[int] = None,
+                     optimize: bool = False) -> bytes:
+    """Render a chart spec to PNG bytes with matplotlib (width/height in inches)
+    
+    The image is exactly width x height inches at dpi, so it fills the target
+    frame without being stretched. Output is deterministic for a given spec,
+    letting identical charts share one image part in the deck.
+    """
+    dpi = dpi or config.Config.CHART_IMAGE_DPI
+    fig, ax = _figure(width, height)
+    draw_chart(ax, spec)
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi)
+    
+    data = buf.getvalue()
+    return optimize_png(data) if optimize else data
+
+
+def render_chart_svg(spec: Dict, width: float, height: float) -> str:
+    """Render a chart spec to an inline SVG document (width/height in inches)"""
+    _svg_settings()
+    fig, ax = _figure(width, height)
+    draw_chart(ax, spec)
+    fig.tight_layout()
+
+    buf = io.StringIO()
+    fig.savefig(buf, format='svg', metadata={'Date': None})
+    
+    svg = buf.getvalue()
+    # Drop the XML prolog so the SVG can be embedded in HTML
+    return svg[svg.index('<svg'):]
+
+
+def optimize_png(data: bytes) -> bytes:
+    """Losslessly shrink a PNG (drop an opaque alpha channel, palette if few colors, max compression)"""
+    from PIL import Image
+    
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    if image.mode == 'RGBA' and image.getextrema()[3][0] == 255:
+        image = image.convert('RGB')
+    if image.mode == 'RGB' and image.getcolors(256) is not None:
+        # At most 256 distinct colors, so the adaptive palette is exact
+        image = image.convert('P', palette=Image.ADAPTIVE, colors=256)
+    
+    buf = io.BytesIO()
+    image.save(buf, format='PNG', optimize=True)
+    optimized = buf.getvalue()
+    return optimized if len(optimized) < len(data) else data
+
+
+def draw_chart(ax, spec: Dict):
+    """Draw a chart spec onto matplotlib axes"""
+    categories = spec.get('categories', [])
+
+    if spec['type'] == 'line':
+        for series in spec['series']:
+            ax.plot(
+                categories, series['values'],
+                color=series.get('color'),
+                linewidth=1 if series.get('dashed') else 2,
+                linestyle='--' if series.get('dashed') else '-',
+                marker='o' if series.get('marker') else None,
+                label=series['name']
+            )
+    else:
+        # Series are grouped side by side within each category, like the native
+        # clustered bar chart, unless the spec asks for them to overlap
+        series_list = spec['series']
+        grouped = len(series_list) > 1 and not spec.get('overlap')
+        width = 0.8 / len(series_list) if grouped else 0.8
+        positions = range(len(categories))
+        for i, series in enumerate(series_list):
+            offset = width * (i - (len(series_list) - 1) / 2) if grouped else 0
+            bars = ax.bar(
+                [position + offset for position in positions], series['values'], width=width,
+                color=series.get('colors') or series.get('color'),
+                alpha=0.8, label=series['name']
+            )
+            if spec.get('value_format'):
+                # Add value labels on bars
+                for bar in bars:
+                    bar_height = bar.get_height()
+                    ax.text(bar.get_x() + bar.get_width() / 2., bar_height,
+                            spec['value_format'].format(bar_height),
+                            ha='center', va='bottom', fontsize=12, fontweight='bold')
+        ax.set_xticks(list(positions))
+        ax.set_xticklabels(categories)
+        if spec.get('overlap'):
+            ax.axhline(0, color='#404040', linewidth=1)
+
+    ax.set_ylabel(spec.get('y_label', ''), fontsize=12, fontweight='bold')
+    ax.set_title(spec.get('title', ''), fontsize=14, fontweight='bold', pad=20)
+    ax.grid(axis='y', alpha=0.3)
+
+    if spec.get('legend'):
+        ax.legend()
+    if spec.get('rotate_labels'):
+        for label in ax.get_xticklabels():
+            label.set_rotation(45)
+            label.set_horizontalalignment('right')
+
+    if spec.get('annotation'):
+        values = [value for series in spec['series'] for value in series['values']] or [0]
+        ax.text(0.5, max(values) * 0.9, spec['annotation'],
+                ha='center', va='center', fontsize=11, fontweight='bold',
+                bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7))
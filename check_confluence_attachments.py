@@ -2,18 +2,87 @@
 """Check Confluence attachments and optionally update page content"""
 import os
 import sys
+import argparse
 from confluence_uploader import ConfluenceUploader
 from datetime import datetime
+import config
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Check Confluence report attachments, update page content or prune old reports',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python check_confluence_attachments.py                      # List attachments, ask to update the page
+  python check_confluence_attachments.py --auto               # Update page content without asking
+  python check_confluence_attachments.py --prune --dry-run    # Show what pruning would remove
+  python check_confluence_attachments.py --prune --keep 5     # Keep the newest 5 reports per team
+  python check_confluence_attachments.py --prune --archive archive/   # Download before deleting
+        """
+    )
+    parser.add_argument('--auto', action='store_true',
+                        help='Update page content without prompting')
+    parser.add_argument('--page-id',
+                        help='Confluence page id (default: CONFLUENCE_PAGE_ID)')
+    parser.add_argument('--prune', action='store_true',
+                        help='Delete all but the newest reports of each team')
+    parser.add_argument('--keep', type=int, default=config.Config.CONFLUENCE_KEEP_REPORTS,
+                        help=f'Reports to keep per team when pruning (default: {config.Config.CONFLUENCE_KEEP_REPORTS})')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='With --prune, only report what would be removed')
+    parser.add_argument('--archive', metavar='DIR',
+                        help='With --prune, download each report into DIR before deleting it')
+    args = parser.parse_args()
+    if args.keep < 1:
+        parser.error('--keep must be at least 1')
+    return args
+
+
+def prune(uploader: ConfluenceUploader, args):
+    """Apply the retention policy and refresh the page's report links"""
+    print("\n" + "="*60)
+    print(f"Report Retention (keep newest {args.keep} per team){' - DRY RUN' if args.dry_run else ''}")
+    print("="*60 + "\n")
+    
+    plan = uploader.plan_retention(args.keep)
+    if not plan['prune']:
+        print("✓ Nothing to prune")
+        return
+    
+    if args.dry_run:
+        for att in plan['prune']:
+            size = att.get('extensions', {}).get('fileSize', 0) or 0
+            print(f"  Would remove: {att.get('title', 'Unknown')} ({size / (1024 * 1024):.1f} MB)")
+        print(f"\n{len(plan['prune'])} report(s) would be removed, "
+              f"reclaiming {plan['prune_bytes'] / (1024 * 1024):.1f} MB ({len(plan['keep'])} kept)")
+        return
+    
+    summary = uploader.prune_reports(args.keep, archive_dir=args.archive)
+    print(f"\n✓ Removed {summary['pruned']} report(s), reclaimed {summary['bytes_reclaimed'] / (1024 * 1024):.1f} MB"
+          f" ({summary['kept']} kept, {summary['failed']} failed)")
+    if args.archive and summary['pruned']:
+        print(f"  Archived copies in {args.archive}")
+    
+    if summary['pruned']:
+        # Drop links to removed reports
+        print("\nUpdating page content...")
+        uploader.update_reports_section()
 
 
 def main():
     """Check attachments and update page content"""
+    args = parse_args()
+    
     print("="*60)
     print("Confluence Attachments Checker")
     print("="*60)
     
     try:
         uploader = ConfluenceUploader()
+        if args.page_id:
+            uploader.page_id = args.page_id
         page_id = uploader.page_id
         
         if not page_id:
@@ -67,6 +136,10 @@ def main():
             for i, att in enumerate(other_files, 1):
                 print(f"    {i}. {att.get('title', 'Unknown')}")
         
+        if args.prune:
+            prune(uploader, args)
+            return
+        
         # Ask if user wants to update page content
         print("\n" + "="*60)
         print("Page Content Update")
@@ -74,7 +147,7 @@ def main():
         print("\nAttachments are uploaded but may not be visible in page content.")
         print("Would you like to add attachment links to the page content?")
         
-        if len(sys.argv) > 1 and sys.argv[1] == '--auto':
+        if args.auto:
             update = True
         else:
             response = input("\nUpdate page content? (y/n): ").strip().lower()
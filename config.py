@@ -22,21 +22,97 @@ class Config:
     # AI Story Points Field ID (optional - set after creating custom field in Jira)
     AI_STORY_POINTS_FIELD_ID = os.getenv('AI_STORY_POINTS_FIELD_ID', '')
     
+    # Local cache directory (team summaries, changelogs, computed metrics)
+    CACHE_DIR = os.getenv('CACHE_DIR', 'cache')
+    
+    # Fetch assignee/components for per-person and per-component breakdowns
+    METRICS_BREAKDOWNS = os.getenv('METRICS_BREAKDOWNS', 'false').lower() in ('1', 'true', 'yes')
+    
+    # Replay issue changelogs for burndown and scope change slides
+    FETCH_CHANGELOGS = os.getenv('FETCH_CHANGELOGS', 'false').lower() in ('1', 'true', 'yes')
+    # Sprint custom field id (used to detect issues added/removed mid-sprint)
+    SPRINT_FIELD_ID = os.getenv('SPRINT_FIELD_ID', 'customfield_10020')
+    
+    # Keep only aggregate metrics for historical sprints (raw issues are dropped
+    # or, with SPILL_HISTORICAL_ISSUES, written to CACHE_DIR/issues)
+    HISTORY_SUMMARY_ONLY = os.getenv('HISTORY_SUMMARY_ONLY', 'true').lower() in ('1', 'true', 'yes')
+    SPILL_HISTORICAL_ISSUES = os.getenv('SPILL_HISTORICAL_ISSUES', 'false').lower() in ('1', 'true', 'yes')
+    
+    # Memoize computed metrics (in memory and under CACHE_DIR/metrics)
+    METRICS_CACHE_ENABLED = os.getenv('METRICS_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_CACHE_SIZE = int(os.getenv('METRICS_CACHE_SIZE', '128'))
+    # On-disk tier (metrics JSON and reused decks) is pruned least recently used first above this size in MB
+    METRICS_CACHE_MAX_MB = float(os.getenv('METRICS_CACHE_MAX_MB', '500'))
+    
+    # Chart backend for presentations: 'native' (editable charts) or 'matplotlib' (PNG images)
+    CHART_BACKEND = os.getenv('CHART_BACKEND', 'native')
+    # Cache rendered matplotlib charts under CACHE_DIR/charts (LRU, size in MB)
+    CHART_CACHE_ENABLED = os.getenv('CHART_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    CHART_CACHE_MAX_MB = float(os.getenv('CHART_CACHE_MAX_MB', '100'))
+    # Chart image resolution in pixels per inch of the frame the chart fills
+    CHART_IMAGE_DPI = int(os.getenv('CHART_IMAGE_DPI', '110'))
+    # Lossless PNG optimization pass for chart images (slower to render, smaller decks)
+    CHART_PNG_OPTIMIZE = os.getenv('CHART_PNG_OPTIMIZE', 'false').lower() in ('1', 'true', 'yes')
+    # Skip Confluence uploads whose underlying metrics match the last upload
+    CONFLUENCE_SKIP_UNCHANGED = os.getenv('CONFLUENCE_SKIP_UNCHANGED', 'true').lower() in ('1', 'true', 'yes')
+    # New attachments sent per multipart request when uploading several reports
+    CONFLUENCE_UPLOAD_BATCH_SIZE = int(os.getenv('CONFLUENCE_UPLOAD_BATCH_SIZE', '5'))
+    # Seconds a page's attachment listing is reused within a run
+    CONFLUENCE_ATTACHMENT_CACHE_TTL = float(os.getenv('CONFLUENCE_ATTACHMENT_CACHE_TTL', '60'))
+    # Report retention (check_confluence_attachments.py --prune): reports kept per team,
+    # deletes per batch and seconds between batches
+    CONFLUENCE_KEEP_REPORTS = int(os.getenv('CONFLUENCE_KEEP_REPORTS', '10'))
+    CONFLUENCE_DELETE_BATCH_SIZE = int(os.getenv('CONFLUENCE_DELETE_BATCH_SIZE', '5'))
+    CONFLUENCE_DELETE_INTERVAL = float(os.getenv('CONFLUENCE_DELETE_INTERVAL', '1'))
+    # Background upload queue: pending reports, retries per report and initial retry delay (seconds)
+    UPLOAD_QUEUE_SIZE = int(os.getenv('UPLOAD_QUEUE_SIZE', '2'))
+    UPLOAD_MAX_RETRIES = int(os.getenv('UPLOAD_MAX_RETRIES', '3'))
+    UPLOAD_RETRY_BACKOFF = float(os.getenv('UPLOAD_RETRY_BACKOFF', '2'))
+    # Teams processed concurrently by main.py (--jobs)
+    PARALLEL_JOBS = int(os.getenv('PARALLEL_JOBS', '1'))
+    # Staged pipeline (--pipeline): worker threads per stage and items buffered between stages
+    PIPELINE_FETCH_WORKERS = int(os.getenv('PIPELINE_FETCH_WORKERS', '4'))
+    PIPELINE_COMPUTE_WORKERS = int(os.getenv('PIPELINE_COMPUTE_WORKERS', '1'))
+    PIPELINE_RENDER_WORKERS = int(os.getenv('PIPELINE_RENDER_WORKERS', '2'))
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '2'))
+    # Daemon mode (--daemon): default cron schedule and per-team overrides ('Team=cron;Other=cron')
+    DAEMON_SCHEDULE = os.getenv('DAEMON_SCHEDULE', '0 7 * * 1-5')
+    TEAM_SCHEDULES = os.getenv('TEAM_SCHEDULES', '')
+    # Output directory for static dashboard snapshots (--snapshot)
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', 'snapshots')
+    # Optional .pptx template with pre-styled layouts and named placeholders
+    PPT_TEMPLATE = os.getenv('PPT_TEMPLATE', '')
+    # Worker processes for matplotlib rendering (0 renders in-process)
+    CHART_RENDER_WORKERS = int(os.getenv('CHART_RENDER_WORKERS', str(os.cpu_count() or 1)))
+    
     # Teams Configuration
-    # Format: team_name:board_id:project_key
+    # Format: team_name:board_id:project_key[:capacity]
     TEAMS_CONFIG = os.getenv('TEAMS', 'ELECOM:58:ELECOM')
     
+    # Portfolio roll-up configuration
+    # Sprint length (days) that team velocities are normalized to
+    SPRINT_LENGTH_DAYS = int(os.getenv('SPRINT_LENGTH_DAYS', '14'))
+    # How long cached per-team summaries are reused by --portfolio (hours)
+    PORTFOLIO_CACHE_TTL_HOURS = float(os.getenv('PORTFOLIO_CACHE_TTL_HOURS', '24'))
+    
     @classmethod
     def get_teams(cls) -> List[Dict[str, str]]:
         """Parse teams configuration and return list of team configs"""
         teams = []
         for team_config in cls.TEAMS_CONFIG.split(','):
             parts = team_config.strip().split(':')
-            if len(parts) == 3:
+            if len(parts) in (3, 4):
+                # Optional capacity (e.g. headcount) used to weight portfolio roll-ups
+                try:
+                    capacity = float(parts[3]) if len(parts) == 4 else 1.0
+                except ValueError:
+                    print(f"WARNING: Invalid capacity for team {parts[0]}, using 1")
+                    capacity = 1.0
                 teams.append({
                     'name': parts[0],
                     'board_id': parts[1],
-                    'project_key': parts[2]
+                    'project_key': parts[2],
+                    'capacity': capacity
                 })
         return teams
     
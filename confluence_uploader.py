@@ -1,13 +1,133 @@
 """Confluence API client for uploading reports to wiki pages"""
 import os
+import re
+import json
+import time
+import uuid
+import threading
 import requests
-from typing import Optional, List, Dict
+from datetime import datetime
+from typing import Optional, List, Dict, Union, BinaryIO, Iterator
+from metrics_cache import stable_hash
 import config
 
 
+PPTX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+
+# Tag appended to attachment comments: [report:<key> hash:<content hash prefix>]
+REPORT_TAG_PATTERN = re.compile(r'\[report:(?P<key>[^\]]+?) hash:(?P<hash>[0-9a-f]+)\]')
+REPORT_HASH_LENGTH = 16
+
+# The generated reports section, from its heading to the end of the latest reports list
+REPORTS_SECTION_PATTERN = re.compile(r'<h2>Sprint Velocity Reports</h2>.*?</ul>', re.DOTALL)
+
+# Generated report file names: TEAM_velocity_report_YYYYMMDD_HHMMSS.pptx
+REPORT_FILE_PATTERN = re.compile(r'^(?P<team>.+)_velocity_report_(?P<timestamp>\d{8}_\d{6})\.pptx$')
+
+
+class MultipartStream:
+    """multipart/form-data request body that streams file parts from disk
+    
+    Parts are (name, value) form fields or (name, file_name, path, content_type)
+    files. The body is produced on read(), so only one chunk of one file is in
+    memory at a time; __len__ lets requests send a Content-Length header.
+    """
+    
+    def __init__(self, fields: List[tuple], files: List[tuple]):
+        """Build the part layout (without reading any file contents)"""
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self._segments = []
+        for name, value in fields:
+            self._segments.append(self._part_header(name) + str(value).encode('utf-8') + b'\r\n')
+        for name, file_name, path, content_type in files:
+            self._segments.append(self._part_header(name, file_name, content_type))
+            self._segments.append(path)
+            self._segments.append(b'\r\n')
+        self._segments.append(f"--{self.boundary}--\r\n".encode('utf-8'))
+        self._length = sum(
+            os.path.getsize(segment) if isinstance(segment, str) else len(segment) for segment in self._segments
+        )
+        self._index = 0
+        self._current = None
+    
+    def __len__(self) -> int:
+        """Total body length in bytes"""
+        return self._length
+    
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes of the body (all remaining if size < 0)"""
+        chunks = []
+        remaining = size
+        while self._index < len(self._segments) and (size < 0 or remaining > 0):
+            if self._current is None:
+                segment = self._segments[self._index]
+                self._current = open(segment, 'rb') if isinstance(segment, str) else _BytesReader(segment)
+            chunk = self._current.read(remaining if size >= 0 else -1)
+            if not chunk:
+                self._current.close()
+                self._current = None
+                self._index += 1
+                continue
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
+    
+    def _part_header(self, name: str, file_name: Optional[str] = None, content_type: Optional[str] = None) -> bytes:
+        """Boundary and headers for one part"""
+        disposition = f'form-data; name="{name}"'
+        if file_name is not None:
+            disposition += f'; filename="{file_name}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode('utf-8')
+
+
+class _BytesReader:
+    """Minimal file-like reader over bytes"""
+    
+    def __init__(self, data: bytes):
+        self._data = data
+        self._position = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._data) if size < 0 else self._position + size
+        chunk = self._data[self._position:end]
+        self._position += len(chunk)
+        return chunk
+    
+    def close(self):
+        pass
+
+
+def parse_report_file_name(file_name: str) -> Optional[tuple]:
+    """Split a generated report file name into (team, generated_at), or None if it doesn't match"""
+    match = REPORT_FILE_PATTERN.match(file_name)
+    if not match:
+        return None
+    try:
+        return match.group('team'), datetime.strptime(match.group('timestamp'), '%Y%m%d_%H%M%S')
+    except ValueError:
+        return None
+
+
+def report_fingerprint(metrics: Dict, **render_options) -> str:
+    """Content hash of a report's underlying metrics (and render options), independent of file names"""
+    return stable_hash({
+        'metrics': {key: value for key, value in metrics.items() if key != 'cache_key'},
+        'render_options': render_options
+    })
+
+
 class ConfluenceUploader:
     """Client for uploading files to Confluence"""
     
+    # Attachment listings shared by all uploaders in the process:
+    # page_id -> (fetched_at, page_version, attachments)
+    _attachment_cache = {}
+    _attachment_cache_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize Confluence client"""
         self.server = os.getenv('CONFLUENCE_SERVER', config.Config.JIRA_SERVER)
@@ -21,117 +141,462 @@ class ConfluenceUploader:
         
         self.auth = (self.email, self.api_token)
         self.base_url = f"{self.server}/wiki/rest/api"
+        self.manifest_path = os.path.join(config.Config.CACHE_DIR, 'confluence', 'manifest.json')
+    
+    def is_unchanged(self, report_key: str, content_hash: str, page_id: Optional[str] = None) -> bool:
+        """Check whether a report with this content hash is already the latest upload for report_key
+        
+        The local manifest is checked first (no requests); otherwise the newest
+        attachment tagged with report_key in its comment is compared.
+        """
+        page_id = page_id or self.page_id
+        if not page_id:
+            return False
+        page_id = str(page_id)
+        entry = self._read_manifest().get(page_id, {}).get(report_key)
+        if entry is not None:
+            return entry.get('hash') == content_hash
+        
+        latest = None
+        for attachment in self.list_attachments(page_id):
+            comment = attachment.get('metadata', {}).get('comment', '') or ''
+            for match in REPORT_TAG_PATTERN.finditer(comment):
+                if match.group('key') != report_key:
+                    continue
+                when = attachment.get('version', {}).get('when', '')
+                if latest is None or when > latest[0]:
+                    latest = (when, match.group('hash'))
+        return latest is not None and content_hash.startswith(latest[1])
+    
+    def record_upload(self, report_key: str, content_hash: str, file_name: str, page_id: Optional[str] = None):
+        """Remember the content hash of the latest upload for report_key"""
+        page_id = page_id or self.page_id
+        if not page_id:
+            return
+        page_id = str(page_id)
+        manifest = self._read_manifest()
+        manifest.setdefault(page_id, {})[report_key] = {
+            'hash': content_hash,
+            'file': file_name,
+            'uploaded_at': datetime.now().isoformat(timespec='seconds')
+        }
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            tmp_path = f"{self.manifest_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"WARNING: Could not write upload manifest: {e}")
+    
+    def _read_manifest(self) -> Dict:
+        """Read the local upload manifest"""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _ensure_page_ready(self, page_id: str) -> bool:
+        """Check that the page exists, publishing it first if it is a draft"""
+        # Step 1: Check if page exists and get its status
+        page_url = f"{self.base_url}/content/{page_id}?expand=version,status"
+        page_response = requests.get(page_url, auth=self.auth)
+        
+        if page_response.status_code == 404:
+            print(f"✗ Error: Page {page_id} not found. Please check CONFLUENCE_PAGE_ID")
+            return False
+        
+        if page_response.status_code != 200:
+            print(f"✗ Error accessing page: {page_response.status_code} - {page_response.text}")
+            return False
+        
+        page_data = page_response.json()
+        page_status = page_data.get('status', 'current')
+        self._note_page_version(page_id, page_data.get('version', {}).get('number'))
+        
+        # Step 2: Handle draft pages - need to publish first or use draft endpoint
+        if page_status == 'draft':
+            print(f"⚠ Warning: Page is in draft status. Publishing page first...")
+            # Try to publish the draft
+            try:
+                version = page_data.get('version', {}).get('number', 1)
+                publish_url = f"{self.base_url}/content/{page_id}"
+                publish_payload = {
+                    'version': {'number': version},
+                    'status': 'current'
+                }
+                publish_response = requests.put(publish_url, auth=self.auth, json=publish_payload, 
+                                               headers={'Content-Type': 'application/json'})
+                if publish_response.status_code == 200:
+                    print(f"✓ Page published successfully")
+                else:
+                    print(f"⚠ Could not auto-publish page. Please publish manually in Confluence.")
+                    print(f"  Then run the upload again, or upload manually.")
+                    return False
+            except Exception as e:
+                print(f"⚠ Could not publish page automatically: {str(e)}")
+                print(f"  Please publish the page manually in Confluence, then try again.")
+                return False
+        
+        return True
     
-    def upload_attachment(self, file_path: str, page_id: Optional[str] = None, comment: str = "") -> bool:
+    def upload_attachment(self, file_path: str, page_id: Optional[str] = None, comment: str = "",
+                          report_key: Optional[str] = None, content_hash: Optional[str] = None) -> bool:
         """Upload a file as attachment to a Confluence page"""
         if not os.path.exists(file_path):
             print(f"Error: File not found: {file_path}")
             return False
         
+        with open(file_path, 'rb') as file:
+            return self.upload_attachment_data(os.path.basename(file_path), file, page_id=page_id, comment=comment,
+                                               report_key=report_key, content_hash=content_hash)
+    
+    def upload_attachment_data(self, file_name: str, data: Union[bytes, BinaryIO],
+                               page_id: Optional[str] = None, comment: str = "",
+                               content_type: str = PPTX_CONTENT_TYPE,
+                               report_key: Optional[str] = None, content_hash: Optional[str] = None) -> bool:
+        """Upload in-memory bytes or a readable file object as a page attachment
+        
+        With report_key and content_hash, the hash is tagged in the attachment
+        comment and recorded in the local manifest (see is_unchanged).
+        """
         page_id = page_id or self.page_id
         if not page_id:
             print("Error: CONFLUENCE_PAGE_ID must be set")
             return False
         
+        if report_key and content_hash:
+            tag = f"[report:{report_key} hash:{content_hash[:REPORT_HASH_LENGTH]}]"
+            comment = f"{comment} {tag}" if comment else tag
+        
         try:
-            # Step 1: Check if page exists and get its status
-            page_url = f"{self.base_url}/content/{page_id}?expand=version,status"
-            page_response = requests.get(page_url, auth=self.auth)
-            
-            if page_response.status_code == 404:
-                print(f"✗ Error: Page {page_id} not found. Please check CONFLUENCE_PAGE_ID")
+            # Steps 1-2: Check the page exists and is published
+            if not self._ensure_page_ready(page_id):
                 return False
             
-            if page_response.status_code != 200:
-                print(f"✗ Error accessing page: {page_response.status_code} - {page_response.text}")
-                return False
-            
-            page_data = page_response.json()
-            page_status = page_data.get('status', 'current')
-            
-            # Step 2: Handle draft pages - need to publish first or use draft endpoint
-            if page_status == 'draft':
-                print(f"⚠ Warning: Page is in draft status. Publishing page first...")
-                # Try to publish the draft
-                try:
-                    version = page_data.get('version', {}).get('number', 1)
-                    publish_url = f"{self.base_url}/content/{page_id}"
-                    publish_payload = {
-                        'version': {'number': version},
-                        'status': 'current'
-                    }
-                    publish_response = requests.put(publish_url, auth=self.auth, json=publish_payload, 
-                                                   headers={'Content-Type': 'application/json'})
-                    if publish_response.status_code == 200:
-                        print(f"✓ Page published successfully")
-                    else:
-                        print(f"⚠ Could not auto-publish page. Please publish manually in Confluence.")
-                        print(f"  Then run the upload again, or upload manually.")
-                        return False
-                except Exception as e:
-                    print(f"⚠ Could not publish page automatically: {str(e)}")
-                    print(f"  Please publish the page manually in Confluence, then try again.")
-                    return False
-            
             # Step 3: Get attachment endpoint
             url = f"{self.base_url}/content/{page_id}/child/attachment"
             
-            # Step 4: Check if file already exists
-            file_name = os.path.basename(file_path)
-            params = {'filename': file_name}
-            response = requests.get(url, auth=self.auth, params=params)
+            # Step 4: Check if file already exists (from a fresh listing if one is cached)
+            cached = self._cached_attachments(page_id)
+            if cached is not None:
+                attachment_id = next((a.get('id') for a in cached if a.get('title') == file_name), None)
+            else:
+                params = {'filename': file_name}
+                response = requests.get(url, auth=self.auth, params=params)
+                results = response.json().get('results') if response.status_code == 200 else None
+                attachment_id = results[0]['id'] if results else None
             
             # Step 5: Upload file
             headers = {
                 'X-Atlassian-Token': 'no-check'  # Required for file uploads
             }
             
-            with open(file_path, 'rb') as file:
-                files = {
-                    'file': (file_name, file, 'application/vnd.openxmlformats-officedocument.presentationml.presentation')
-                }
-                data = {}
-                if comment:
-                    data['comment'] = comment
-                
-                # If attachment exists, update it; otherwise create new
-                if response.status_code == 200 and response.json().get('results'):
-                    # Update existing attachment
-                    attachment_id = response.json()['results'][0]['id']
-                    update_url = f"{self.base_url}/content/{page_id}/child/attachment/{attachment_id}/data"
-                    response = requests.post(update_url, auth=self.auth, headers=headers, files=files, data=data)
-                else:
-                    # Create new attachment
-                    response = requests.post(url, auth=self.auth, headers=headers, files=files, data=data)
+            files = {
+                'file': (file_name, data, content_type)
+            }
+            form = {}
+            if comment:
+                form['comment'] = comment
+            
+            # If attachment exists, update it; otherwise create new
+            if attachment_id:
+                # Update existing attachment
+                update_url = f"{self.base_url}/content/{page_id}/child/attachment/{attachment_id}/data"
+                response = requests.post(update_url, auth=self.auth, headers=headers, files=files, data=form)
+            else:
+                # Create new attachment
+                response = requests.post(url, auth=self.auth, headers=headers, files=files, data=form)
             
+            self.invalidate_attachments(page_id)
             if response.status_code in [200, 201]:
                 print(f"✓ Successfully uploaded: {file_name}")
+                if report_key and content_hash:
+                    self.record_upload(report_key, content_hash, file_name, page_id)
                 return True
             else:
                 print(f"✗ Failed to upload {file_name}: {response.status_code} - {response.text}")
                 return False
                 
         except Exception as e:
-            print(f"✗ Error uploading {file_path}: {str(e)}")
+            print(f"✗ Error uploading {file_name}: {str(e)}")
             return False
     
-    def list_attachments(self, page_id: Optional[str] = None) -> List[Dict]:
-        """List all attachments on a page"""
+    def upload_attachments(self, file_paths: List[str], page_id: Optional[str] = None,
+                           comments: Optional[Dict[str, str]] = None, batch_size: Optional[int] = None) -> Dict[str, bool]:
+        """Upload several files, looking up the page and its attachments only once
+        
+        New files are sent batch_size at a time in one multipart request;
+        files that already exist get a new version (one request each, as the
+        update endpoint takes a single file). Bodies are streamed from disk.
+        Returns {file_path: success}.
+        """
         page_id = page_id or self.page_id
+        comments = comments or {}
+        batch_size = batch_size or config.Config.CONFLUENCE_UPLOAD_BATCH_SIZE
+        results = {}
+        
+        missing = [path for path in file_paths if not os.path.exists(path)]
+        for path in missing:
+            print(f"Error: File not found: {path}")
+            results[path] = False
+        file_paths = [path for path in file_paths if path not in missing]
+        if not file_paths:
+            return results
+        
         if not page_id:
-            return []
+            print("Error: CONFLUENCE_PAGE_ID must be set")
+            return dict(results, **{path: False for path in file_paths})
         
         try:
+            if not self._ensure_page_ready(page_id):
+                return dict(results, **{path: False for path in file_paths})
+            
+            existing = {attachment.get('title'): attachment.get('id') for attachment in self.list_attachments(page_id)}
             url = f"{self.base_url}/content/{page_id}/child/attachment"
-            response = requests.get(url, auth=self.auth)
             
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('results', [])
+            new_files = []
+            for path in file_paths:
+                file_name = os.path.basename(path)
+                if file_name not in existing:
+                    new_files.append(path)
+                    continue
+                # Update existing attachment
+                body = MultipartStream(
+                    [('comment', comments[path])] if comments.get(path) else [],
+                    [('file', file_name, path, PPTX_CONTENT_TYPE)]
+                )
+                results[path] = self._post_multipart(f"{url}/{existing[file_name]}/data", body, [file_name], page_id)
+            
+            for start in range(0, len(new_files), batch_size):
+                batch = new_files[start:start + batch_size]
+                # Confluence pairs comment parts with file parts by order, so send one per file
+                fields = [('comment', comments.get(path) or os.path.basename(path)) for path in batch]
+                body = MultipartStream(
+                    fields,
+                    [('file', os.path.basename(path), path, PPTX_CONTENT_TYPE) for path in batch]
+                )
+                ok = self._post_multipart(url, body, [os.path.basename(path) for path in batch], page_id)
+                results.update({path: ok for path in batch})
+        except Exception as e:
+            print(f"✗ Error uploading attachments: {str(e)}")
+            results.update({path: False for path in file_paths if path not in results})
+        
+        return results
+    
+    def _post_multipart(self, url: str, body: MultipartStream, file_names: List[str], page_id: str) -> bool:
+        """POST a streamed multipart body and report the result"""
+        headers = {
+            'X-Atlassian-Token': 'no-check',  # Required for file uploads
+            'Content-Type': body.content_type
+        }
+        response = requests.post(url, auth=self.auth, headers=headers, data=body)
+        self.invalidate_attachments(page_id)
+        if response.status_code in [200, 201]:
+            for file_name in file_names:
+                print(f"✓ Successfully uploaded: {file_name}")
+            return True
+        print(f"✗ Failed to upload {', '.join(file_names)}: {response.status_code} - {response.text}")
+        return False
+    
+    def list_attachments(self, page_id: Optional[str] = None, refresh: bool = False) -> List[Dict]:
+        """List all attachments on a page
+        
+        Listings are cached for CONFLUENCE_ATTACHMENT_CACHE_TTL seconds and
+        dropped when this process uploads to the page or sees a new page
+        version; refresh forces a new listing.
+        """
+        page_id = page_id or self.page_id
+        if not page_id:
             return []
+        return list(self.iter_attachments(page_id, refresh=refresh))
+    
+    def iter_attachments(self, page_id: Optional[str] = None, refresh: bool = False,
+                         page_size: int = 100) -> Iterator[Dict]:
+        """Stream a page's attachments, following pagination
+        
+        Serves a fresh cached listing when available; a listing that is read
+        to the end is cached for later calls.
+        """
+        page_id = page_id or self.page_id
+        if not page_id:
+            return
+        page_id = str(page_id)
+        
+        cached = None if refresh else self._cached_attachments(page_id)
+        if cached is not None:
+            yield from cached
+            return
+        
+        attachments = []
+        url = f"{self.base_url}/content/{page_id}/child/attachment"
+        params = {'start': 0, 'limit': page_size, 'expand': 'version'}
+        try:
+            while True:
+                response = requests.get(url, auth=self.auth, params=params)
+                if response.status_code != 200:
+                    print(f"Error listing attachments: {response.status_code}")
+                    return
+                
+                data = response.json()
+                results = data.get('results', [])
+                for attachment in results:
+                    attachments.append(attachment)
+                    yield attachment
+                
+                if not results or not data.get('_links', {}).get('next'):
+                    break
+                params['start'] += len(results)
         except Exception as e:
             print(f"Error listing attachments: {str(e)}")
-            return []
+            return
+        
+        with self._attachment_cache_lock:
+            version = self._attachment_cache.get(page_id, (None, None, None))[1]
+            self._attachment_cache[page_id] = (time.time(), version, attachments)
+    
+    def invalidate_attachments(self, page_id: Optional[str] = None):
+        """Drop the cached attachment listing for a page (after local writes)"""
+        page_id = page_id or self.page_id
+        if not page_id:
+            return
+        with self._attachment_cache_lock:
+            self._attachment_cache.pop(str(page_id), None)
+    
+    def _cached_attachments(self, page_id: str) -> Optional[List[Dict]]:
+        """Cached attachment listing if still fresh"""
+        with self._attachment_cache_lock:
+            entry = self._attachment_cache.get(str(page_id))
+        if entry is None or entry[2] is None:
+            return None
+        if time.time() - entry[0] > config.Config.CONFLUENCE_ATTACHMENT_CACHE_TTL:
+            return None
+        return list(entry[2])
+    
+    def _note_page_version(self, page_id: str, version: Optional[int], keep_attachments: bool = False):
+        """Record the page version, invalidating the cached listing if the page changed"""
+        if version is None:
+            return
+        page_id = str(page_id)
+        with self._attachment_cache_lock:
+            fetched_at, known_version, attachments = self._attachment_cache.get(page_id, (0, None, None))
+            if known_version is not None and known_version != version and not keep_attachments:
+                attachments = None
+            self._attachment_cache[page_id] = (fetched_at, version, attachments)
+    
+    def plan_retention(self, keep: int, page_id: Optional[str] = None) -> Dict:
+        """Split a page's report attachments into those to keep and those to prune
+        
+        The newest `keep` reports of each team (by the timestamp in the file
+        name) are kept. Attachments that don't follow the report naming are
+        never pruned. Returns {'keep': [...], 'prune': [...], 'prune_bytes': int}.
+        """
+        if keep < 1:
+            raise ValueError("keep must be at least 1")
+        
+        by_team = {}
+        for attachment in self.iter_attachments(page_id):
+            parsed = parse_report_file_name(attachment.get('title', ''))
+            if parsed:
+                by_team.setdefault(parsed[0], []).append((parsed[1], attachment))
+        
+        plan = {'keep': [], 'prune': [], 'prune_bytes': 0}
+        for team in sorted(by_team):
+            reports = sorted(by_team[team], key=lambda item: item[0], reverse=True)
+            plan['keep'].extend(attachment for _, attachment in reports[:keep])
+            for _, attachment in reports[keep:]:
+                plan['prune'].append(attachment)
+                plan['prune_bytes'] += attachment.get('extensions', {}).get('fileSize', 0) or 0
+        return plan
+    
+    def prune_reports(self, keep: int, page_id: Optional[str] = None, dry_run: bool = False,
+                      archive_dir: Optional[str] = None, batch_size: Optional[int] = None,
+                      interval: Optional[float] = None) -> Dict:
+        """Delete all but the newest `keep` reports per team from a page
+        
+        With archive_dir, each attachment is downloaded there before it is
+        deleted. Deletes are sent batch_size at a time with `interval` seconds
+        between batches to stay under Confluence rate limits. A dry run only
+        reports what would be removed. Returns counts and bytes reclaimed.
+        """
+        page_id = page_id or self.page_id
+        batch_size = batch_size or config.Config.CONFLUENCE_DELETE_BATCH_SIZE
+        interval = interval if interval is not None else config.Config.CONFLUENCE_DELETE_INTERVAL
+        
+        plan = self.plan_retention(keep, page_id)
+        summary = {
+            'kept': len(plan['keep']),
+            'pruned': 0,
+            'failed': 0,
+            'bytes_reclaimed': 0,
+            'dry_run': dry_run
+        }
+        if dry_run or not plan['prune']:
+            summary['pruned'] = len(plan['prune'])
+            summary['bytes_reclaimed'] = plan['prune_bytes']
+            return summary
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        try:
+            with ThreadPoolExecutor(max_workers=batch_size) as executor:
+                for start in range(0, len(plan['prune']), batch_size):
+                    if start:
+                        time.sleep(interval)
+                    batch = plan['prune'][start:start + batch_size]
+                    errors = executor.map(lambda attachment: self._remove_attachment(attachment, archive_dir), batch)
+                    # Report from this thread so output stays in order
+                    for attachment, error in zip(batch, errors):
+                        title = attachment.get('title', 'Unknown')
+                        if error:
+                            print(f"✗ Failed to remove {title}: {error}")
+                            summary['failed'] += 1
+                        else:
+                            print(f"✓ Removed: {title}")
+                            summary['pruned'] += 1
+                            summary['bytes_reclaimed'] += attachment.get('extensions', {}).get('fileSize', 0) or 0
+        finally:
+            self.invalidate_attachments(page_id)
+        return summary
+    
+    def _remove_attachment(self, attachment: Dict, archive_dir: Optional[str] = None) -> Optional[str]:
+        """Archive (optionally) and delete one attachment, returning an error message on failure"""
+        try:
+            if archive_dir:
+                error = self._archive_attachment(attachment, archive_dir)
+                if error:
+                    return error
+            
+            url = f"{self.base_url}/content/{attachment['id']}"
+            response = requests.delete(url, auth=self.auth)
+            if response.status_code == 429:
+                # Rate limited: wait as asked and retry once
+                time.sleep(float(response.headers.get('Retry-After', '5')))
+                response = requests.delete(url, auth=self.auth)
+            if response.status_code in [200, 204]:
+                return None
+            return f"{response.status_code} - {response.text[:200]}"
+        except Exception as e:
+            return str(e)
+    
+    def _archive_attachment(self, attachment: Dict, archive_dir: str) -> Optional[str]:
+        """Download an attachment into archive_dir (streamed to disk), returning an error message on failure"""
+        download = attachment.get('_links', {}).get('download')
+        if not download:
+            return "no download link, not archived"
+        
+        os.makedirs(archive_dir, exist_ok=True)
+        path = os.path.join(archive_dir, attachment.get('title', attachment['id']))
+        with requests.get(f"{self.server}/wiki{download}", auth=self.auth, stream=True) as response:
+            if response.status_code != 200:
+                return f"archive download failed: {response.status_code}"
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        return None
     
     def add_page_content(self, content: str, page_id: Optional[str] = None) -> bool:
         """Add content to a Confluence page"""
@@ -195,21 +660,22 @@ class ConfluenceUploader:
     
     def add_attachments_to_page_content(self, page_id: Optional[str] = None) -> bool:
         """Add attachment links to page content so they're visible"""
+        return self.update_reports_section(page_id)
+    
+    def update_reports_section(self, page_id: Optional[str] = None) -> bool:
+        """Write the "Sprint Velocity Reports" section listing the latest reports
+        
+        Uses one GET (page body, version and attachments together) and at most
+        one PUT. An existing section is replaced in place; the page is left
+        untouched when the section is already up to date.
+        """
         page_id = page_id or self.page_id
         if not page_id:
             print("Error: CONFLUENCE_PAGE_ID must be set")
             return False
         
         try:
-            # Get all attachments
-            attachments = self.list_attachments(page_id)
-            
-            if not attachments:
-                print("No attachments found to add to page content")
-                return False
-            
-            # Get current page to check existing content
-            url = f"{self.base_url}/content/{page_id}?expand=version,body.storage"
+            url = f"{self.base_url}/content/{page_id}?expand=version,body.storage,children.attachment"
             response = requests.get(url, auth=self.auth)
             
             if response.status_code != 200:
@@ -217,17 +683,16 @@ class ConfluenceUploader:
                 return False
             
             page_data = response.json()
-            existing_content = ""
-            if 'body' in page_data and 'storage' in page_data['body']:
-                existing_content = page_data['body']['storage'].get('value', '')
+            existing_content = page_data.get('body', {}).get('storage', {}).get('value', '')
+            self._note_page_version(page_id, page_data.get('version', {}).get('number'))
             
-            # Check if attachments section already exists
-            if 'Sprint Velocity Reports' in existing_content or 'Velocity Reports' in existing_content:
-                print("Attachments section already exists in page content")
-                return True
+            children = page_data.get('children', {}).get('attachment', {})
+            attachments = children.get('results', [])
+            if children.get('_links', {}).get('next'):
+                # More attachments than the expansion returns; list them all
+                attachments = self.list_attachments(page_id)
             
             # Filter PPTX files and sort by date (newest first)
-            from datetime import datetime
             pptx_attachments = [a for a in attachments if a.get('title', '').endswith('.pptx')]
             pptx_attachments.sort(key=lambda x: x.get('version', {}).get('when', ''), reverse=True)
             
@@ -235,41 +700,18 @@ class ConfluenceUploader:
                 print("No PowerPoint attachments found")
                 return False
             
-            # Build Confluence storage format content (XML-based)
-            # Using Confluence storage format with attachment macro
-            new_content = f'''<h2>Sprint Velocity Reports</h2>
-<p>The following reports have been uploaded:</p>
-<ac:structured-macro ac:name="attachments" ac:schema-version="1" ac:macro-id="attachments-macro">
-<ac:parameter ac:name="old">false</ac:parameter>
-</ac:structured-macro>
-<p><strong>Latest Reports:</strong></p>
-<ul>'''
-            
-            for att in pptx_attachments[:10]:  # Show latest 10
-                att_title = att.get('title', 'Unknown')
-                
-                # Extract date from filename if possible (format: TEAM_velocity_report_YYYYMMDD_HHMMSS.pptx)
-                date_str = "Recent"
-                try:
-                    parts = att_title.replace('.pptx', '').split('_')
-                    if len(parts) >= 4:
-                        date_part = parts[-2]  # YYYYMMDD
-                        if len(date_part) == 8:
-                            date_obj = datetime.strptime(date_part, '%Y%m%d')
-                            date_str = date_obj.strftime('%B %d, %Y')
-                except:
-                    pass
-                
-                # Use Confluence attachment link format
-                new_content += f'\n<li><ac:link><ri:attachment ri:filename="{att_title}"/></ac:link> - {date_str}</li>'
-            
-            new_content += '\n</ul>'
+            section = self._build_reports_section(pptx_attachments[:10])  # Show latest 10
             
-            # Append to existing content
-            if existing_content.strip():
-                final_content = existing_content + "\n\n" + new_content
+            if REPORTS_SECTION_PATTERN.search(existing_content):
+                final_content = REPORTS_SECTION_PATTERN.sub(lambda _: section, existing_content, count=1)
+            elif existing_content.strip():
+                final_content = existing_content + "\n\n" + section
             else:
-                final_content = new_content
+                final_content = section
+            
+            if final_content == existing_content:
+                print("Reports section already up to date")
+                return True
             
             # Update page
             version = page_data['version']['number']
@@ -290,6 +732,8 @@ class ConfluenceUploader:
                                   headers={'Content-Type': 'application/json'})
             
             if response.status_code == 200:
+                # Our own edit doesn't change the attachments
+                self._note_page_version(page_id, version + 1, keep_attachments=True)
                 print(f"✓ Successfully added attachment links to page content")
                 print(f"  View your page to see the reports!")
                 return True
@@ -305,6 +749,38 @@ class ConfluenceUploader:
             import traceback
             traceback.print_exc()
             return False
+    
+    def _build_reports_section(self, pptx_attachments: List[Dict]) -> str:
+        """Build the reports section in Confluence storage format (XML-based)"""
+        # Using Confluence storage format with attachment macro
+        content = f'''<h2>Sprint Velocity Reports</h2>
+<p>The following reports have been uploaded:</p>
+<ac:structured-macro ac:name="attachments" ac:schema-version="1" ac:macro-id="attachments-macro">
+<ac:parameter ac:name="old">false</ac:parameter>
+</ac:structured-macro>
+<p><strong>Latest Reports:</strong></p>
+<ul>'''
+        
+        for att in pptx_attachments:
+            att_title = att.get('title', 'Unknown')
+            
+            # Extract date from filename if possible (format: TEAM_velocity_report_YYYYMMDD_HHMMSS.pptx)
+            date_str = "Recent"
+            try:
+                parts = att_title.replace('.pptx', '').split('_')
+                if len(parts) >= 4:
+                    date_part = parts[-2]  # YYYYMMDD
+                    if len(date_part) == 8:
+                        date_obj = datetime.strptime(date_part, '%Y%m%d')
+                        date_str = date_obj.strftime('%B %d, %Y')
+            except:
+                pass
+            
+            # Use Confluence attachment link format
+            content += f'\n<li><ac:link><ri:attachment ri:filename="{att_title}"/></ac:link> - {date_str}</li>'
+        
+        content += '\n</ul>'
+        return content
 
 
 def upload_latest_reports(page_id: str = None, space_key: str = None):
@@ -341,14 +817,12 @@ def upload_latest_reports(page_id: str = None, space_key: str = None):
         print("Uploading Reports to Confluence")
         print(f"{'='*60}\n")
         
-        # Upload each file
-        success_count = 0
-        for file_path in pptx_files:
-            file_name = os.path.basename(file_path)
-            comment = f"Velocity metrics report - {file_name}"
-            
-            if uploader.upload_attachment(file_path, comment=comment):
-                success_count += 1
+        # Upload all files with one page lookup and batched requests
+        comments = {
+            file_path: f"Velocity metrics report - {os.path.basename(file_path)}" for file_path in pptx_files
+        }
+        results = uploader.upload_attachments(pptx_files, comments=comments)
+        success_count = sum(1 for ok in results.values() if ok)
         
         print(f"\n{'='*60}")
         print(f"Uploaded: {success_count}/{len(pptx_files)} reports")
@@ -1,11 +1,23 @@
 """Jira API client for fetching sprint data"""
 from jira import JIRA
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator
 from datetime import datetime, date
+from burndown import BurndownReplayer
+from metrics_cache import stable_hash
+import os
+import copy
+import json
 import config
 import requests
 
 
+# Custom fields that may hold story points on this Jira instance
+STORY_POINT_FIELDS = ['customfield_10129', 'customfield_10016', 'customfield_10020', 'customfield_10021']
+
+# Bumped when the cached changelog format changes so stale closed-sprint caches are refetched
+CHANGELOG_CACHE_VERSION = 3
+
+
 class JiraClient:
     """Client for interacting with Jira API"""
     
@@ -20,6 +32,9 @@ class JiraClient:
         )
         self.server = config.Config.JIRA_SERVER
         self.auth = (config.Config.JIRA_EMAIL, config.Config.JIRA_API_TOKEN)
+        # Closed sprints don't change, so their (fixed-size) summaries are kept
+        # for the life of the client: (board_id, sprint_id, include_changelog) -> sprint
+        self._closed_sprint_summaries = {}
     
     def get_sprint(self, board_id: str, sprint_name: Optional[str] = None) -> Optional[Dict]:
         """Get active or specified sprint for a board"""
@@ -39,14 +54,20 @@ class JiraClient:
             print(f"Error fetching sprint: {e}")
             return None
     
-    def get_sprint_issues(self, board_id: str, sprint_id: int) -> List[Dict]:
-        """Get all issues for a sprint using API v3"""
+    def get_sprint_issues(self, board_id: str, sprint_id: int, include_breakdown_fields: bool = False) -> List[Dict]:
+        """Get all issues for a sprint using API v3
+        
+        If include_breakdown_fields is set, assignee and components are also
+        fetched so metrics can be broken down per person and per component.
+        """
         try:
             # Try Agile API first (more efficient for sprint issues)
             # Build fields list dynamically to include AI Story Points if configured
-            fields_list = 'summary,status,issuetype,created,resolutiondate,labels,customfield_10129'
+            fields_list = 'summary,status,issuetype,created,updated,resolutiondate,labels,customfield_10129'
             if config.Config.AI_STORY_POINTS_FIELD_ID:
                 fields_list += f',{config.Config.AI_STORY_POINTS_FIELD_ID}'
+            if include_breakdown_fields:
+                fields_list += ',assignee,components'
             
             url = f"{self.server}/rest/agile/1.0/board/{board_id}/sprint/{sprint_id}/issue"
             params = {
@@ -133,6 +154,7 @@ class JiraClient:
                             pass
                     
                     issue_dict = {
+                        'id': issue.get('id'),
                         'key': issue.get('key'),
                         'summary': fields.get('summary', ''),
                         'status': status.get('name', ''),
@@ -141,10 +163,13 @@ class JiraClient:
                         'ai_points_saved': ai_points_saved if ai_points_saved is not None else 0,
                         'issue_type': issue_type.get('name', ''),
                         'created': fields.get('created', ''),
+                        'updated': fields.get('updated'),
                         'resolved': fields.get('resolutiondate'),
                         'labels': fields.get('labels', []),
                         'is_defect': issue_type.get('name', '').lower() in ['bug', 'defect', 'error'],
                     }
+                    if include_breakdown_fields:
+                        issue_dict.update(self._extract_breakdown_fields(fields))
                     issue_data.append(issue_dict)
                 
                 return issue_data
@@ -158,9 +183,11 @@ class JiraClient:
             
             while True:
                 # Build fields list dynamically to include AI Story Points if configured
-                fields_list = ['summary', 'status', 'issuetype', 'created', 'resolutiondate', 'labels', 'customfield_10129']
+                fields_list = ['summary', 'status', 'issuetype', 'created', 'updated', 'resolutiondate', 'labels', 'customfield_10129']
                 if config.Config.AI_STORY_POINTS_FIELD_ID:
                     fields_list.append(config.Config.AI_STORY_POINTS_FIELD_ID)
+                if include_breakdown_fields:
+                    fields_list.extend(['assignee', 'components'])
                 
                 payload = {
                     'jql': jql_query,
@@ -233,6 +260,7 @@ class JiraClient:
                         pass
                 
                 issue_dict = {
+                    'id': issue.get('id'),
                     'key': issue.get('key'),
                     'summary': fields.get('summary', ''),
                     'status': status.get('name', ''),
@@ -241,10 +269,13 @@ class JiraClient:
                     'ai_points_saved': ai_points_saved if ai_points_saved is not None else 0,
                     'issue_type': issue_type.get('name', ''),
                     'created': fields.get('created', ''),
+                    'updated': fields.get('updated'),
                     'resolved': fields.get('resolutiondate'),
                     'labels': fields.get('labels', []),
                     'is_defect': issue_type.get('name', '').lower() in ['bug', 'defect', 'error'],
                 }
+                if include_breakdown_fields:
+                    issue_dict.update(self._extract_breakdown_fields(fields))
                 issue_data.append(issue_dict)
             
             return issue_data
@@ -253,9 +284,9 @@ class JiraClient:
             print(f"Error fetching sprint issues: {e}")
             return []
     
-    def get_sprint_metrics(self, board_id: str, sprint_id: int) -> Dict:
+    def get_sprint_metrics(self, board_id: str, sprint_id: int, include_breakdown_fields: bool = False) -> Dict:
         """Get comprehensive sprint metrics"""
-        issues = self.get_sprint_issues(board_id, sprint_id)
+        issues = self.get_sprint_issues(board_id, sprint_id, include_breakdown_fields=include_breakdown_fields)
         
         total_story_points = sum(issue['story_points'] for issue in issues if issue['story_points'])
         completed_story_points = sum(
@@ -263,42 +294,324 @@ class JiraClient:
             if issue['story_points'] and issue['status'] in ['Done', 'Closed', 'Resolved']
         )
         
-        defects = [issue for issue in issues if issue['is_defect']]
-        defect_count = len(defects)
-        
-        completed_issues = [issue for issue in issues if issue['status'] in ['Done', 'Closed', 'Resolved']]
+        defect_count = sum(1 for issue in issues if issue['is_defect'])
+        completed_issues = sum(1 for issue in issues if issue['status'] in ['Done', 'Closed', 'Resolved'])
         
         return {
             'total_issues': len(issues),
-            'completed_issues': len(completed_issues),
+            'completed_issues': completed_issues,
             'total_story_points': total_story_points,
             'completed_story_points': completed_story_points,
             'defect_count': defect_count,
             'issues': issues
         }
     
-    def get_historical_sprints(self, board_id: str, limit: int = 10) -> List[Dict]:
-        """Get historical sprints for velocity calculation"""
+    def get_historical_sprints(self, board_id: str, limit: int = 10, include_changelog: bool = False,
+                               summary_only: bool = False, spill_dir: Optional[str] = None,
+                               include_breakdown_fields: bool = False) -> List[Dict]:
+        """Get historical sprints for velocity calculation
+        
+        With summary_only, each sprint's metrics are reduced to fixed-size
+        aggregates as soon as it is fetched, so memory does not grow with the
+        number of issues. Raw issues can optionally be spilled to spill_dir.
+        """
         try:
             sprints = self.jira.sprints(board_id, state='closed')[:limit]
             sprint_data = []
             
             for sprint in sprints:
-                metrics = self.get_sprint_metrics(board_id, sprint.id)
-                sprint_data.append({
+                cache_key = (str(board_id), sprint.id, include_changelog, include_breakdown_fields)
+                if summary_only and cache_key in self._closed_sprint_summaries:
+                    sprint_data.append(copy.deepcopy(self._closed_sprint_summaries[cache_key]))
+                    continue
+                
+                metrics = self.get_sprint_metrics(board_id, sprint.id, include_breakdown_fields=include_breakdown_fields)
+                sprint_dict = {
                     'id': sprint.id,
                     'name': sprint.name,
                     'state': sprint.state,
                     'start_date': sprint.startDate,
                     'end_date': sprint.endDate,
                     'metrics': metrics
-                })
+                }
+                if include_changelog:
+                    sprint_dict['burndown'] = self.get_sprint_burndown(board_id, sprint_dict)
+                if summary_only:
+                    self._summarize_sprint(board_id, sprint_dict, spill_dir)
+                    self._closed_sprint_summaries[cache_key] = copy.deepcopy(sprint_dict)
+                sprint_data.append(sprint_dict)
             
             return sprint_data
         except Exception as e:
             print(f"Error fetching historical sprints: {e}")
             return []
     
+    def get_board_signature(self, board_id: str) -> Optional[str]:
+        """Cheap fingerprint of a board's sprint data, for detecting boards that changed
+        
+        Combines the active sprint, the list of closed sprints and the active
+        sprint's issue count and latest issue update (three small requests
+        instead of a full fetch). Returns None if it can't be determined.
+        """
+        try:
+            sprint = self.get_sprint(board_id)
+            state = {
+                'closed': [s.id for s in self.jira.sprints(board_id, state='closed')],
+                'active': None
+            }
+            if sprint:
+                url = f"{self.server}/rest/agile/1.0/board/{board_id}/sprint/{sprint.id}/issue"
+                params = {'maxResults': 1, 'fields': 'updated', 'jql': 'ORDER BY updated DESC'}
+                response = requests.get(url, auth=self.auth, params=params)
+                if response.status_code != 200:
+                    return None
+                data = response.json()
+                issues = data.get('issues', [])
+                state['active'] = {
+                    'id': sprint.id,
+                    'state': sprint.state,
+                    'end_date': sprint.endDate,
+                    'total': data.get('total', 0),
+                    'updated': issues[0].get('fields', {}).get('updated') if issues else None
+                }
+            return stable_hash(state)
+        except Exception as e:
+            print(f"Error fetching board state: {e}")
+            return None
+    
+    def _summarize_sprint(self, board_id: str, sprint: Dict, spill_dir: Optional[str] = None):
+        """Replace a sprint's raw issues (and daily burndown) with aggregates in place"""
+        metrics = sprint['metrics']
+        issues = metrics.pop('issues', [])
+        
+        # Digest of issue update timestamps keeps metrics memoization accurate
+        metrics['issues_digest'] = stable_hash([(issue.get('key'), issue.get('updated')) for issue in issues])
+        
+        if spill_dir and issues:
+            try:
+                os.makedirs(spill_dir, exist_ok=True)
+                issues_file = os.path.join(spill_dir, f"{board_id}_{sprint['id']}.jsonl")
+                with open(issues_file, 'w') as f:
+                    for issue in issues:
+                        f.write(json.dumps(issue) + '\n')
+                metrics['issues_file'] = issues_file
+            except OSError as e:
+                print(f"WARNING: Could not spill issues for sprint {sprint['id']}: {e}")
+        
+        burndown = sprint.get('burndown')
+        if burndown:
+            sprint['burndown'] = {
+                key: value for key, value in burndown.items()
+                if key not in ('days', 'committed', 'remaining', 'ideal', 'daily_scope_change')
+            }
+    
+    def get_sprint_burndown(self, board_id: str, sprint: Dict) -> Optional[Dict]:
+        """Replay issue changelogs into daily burndown and scope change for a sprint"""
+        issues = sprint.get('metrics', {}).get('issues', [])
+        try:
+            replayer = BurndownReplayer(
+                sprint['id'], sprint.get('start_date'), sprint.get('end_date'),
+                story_point_fields=self._story_point_changelog_fields(),
+                sprint_field_id=config.Config.SPRINT_FIELD_ID
+            )
+            changelogs = self.iter_sprint_changelogs(
+                board_id, sprint['id'],
+                [issue['id'] for issue in issues if issue.get('id')],
+                closed=sprint.get('state') == 'closed'
+            )
+            return replayer.replay(issues, changelogs)
+        except Exception as e:
+            print(f"Error building burndown for sprint {sprint.get('name', sprint.get('id'))}: {e}")
+            return None
+    
+    def iter_sprint_changelogs(self, board_id: str, sprint_id: int, issue_ids: List[str],
+                               closed: bool = False) -> Iterator[Dict]:
+        """Stream changelog records for a sprint's issues
+        
+        Issues that were removed from the sprint are included too; their
+        records carry the issue's final state under 'issue'. Closed sprints no
+        longer change, so their changelogs are cached on disk as JSON lines and
+        streamed back from the cache on later runs.
+        """
+        cache_path = os.path.join(config.Config.CACHE_DIR, 'changelogs', f"{board_id}_{sprint_id}.v{CHANGELOG_CACHE_VERSION}.jsonl")
+        
+        if closed and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                for line in f:
+                    yield json.loads(line)
+            return
+        
+        # The board's issue list only has issues still in the sprint
+        removed = {issue['id']: issue for issue in self.get_removed_sprint_issues(sprint_id, issue_ids)}
+        records = self._with_removed_issues(self.iter_issue_changelogs(list(issue_ids) + list(removed)), removed)
+        
+        if not closed:
+            yield from records
+            return
+        
+        # Write to a temp file and only publish the cache once the stream completes
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        completed = False
+        try:
+            with open(tmp_path, 'w') as cache_file:
+                for record in records:
+                    cache_file.write(json.dumps(record) + '\n')
+                    yield record
+            completed = True
+        finally:
+            if completed:
+                os.replace(tmp_path, cache_path)
+            elif os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _with_removed_issues(self, records: Iterable[Dict], removed: Dict[str, Dict]) -> Iterator[Dict]:
+        """Attach the final state of removed issues to their changelog records"""
+        for record in records:
+            issue = removed.get(str(record.get('issue_id')))
+            yield dict(record, issue=issue) if issue else record
+    
+    def get_removed_sprint_issues(self, sprint_id: int, current_ids: Iterable[str]) -> List[Dict]:
+        """Issues that were in a sprint at some point but no longer are
+        
+        Returns their id, story points and status so a burndown replay can
+        count the scope they took with them. Returns [] (with a warning) if
+        the search fails, leaving removals uncounted.
+        """
+        current = {str(issue_id) for issue_id in current_ids}
+        url = f"{self.server}/rest/api/3/search/jql"
+        fields_list = ['status'] + self._story_point_changelog_fields()
+        removed = []
+        next_page_token = None
+        
+        try:
+            while True:
+                payload = {'jql': f'sprint WAS {sprint_id}', 'maxResults': 100, 'fields': fields_list}
+                if next_page_token:
+                    payload['nextPageToken'] = next_page_token
+                
+                response = requests.post(url, auth=self.auth, json=payload)
+                if response.status_code != 200:
+                    raise Exception(f"API v3 JQL search returned status {response.status_code}: {response.text}")
+                
+                data = response.json()
+                for issue in data.get('issues', []):
+                    if str(issue.get('id')) in current:
+                        continue
+                    fields = issue.get('fields', {})
+                    story_points = None
+                    for field_id in self._story_point_changelog_fields():
+                        try:
+                            if fields.get(field_id) is not None:
+                                story_points = float(fields[field_id])
+                                break
+                        except (ValueError, TypeError):
+                            continue
+                    removed.append({
+                        'id': str(issue.get('id')),
+                        'key': issue.get('key'),
+                        'story_points': story_points,
+                        'status': (fields.get('status') or {}).get('name', '')
+                    })
+                
+                next_page_token = data.get('nextPageToken')
+                if not next_page_token or data.get('isLast', True):
+                    break
+        except Exception as e:
+            print(f"WARNING: Could not find issues removed from sprint {sprint_id}: {e}")
+            return []
+        
+        return removed
+    
+    def iter_issue_changelogs(self, issue_ids: List[str], batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream status, sprint and story point changes for issues in bulk
+        
+        Uses the bulk changelog endpoint (batched and paginated), falling back to
+        the per-issue changelog endpoint if bulk fetch is unavailable. Pages of
+        a batch can each hold part of an issue's history, so a batch's pages are
+        merged and one record per issue is yielded when the batch completes;
+        memory is bounded by batch_size issues, not the sprint.
+        """
+        field_ids = ['status', config.Config.SPRINT_FIELD_ID] + self._story_point_changelog_fields()
+        url = f"{self.server}/rest/api/3/changelog/bulkfetch"
+        
+        for batch_start in range(0, len(issue_ids), batch_size):
+            batch = issue_ids[batch_start:batch_start + batch_size]
+            next_page_token = None
+            # issue id -> histories from every page of this batch
+            batch_histories = {}
+            
+            while True:
+                payload = {
+                    'issueIdsOrKeys': batch,
+                    'fieldIds': field_ids,
+                    'maxResults': 1000
+                }
+                if next_page_token:
+                    payload['nextPageToken'] = next_page_token
+                
+                response = requests.post(url, auth=self.auth, json=payload)
+                
+                if response.status_code in (404, 405) and batch_start == 0 and not next_page_token:
+                    # Bulk fetch not supported on this instance
+                    yield from self._iter_issue_changelogs_individually(issue_ids, field_ids)
+                    return
+                
+                if response.status_code != 200:
+                    raise Exception(f"Changelog bulk fetch returned status {response.status_code}: {response.text}")
+                
+                data = response.json()
+                for changelog in data.get('issueChangeLogs', []):
+                    batch_histories.setdefault(str(changelog.get('issueId')), []).extend(
+                        self._slim_histories(changelog.get('changeHistories', []), field_ids)
+                    )
+                
+                next_page_token = data.get('nextPageToken')
+                if not next_page_token:
+                    break
+            
+            for issue_id, histories in batch_histories.items():
+                yield {'issue_id': issue_id, 'histories': histories}
+    
+    def _iter_issue_changelogs_individually(self, issue_ids: Iterable[str], field_ids: List[str]) -> Iterator[Dict]:
+        """Stream changelogs one issue at a time (paginated)"""
+        for issue_id in issue_ids:
+            url = f"{self.server}/rest/api/3/issue/{issue_id}/changelog"
+            start_at = 0
+            
+            while True:
+                response = requests.get(url, auth=self.auth, params={'startAt': start_at, 'maxResults': 100})
+                if response.status_code != 200:
+                    raise Exception(f"Changelog fetch for {issue_id} returned status {response.status_code}: {response.text}")
+                
+                data = response.json()
+                histories = data.get('values', [])
+                yield {
+                    'issue_id': issue_id,
+                    'histories': self._slim_histories(histories, field_ids)
+                }
+                
+                start_at += len(histories)
+                if not histories or data.get('isLast', True) or start_at >= data.get('total', 0):
+                    break
+    
+    def _slim_histories(self, histories: List[Dict], field_ids: List[str]) -> List[Dict]:
+        """Keep only the timestamp and the changelog items relevant to burndown"""
+        slim = []
+        for history in histories:
+            items = [
+                {key: item.get(key) for key in ('fieldId', 'field', 'from', 'fromString', 'to', 'toString')}
+                for item in history.get('items', [])
+                if item.get('fieldId') in field_ids or (item.get('field') or '').lower() in ('sprint', 'status', 'story points')
+            ]
+            if items:
+                slim.append({'created': history.get('created'), 'items': items})
+        return slim
+    
+    def _story_point_changelog_fields(self) -> List[str]:
+        """Story point field ids to track in changelogs (excluding the Sprint field)"""
+        return [field_id for field_id in STORY_POINT_FIELDS if field_id != config.Config.SPRINT_FIELD_ID]
+    
     def _get_story_points(self, issue) -> Optional[float]:
         """Extract story points from issue"""
         try:
@@ -383,17 +696,27 @@ class JiraClient:
         
         return None
     
+    def _extract_breakdown_fields(self, fields: Dict) -> Dict:
+        """Extract assignee and component names used for metric breakdowns"""
+        assignee = fields.get('assignee') or {}
+        components = fields.get('components') or []
+        return {
+            'assignee': assignee.get('displayName') or assignee.get('emailAddress') or None,
+            'components': [c.get('name', '') for c in components if c.get('name')]
+        }
+    
     def _is_defect(self, issue) -> bool:
         """Check if issue is a defect/bug"""
         issue_type = issue.fields.issuetype.name.lower()
         return issue_type in ['bug', 'defect', 'error']
     
-    def get_current_sprint(self, board_id: str) -> Optional[Dict]:
+    def get_current_sprint(self, board_id: str, include_breakdown_fields: bool = False,
+                           include_changelog: bool = False) -> Optional[Dict]:
         """Get current active sprint"""
         sprint = self.get_sprint(board_id)
         if sprint:
-            metrics = self.get_sprint_metrics(board_id, sprint.id)
-            return {
+            metrics = self.get_sprint_metrics(board_id, sprint.id, include_breakdown_fields=include_breakdown_fields)
+            sprint_dict = {
                 'id': sprint.id,
                 'name': sprint.name,
                 'state': sprint.state,
@@ -401,4 +724,7 @@ class JiraClient:
                 'end_date': sprint.endDate,
                 'metrics': metrics
             }
+            if include_changelog:
+                sprint_dict['burndown'] = self.get_sprint_burndown(board_id, sprint_dict)
+            return sprint_dict
         return None
@@ -1,141 +1,604 @@
 """Main script to generate velocity metrics PPT"""
 import os
 import sys
+import json
+import shutil
 import argparse
+import threading
 from datetime import datetime
 from jira_client import JiraClient
 from metrics_calculator import MetricsCalculator
-from ppt_generator import PPTGenerator
+from portfolio import PortfolioAggregator
+from metrics_cache import MetricsCache, stable_hash
 import config
 
 
-def generate_report_for_team(team_config: dict, upload_to_confluence: bool = False):
-    """Generate report for a specific team"""
-    team_name = team_config['name']
+def fetch_team_sprints(team_config: dict, jira_client: JiraClient, include_changelog: bool = False):
+    """Fetch the current and historical sprints for a team
+    
+    Returns (current_sprint, historical_sprints), or None if the board has no
+    sprints.
+    """
     board_id = team_config['board_id']
-    project_key = team_config['project_key']
     
+    # Get current sprint
+    print("Fetching current sprint...")
+    current_sprint = jira_client.get_current_sprint(
+        board_id,
+        include_breakdown_fields=config.Config.METRICS_BREAKDOWNS,
+        include_changelog=include_changelog
+    )
+    
+    if not current_sprint:
+        print(f"WARNING: No active sprint found for board {board_id}")
+        print("Attempting to use most recent sprint...")
+        historical = jira_client.get_historical_sprints(
+            board_id, limit=1, include_breakdown_fields=config.Config.METRICS_BREAKDOWNS,
+            include_changelog=include_changelog
+        )
+        if historical:
+            current_sprint = historical[0]
+        else:
+            print(f"ERROR: No sprints found for board {board_id}")
+            return None
+    
+    print(f"Current Sprint: {current_sprint.get('name', 'Unknown')}")
+    
+    # Get historical sprints for comparison
+    print("Fetching historical sprints...")
+    spill_dir = os.path.join(config.Config.CACHE_DIR, 'issues') if config.Config.SPILL_HISTORICAL_ISSUES else None
+    historical_sprints = jira_client.get_historical_sprints(
+        board_id, limit=20, include_changelog=include_changelog,
+        summary_only=config.Config.HISTORY_SUMMARY_ONLY, spill_dir=spill_dir
+    )
+    print(f"Found {len(historical_sprints)} historical sprints")
+    
+    return current_sprint, historical_sprints
+
+
+def fetch_team_metrics(team_config: dict, jira_client: JiraClient, calculator: MetricsCalculator,
+                       include_changelog: bool = False):
+    """Fetch sprint data for a team and calculate its metrics
+    
+    Returns (current_sprint, historical_sprints, comprehensive_metrics), or None
+    if the board has no sprints.
+    """
+    sprints = fetch_team_sprints(team_config, jira_client, include_changelog=include_changelog)
+    if sprints is None:
+        return None
+    current_sprint, historical_sprints = sprints
+    
+    # Calculate metrics
+    print("Calculating metrics...")
+    comprehensive_metrics = calculator.generate_comprehensive_metrics(
+        current_sprint,
+        historical_sprints
+    )
+    
+    return current_sprint, historical_sprints, comprehensive_metrics
+
+
+def print_team_header(team_config: dict):
+    """Print the banner that starts a team's report output"""
     print(f"\n{'='*60}")
-    print(f"Generating report for team: {team_name}")
-    print(f"Board ID: {board_id} | Project: {project_key}")
+    print(f"Generating report for team: {team_config['name']}")
+    print(f"Board ID: {team_config['board_id']} | Project: {team_config['project_key']}")
     print(f"{'='*60}\n")
+
+
+def record_team_metrics(team_config: dict, comprehensive_metrics: dict, historical_sprints: list,
+                        portfolio: PortfolioAggregator = None, snapshot_writer=None):
+    """Print a team's metrics summary and record it for portfolio roll-ups and dashboard snapshots"""
+    # Cache the team summary so portfolio roll-ups can reuse it
+    if portfolio is not None:
+        portfolio.add_team_summary(
+            portfolio.summarize_team(team_config, comprehensive_metrics, historical_sprints)
+        )
+    
+    # Display metrics summary
+    print("\n" + "="*60)
+    print("METRICS SUMMARY")
+    print("="*60)
+    current = comprehensive_metrics.get('current_sprint', {})
+    improvement = comprehensive_metrics.get('velocity_improvement', {})
+    defects = comprehensive_metrics.get('defect_metrics', {})
+    
+    print(f"\nCurrent Sprint:")
+    print(f"  - Story Points Committed: {current.get('committed_story_points', 0)}")
+    print(f"  - Story Points Completed: {current.get('completed_story_points', 0)}")
+    print(f"  - Completion Rate: {current.get('completion_rate', 0)}%")
+    print(f"  - Defects: {current.get('defect_count', 0)}")
+    
+    # Display AI Story Points metrics if available
+    if current.get('has_ai_data', False):
+        print(f"\nAI Impact Analysis:")
+        print(f"  - AI Story Points (without AI): {current.get('ai_story_points_committed', 0)} SP")
+        print(f"  - Actual Story Points (with AI): {current.get('committed_story_points', 0)} SP")
+        print(f"  - Time Saved: {current.get('time_saved_total', 0)} SP ({current.get('time_saved_percent', 0)}%)")
+        print(f"  - Time Saved (Completed): {current.get('time_saved_completed', 0)} SP")
+    
+    burndown = comprehensive_metrics.get('burndown')
+    if burndown:
+        print(f"\nScope Change (from changelogs):")
+        print(f"  - Initial Commitment: {burndown.get('initial_commitment', 0)} SP")
+        print(f"  - Scope Added: {burndown.get('scope_added', 0)} SP")
+        print(f"  - Scope Removed: {burndown.get('scope_removed', 0)} SP")
+        print(f"  - Re-estimated: {burndown.get('re_estimated_points', 0)} SP ({burndown.get('re_estimate_count', 0)} changes)")
+    
+    print(f"\nVelocity Improvement:")
+    print(f"  - Baseline Velocity: {improvement.get('baseline_velocity', 0)} SP")
+    print(f"  - Post-AI Velocity: {improvement.get('post_ai_velocity', 0)} SP")
+    print(f"  - Improvement: {improvement.get('improvement_percent', 0)}%")
+    
+    print(f"\nDefect Metrics:")
+    print(f"  - Baseline Avg Defects: {defects.get('baseline_avg_defects', 0)}")
+    print(f"  - Post-AI Avg Defects: {defects.get('post_ai_avg_defects', 0)}")
+    print(f"  - Defect Reduction: {defects.get('defect_reduction_percent', 0)}%")
+    print("="*60 + "\n")
+    
+    # Static dashboard data (MetricsData JSON + HTML report)
+    if snapshot_writer is not None:
+        paths = snapshot_writer.write(team_config, comprehensive_metrics)
+        print(f"✓ Dashboard snapshot: {paths['latest']} (HTML: {paths['html']})")
+
+
+def render_team_report(team_name: str, comprehensive_metrics: dict, metrics_cache: MetricsCache = None,
+                       chart_backend: str = None, template: str = None, pdf: bool = False) -> str:
+    """Render a team's PowerPoint (and optional PDF) report, returning the .pptx path"""
+    print("Generating PowerPoint presentation...")
+    os.makedirs('reports', exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_file = f"reports/{team_name}_velocity_report_{timestamp}.pptx"
+    
+    # Decks rendered today from identical metrics are reused without re-rendering
+    cached_deck = None
+    cache_key = comprehensive_metrics.get('cache_key')
+    if metrics_cache is not None and cache_key:
+        backend = chart_backend or config.Config.CHART_BACKEND
+        # Chart image settings change the deck's bytes, so they are part of the key
+        backend += f"_{config.Config.CHART_IMAGE_DPI}dpi{'_opt' if config.Config.CHART_PNG_OPTIMIZE else ''}"
+        template_path = template if template is not None else config.Config.PPT_TEMPLATE
+        if template_path:
+            # Edits to the template must not reuse decks rendered from the old one
+            backend += '_' + stable_hash([template_path, os.path.getmtime(template_path)])[:8]
+        cached_deck = metrics_cache.artifact_path(
+            cache_key, f"{team_name}_{backend}_{datetime.now().strftime('%Y%m%d')}.pptx"
+        )
+    
+    if cached_deck and os.path.exists(cached_deck):
+        print("Metrics unchanged, reusing previously rendered presentation")
+        shutil.copyfile(cached_deck, output_file)
+    else:
+        # Rendering dependencies (python-pptx, matplotlib) load only when a deck is built
+        from ppt_generator import PPTGenerator
+        ppt_generator = PPTGenerator(chart_backend=chart_backend, template=template)
+        ppt_generator.generate_presentation(team_name, comprehensive_metrics, output_file)
+        if cached_deck:
+            shutil.copyfile(output_file, cached_deck)
+    
+    print(f"\n✓ Successfully generated report: {output_file}")
+    
+    if pdf:
+        from pdf_report import PDFReportGenerator
+        PDFReportGenerator().generate_pdf(team_name, comprehensive_metrics, output_file[:-len('.pptx')] + '.pdf')
+    
+    return output_file
+
+
+def upload_team_report(team_name: str, current_sprint: dict, comprehensive_metrics: dict, output_file: str,
+                       upload_to_confluence: bool = False, chart_backend: str = None, template: str = None,
+                       upload_queue=None):
+    """Upload a team's report to Confluence (or queue it), or print how to enable uploads"""
+    if not upload_to_confluence:
+        confluence_page_id = os.getenv('CONFLUENCE_PAGE_ID', '')
+        if confluence_page_id:
+            print(f"\n💡 Tip: Use --upload flag to upload this report to Confluence")
+        else:
+            print(f"\n💡 Tip: Add CONFLUENCE_PAGE_ID to .env and use --upload flag to upload to Confluence")
+        return
+    
+    confluence_page_id = os.getenv('CONFLUENCE_PAGE_ID', '')
+    if not confluence_page_id:
+        print(f"\n⚠ Confluence upload requested but CONFLUENCE_PAGE_ID not set in .env")
+        print(f"  Add CONFLUENCE_PAGE_ID to .env to enable upload to Confluence")
+        return
+    
+    try:
+        from confluence_uploader import ConfluenceUploader, report_fingerprint
+        comment = f"Sprint velocity report for {team_name} - {current_sprint.get('name', 'Current Sprint')}"
+        # Identify the report by its metrics, not the timestamped file name
+        content_hash = report_fingerprint(
+            comprehensive_metrics,
+            chart_backend=chart_backend or config.Config.CHART_BACKEND,
+            template=template if template is not None else config.Config.PPT_TEMPLATE,
+            chart_image_dpi=config.Config.CHART_IMAGE_DPI,
+            chart_png_optimize=config.Config.CHART_PNG_OPTIMIZE
+        )
+        if upload_queue is not None:
+            print(f"\nQueued Confluence upload (runs in the background)")
+            upload_queue.submit(team_name, output_file, comment=comment, content_hash=content_hash)
+            return
+        
+        print(f"\nUploading to Confluence...")
+        uploader = ConfluenceUploader()
+        if (config.Config.CONFLUENCE_SKIP_UNCHANGED
+                and uploader.is_unchanged(team_name, content_hash)):
+            print(f"✓ Metrics unchanged since the last upload, skipping Confluence upload")
+        elif uploader.upload_attachment(output_file, comment=comment,
+                                        report_key=team_name, content_hash=content_hash):
+            print(f"✓ Successfully uploaded to Confluence page {confluence_page_id}")
+            
+            # Add attachment links to page content so they're visible
+            print(f"Adding attachment links to page content...")
+            uploader.update_reports_section()
+        else:
+            print(f"⚠ Failed to upload to Confluence (check CONFLUENCE_PAGE_ID in .env)")
+    except ValueError as e:
+        print(f"⚠ Confluence upload skipped: {str(e)}")
+        print(f"  (Add CONFLUENCE_PAGE_ID to .env to enable upload)")
+    except Exception as e:
+        print(f"⚠ Confluence upload failed: {str(e)}")
+
+
+def generate_report_for_team(team_config: dict, upload_to_confluence: bool = False, portfolio: PortfolioAggregator = None,
+                             include_changelog: bool = False, metrics_cache: MetricsCache = None,
+                             chart_backend: str = None, template: str = None, pdf: bool = False,
+                             snapshot_writer=None, upload_queue=None):
+    """Generate report for a specific team
+    
+    When upload_queue is given, the upload is queued for its background worker
+    and the Confluence page update is left to the caller, so a multi-team run
+    overlaps uploads with the next team and updates the page once.
+    """
+    team_name = team_config['name']
+    print_team_header(team_config)
     
     try:
         # Initialize clients
         jira_client = JiraClient()
-        calculator = MetricsCalculator(config.Config.AI_ADOPTION_DATE)
-        ppt_generator = PPTGenerator()
+        calculator = MetricsCalculator(config.Config.AI_ADOPTION_DATE, cache=metrics_cache)
         
-        # Get current sprint
-        print("Fetching current sprint...")
-        current_sprint = jira_client.get_current_sprint(board_id)
+        result = fetch_team_metrics(team_config, jira_client, calculator, include_changelog=include_changelog)
+        if result is None:
+            return False
+        current_sprint, historical_sprints, comprehensive_metrics = result
         
-        if not current_sprint:
-            print(f"WARNING: No active sprint found for board {board_id}")
-            print("Attempting to use most recent sprint...")
-            historical = jira_client.get_historical_sprints(board_id, limit=1)
-            if historical:
-                current_sprint = historical[0]
-            else:
-                print(f"ERROR: No sprints found for board {board_id}")
-                return False
-        
-        print(f"Current Sprint: {current_sprint.get('name', 'Unknown')}")
+        record_team_metrics(team_config, comprehensive_metrics, historical_sprints,
+                            portfolio=portfolio, snapshot_writer=snapshot_writer)
+        output_file = render_team_report(team_name, comprehensive_metrics, metrics_cache=metrics_cache,
+                                         chart_backend=chart_backend, template=template, pdf=pdf)
+        # Upload to Confluence only if explicitly requested
+        upload_team_report(team_name, current_sprint, comprehensive_metrics, output_file,
+                           upload_to_confluence=upload_to_confluence, chart_backend=chart_backend,
+                           template=template, upload_queue=upload_queue)
         
-        # Get historical sprints for comparison
-        print("Fetching historical sprints...")
-        historical_sprints = jira_client.get_historical_sprints(board_id, limit=20)
-        print(f"Found {len(historical_sprints)} historical sprints")
+        return True
         
-        # Calculate metrics
+    except Exception as e:
+        print(f"\n✗ Error generating report for {team_name}: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def generate_reports_pipeline(teams: list, upload_to_confluence: bool = False, portfolio: PortfolioAggregator = None,
+                              include_changelog: bool = False, metrics_cache: MetricsCache = None,
+                              chart_backend: str = None, template: str = None, pdf: bool = False,
+                              snapshot_writer=None, upload_queue=None) -> list:
+    """Generate team reports as a fetch -> compute -> render pipeline
+    
+    Jira fetches for later teams overlap with metric computation and
+    rendering for earlier ones. Stage concurrency comes from
+    PIPELINE_*_WORKERS; rendered reports are handed to the upload queue.
+    Returns per-team success in team order.
+    """
+    from pipeline import Pipeline, Stage
+    
+    local = threading.local()
+    calculator = MetricsCalculator(config.Config.AI_ADOPTION_DATE, cache=metrics_cache)
+    
+    def fetch(item):
+        print_team_header(item['team'])
+        if getattr(local, 'jira_client', None) is None:
+            local.jira_client = JiraClient()
+        sprints = fetch_team_sprints(item['team'], local.jira_client, include_changelog=include_changelog)
+        if sprints is None:
+            return None
+        item['current_sprint'], item['historical_sprints'] = sprints
+        return item
+    
+    def compute(item):
         print("Calculating metrics...")
-        comprehensive_metrics = calculator.generate_comprehensive_metrics(
-            current_sprint,
-            historical_sprints
-        )
-        
-        # Display metrics summary
-        print("\n" + "="*60)
-        print("METRICS SUMMARY")
-        print("="*60)
-        current = comprehensive_metrics.get('current_sprint', {})
-        improvement = comprehensive_metrics.get('velocity_improvement', {})
-        defects = comprehensive_metrics.get('defect_metrics', {})
-        
-        print(f"\nCurrent Sprint:")
-        print(f"  - Story Points Committed: {current.get('committed_story_points', 0)}")
-        print(f"  - Story Points Completed: {current.get('completed_story_points', 0)}")
-        print(f"  - Completion Rate: {current.get('completion_rate', 0)}%")
-        print(f"  - Defects: {current.get('defect_count', 0)}")
-        
-        # Display AI Story Points metrics if available
-        if current.get('has_ai_data', False):
-            print(f"\nAI Impact Analysis:")
-            print(f"  - AI Story Points (without AI): {current.get('ai_story_points_committed', 0)} SP")
-            print(f"  - Actual Story Points (with AI): {current.get('committed_story_points', 0)} SP")
-            print(f"  - Time Saved: {current.get('time_saved_total', 0)} SP ({current.get('time_saved_percent', 0)}%)")
-            print(f"  - Time Saved (Completed): {current.get('time_saved_completed', 0)} SP")
-        
-        print(f"\nVelocity Improvement:")
-        print(f"  - Baseline Velocity: {improvement.get('baseline_velocity', 0)} SP")
-        print(f"  - Post-AI Velocity: {improvement.get('post_ai_velocity', 0)} SP")
-        print(f"  - Improvement: {improvement.get('improvement_percent', 0)}%")
-        
-        print(f"\nDefect Metrics:")
-        print(f"  - Baseline Avg Defects: {defects.get('baseline_avg_defects', 0)}")
-        print(f"  - Post-AI Avg Defects: {defects.get('post_ai_avg_defects', 0)}")
-        print(f"  - Defect Reduction: {defects.get('defect_reduction_percent', 0)}%")
-        print("="*60 + "\n")
+        item['metrics'] = calculator.generate_comprehensive_metrics(item['current_sprint'], item['historical_sprints'])
+        record_team_metrics(item['team'], item['metrics'], item['historical_sprints'],
+                            portfolio=portfolio, snapshot_writer=snapshot_writer)
+        # Raw sprint data is no longer needed once metrics exist
+        del item['historical_sprints']
+        return item
+    
+    def render(item):
+        team_name = item['team']['name']
+        output_file = render_team_report(team_name, item['metrics'], metrics_cache=metrics_cache,
+                                         chart_backend=chart_backend, template=template, pdf=pdf)
+        upload_team_report(team_name, item['current_sprint'], item['metrics'], output_file,
+                           upload_to_confluence=upload_to_confluence, chart_backend=chart_backend,
+                           template=template, upload_queue=upload_queue)
+        return item
+    
+    pipeline = Pipeline([
+        Stage('fetch', fetch, config.Config.PIPELINE_FETCH_WORKERS),
+        Stage('compute', compute, config.Config.PIPELINE_COMPUTE_WORKERS),
+        Stage('render', render, config.Config.PIPELINE_RENDER_WORKERS),
+    ], queue_size=config.Config.PIPELINE_QUEUE_SIZE, describe=lambda item: item['team']['name'])
+    
+    print(f"Pipeline: fetch x{config.Config.PIPELINE_FETCH_WORKERS}, compute x{config.Config.PIPELINE_COMPUTE_WORKERS}, "
+          f"render x{config.Config.PIPELINE_RENDER_WORKERS} (output is shown per team as each finishes)")
+    results = pipeline.run([{'team': team} for team in teams])
+    
+    print(f"\n{'='*60}")
+    print("PIPELINE STAGES")
+    print(f"{'='*60}")
+    print(pipeline.summary())
+    return results
+
+
+def run_daemon(teams: list, upload_to_confluence: bool = False, include_changelog: bool = False,
+               chart_backend: str = None, template: str = None, pdf: bool = False, snapshot_writer=None,
+               run_now: bool = False):
+    """Stay resident and regenerate team reports on their cron schedules
+    
+    The Jira client, closed-sprint summaries, computed metrics, the chart
+    cache and the chart render pool stay warm between runs. A cheap board
+    fingerprint is checked first; boards whose Jira data hasn't moved are
+    skipped, and reports are only re-rendered and uploaded when the metrics
+    changed.
+    """
+    from scheduler import ReportScheduler, parse_team_schedules
+    
+    metrics_cache = MetricsCache(config.Config.METRICS_CACHE_SIZE, use_disk=config.Config.METRICS_CACHE_ENABLED)
+    calculator = MetricsCalculator(config.Config.AI_ADOPTION_DATE, cache=metrics_cache)
+    portfolio = PortfolioAggregator(config.Config.AI_ADOPTION_DATE)
+    jira_client = JiraClient()
+    # team name -> {'signature': board fingerprint, 'metrics_key': metrics hash, 'report': last report path}
+    state = {}
+    
+    def run_due(due_teams):
+        print(f"\n{'='*60}")
+        print(f"Scheduled run at {datetime.now().strftime('%Y-%m-%d %H:%M')}: {', '.join(t['name'] for t in due_teams)}")
+        print(f"{'='*60}")
         
-        # Generate PowerPoint
-        print("Generating PowerPoint presentation...")
-        os.makedirs('reports', exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_file = f"reports/{team_name}_velocity_report_{timestamp}.pptx"
+        upload_queue = None
+        if upload_to_confluence and os.getenv('CONFLUENCE_PAGE_ID', ''):
+            try:
+                from confluence_uploader import ConfluenceUploader
+                from upload_queue import UploadQueue
+                upload_queue = UploadQueue(ConfluenceUploader())
+            except ValueError as e:
+                print(f"⚠ Confluence upload skipped: {str(e)}")
         
-        ppt_generator.generate_presentation(team_name, comprehensive_metrics, output_file)
+        counts = {'unchanged': 0, 'regenerated': 0, 'failed': 0}
+        for team in due_teams:
+            team_name = team['name']
+            previous = state.get(team_name, {})
+            signature = jira_client.get_board_signature(team['board_id'])
+            if signature is not None and signature == previous.get('signature'):
+                print(f"\n✓ {team_name}: no Jira changes since the last run, skipped")
+                counts['unchanged'] += 1
+                continue
+            
+            print_team_header(team)
+            try:
+                result = fetch_team_metrics(team, jira_client, calculator, include_changelog=include_changelog)
+                if result is None:
+                    counts['failed'] += 1
+                    continue
+                current_sprint, historical_sprints, comprehensive_metrics = result
+                
+                metrics_key = comprehensive_metrics.get('cache_key') or stable_hash(comprehensive_metrics)
+                if metrics_key == previous.get('metrics_key'):
+                    print(f"✓ Metrics unchanged, keeping {previous.get('report')}")
+                    state[team_name] = dict(previous, signature=signature)
+                    counts['unchanged'] += 1
+                    continue
+                
+                # Refresh the on-disk summary for portfolio roll-ups without holding every run in memory
+                portfolio.summarize_team(team, comprehensive_metrics, historical_sprints)
+                record_team_metrics(team, comprehensive_metrics, historical_sprints, snapshot_writer=snapshot_writer)
+                output_file = render_team_report(team_name, comprehensive_metrics, metrics_cache=metrics_cache,
+                                                 chart_backend=chart_backend, template=template, pdf=pdf)
+                upload_team_report(team_name, current_sprint, comprehensive_metrics, output_file,
+                                   upload_to_confluence=upload_to_confluence, chart_backend=chart_backend,
+                                   template=template, upload_queue=upload_queue)
+                state[team_name] = {'signature': signature, 'metrics_key': metrics_key, 'report': output_file}
+                counts['regenerated'] += 1
+            except Exception as e:
+                print(f"\n✗ Error generating report for {team_name}: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                counts['failed'] += 1
         
-        print(f"\n✓ Successfully generated report: {output_file}")
-        
-        # Upload to Confluence only if explicitly requested
-        if upload_to_confluence:
-            confluence_page_id = os.getenv('CONFLUENCE_PAGE_ID', '')
-            if confluence_page_id:
+        if upload_queue is not None:
+            upload_queue.close()
+            if upload_queue.counts()['uploaded']:
                 try:
-                    print(f"\nUploading to Confluence...")
-                    from confluence_uploader import ConfluenceUploader
-                    uploader = ConfluenceUploader()
-                    comment = f"Sprint velocity report for {team_name} - {current_sprint.get('name', 'Current Sprint')}"
-                    if uploader.upload_attachment(output_file, comment=comment):
-                        print(f"✓ Successfully uploaded to Confluence page {confluence_page_id}")
-                        
-                        # Add attachment links to page content so they're visible
-                        print(f"Adding attachment links to page content...")
-                        uploader.add_attachments_to_page_content()
-                    else:
-                        print(f"⚠ Failed to upload to Confluence (check CONFLUENCE_PAGE_ID in .env)")
-                except ValueError as e:
-                    print(f"⚠ Confluence upload skipped: {str(e)}")
-                    print(f"  (Add CONFLUENCE_PAGE_ID to .env to enable upload)")
+                    upload_queue.uploader.update_reports_section()
                 except Exception as e:
-                    print(f"⚠ Confluence upload failed: {str(e)}")
-            else:
-                print(f"\n⚠ Confluence upload requested but CONFLUENCE_PAGE_ID not set in .env")
-                print(f"  Add CONFLUENCE_PAGE_ID to .env to enable upload to Confluence")
+                    print(f"⚠ Confluence page update failed: {str(e)}")
+            print(f"Confluence uploads: {upload_queue.summary()}")
+        
+        print(f"\nRun complete - regenerated: {counts['regenerated']}, unchanged: {counts['unchanged']}, "
+              f"failed: {counts['failed']}")
+        print(f"Metrics cache: {metrics_cache.summary()}")
+    
+    try:
+        scheduler = ReportScheduler(teams, run_due, config.Config.DAEMON_SCHEDULE,
+                                    parse_team_schedules(config.Config.TEAM_SCHEDULES))
+    except ValueError as e:
+        print(f"ERROR: Invalid schedule: {str(e)}")
+        return False
+    
+    print(f"\nDaemon mode: {len(teams)} team(s) scheduled (Ctrl+C to stop)")
+    for team in teams:
+        print(f"  - {team['name']}: {scheduler.schedules[team['name']].expression}")
+    scheduler.run_forever(run_now=run_now)
+    return True
+
+
+def generate_portfolio_report(teams: list, refresh: bool = False) -> bool:
+    """Roll up metrics across all teams, reusing cached per-team summaries"""
+    print(f"\n{'='*60}")
+    print(f"Generating portfolio roll-up for {len(teams)} team(s)")
+    print(f"{'='*60}\n")
+    
+    portfolio = PortfolioAggregator(config.Config.AI_ADOPTION_DATE)
+    jira_client = None
+    calculator = MetricsCalculator(config.Config.AI_ADOPTION_DATE)
+    
+    for team in teams:
+        summary = None
+        if not refresh:
+            summary = portfolio.load_team_summary(
+                team['name'], max_age_hours=config.Config.PORTFOLIO_CACHE_TTL_HOURS
+            )
+        
+        if summary:
+            print(f"Using cached summary for team: {team['name']}")
+            # Capacity comes from the current configuration, not the cache
+            summary['capacity'] = team.get('capacity', 1.0)
         else:
-            confluence_page_id = os.getenv('CONFLUENCE_PAGE_ID', '')
-            if confluence_page_id:
-                print(f"\n💡 Tip: Use --upload flag to upload this report to Confluence")
-            else:
-                print(f"\n💡 Tip: Add CONFLUENCE_PAGE_ID to .env and use --upload flag to upload to Confluence")
+            print(f"Fetching data for team: {team['name']}")
+            try:
+                if jira_client is None:
+                    jira_client = JiraClient()
+                result = fetch_team_metrics(team, jira_client, calculator)
+            except Exception as e:
+                print(f"✗ Error fetching data for {team['name']}: {str(e)}")
+                continue
+            if result is None:
+                continue
+            _, historical_sprints, comprehensive_metrics = result
+            summary = portfolio.summarize_team(team, comprehensive_metrics, historical_sprints)
         
-        return True
+        portfolio.add_team_summary(summary)
+    
+    if not portfolio.team_summaries:
+        print("ERROR: No team data available for portfolio roll-up")
+        return False
+    
+    portfolio_metrics = portfolio.calculate_portfolio_metrics()
+    improvement = portfolio_metrics['velocity_improvement']
+    defects = portfolio_metrics['defect_metrics']
+    ai_metrics = portfolio_metrics['ai_metrics']
+    
+    print("\n" + "="*60)
+    print("PORTFOLIO SUMMARY")
+    print("="*60)
+    print(f"\nTeams: {portfolio_metrics['team_count']} | Total Capacity: {portfolio_metrics['total_capacity']}")
+    print(f"Velocities normalized to {portfolio_metrics['sprint_length_days']}-day sprints")
+    
+    print(f"\nVelocity:")
+    print(f"  - Baseline Velocity: {improvement['baseline_velocity']} SP")
+    print(f"  - Post-AI Velocity: {improvement['post_ai_velocity']} SP")
+    print(f"  - Improvement (capacity weighted): {improvement['improvement_percent']}%")
+    
+    print(f"\nAI Impact (current sprints):")
+    print(f"  - Time Saved: {ai_metrics['time_saved_total']} SP ({ai_metrics['time_saved_percent']}%)")
+    
+    print(f"\nDefects:")
+    print(f"  - Baseline Avg Defects: {defects['baseline_avg_defects']}")
+    print(f"  - Post-AI Avg Defects: {defects['post_ai_avg_defects']}")
+    print(f"  - Defect Reduction (capacity weighted): {defects['defect_reduction_percent']}%")
+    
+    print(f"\nPer Team:")
+    for team in portfolio_metrics['teams']:
+        print(f"  - {team['team']} (capacity {team['capacity']}): "
+              f"{team['velocity_improvement']['post_ai_velocity']} SP, "
+              f"{team['velocity_improvement']['improvement_percent']}% velocity, "
+              f"{team['time_saved_total']} SP saved")
+    print("="*60 + "\n")
+    
+    os.makedirs('reports', exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_file = f"reports/portfolio_metrics_{timestamp}.json"
+    with open(output_file, 'w') as f:
+        json.dump(portfolio_metrics, f, indent=2)
+    
+    print(f"✓ Successfully generated portfolio roll-up: {output_file}")
+    return True
+
+
+def generate_consolidated_report(teams: list, upload_to_confluence: bool = False, include_changelog: bool = False,
+                                 metrics_cache: MetricsCache = None, chart_backend: str = None,
+                                 template: str = None) -> bool:
+    """Generate a single deck with a section per team and portfolio summary slides
+    
+    Teams are appended one at a time; only their small portfolio summaries are
+    kept, so memory does not grow with each team's issue data.
+    """
+    print(f"\n{'='*60}")
+    print(f"Generating consolidated report for {len(teams)} team(s)")
+    print(f"{'='*60}\n")
+    
+    from ppt_generator import PPTGenerator
+    ppt_generator = PPTGenerator(chart_backend=chart_backend, template=template)
+    ppt_generator.create_title_slide(
+        "Portfolio", "",
+        subtitle=f"{len(teams)} team(s) | Generated: {datetime.now().strftime('%B %d, %Y')}"
+    )
+    
+    portfolio = PortfolioAggregator(config.Config.AI_ADOPTION_DATE)
+    calculator = MetricsCalculator(config.Config.AI_ADOPTION_DATE, cache=metrics_cache)
+    jira_client = None
+    
+    for team in teams:
+        print(f"\nAdding section for team: {team['name']}")
+        try:
+            if jira_client is None:
+                jira_client = JiraClient()
+            result = fetch_team_metrics(team, jira_client, calculator, include_changelog=include_changelog)
+        except Exception as e:
+            print(f"✗ Error fetching data for {team['name']}: {str(e)}")
+            continue
+        if result is None:
+            continue
+        _, historical_sprints, comprehensive_metrics = result
         
-    except Exception as e:
-        print(f"\n✗ Error generating report for {team_name}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        portfolio.add_team_summary(portfolio.summarize_team(team, comprehensive_metrics, historical_sprints))
+        ppt_generator.build_presentation(team['name'], comprehensive_metrics)
+        # Place this team's charts now so rendered images don't accumulate across teams
+        ppt_generator.place_pending_charts()
+    
+    if not portfolio.team_summaries:
+        print("ERROR: No team data available for consolidated report")
         return False
+    
+    # Roll-up slides open the deck, right after the title slide
+    ppt_generator.create_portfolio_summary_slides(portfolio.calculate_portfolio_metrics(), position=1)
+    
+    os.makedirs('reports', exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_file = f"reports/Portfolio_velocity_report_{timestamp}.pptx"
+    ppt_generator.save(output_file)
+    
+    print(f"\n✓ Successfully generated consolidated report with "
+          f"{len(portfolio.team_summaries)}/{len(teams)} team(s): {output_file}")
+    
+    if upload_to_confluence:
+        if not os.getenv('CONFLUENCE_PAGE_ID', ''):
+            print(f"\n⚠ Confluence upload requested but CONFLUENCE_PAGE_ID not set in .env")
+            return True
+        try:
+            print(f"\nUploading to Confluence...")
+            from confluence_uploader import ConfluenceUploader
+            uploader = ConfluenceUploader()
+            if uploader.upload_attachment(output_file, comment=f"Consolidated velocity report - {len(teams)} team(s)"):
+                uploader.update_reports_section()
+            else:
+                print(f"⚠ Failed to upload to Confluence (check CONFLUENCE_PAGE_ID in .env)")
+        except Exception as e:
+            print(f"⚠ Confluence upload failed: {str(e)}")
+    
+    return True
 
 
 def main():
@@ -154,6 +617,24 @@ Examples:
   
   # Alternative short form
   python3 main.py -u
+  
+  # Roll up metrics across all teams (reuses cached team data)
+  python3 main.py --portfolio
+  
+  # One deck for all teams with portfolio summary slides
+  python3 main.py --consolidated
+  
+  # Process 8 teams at a time
+  python3 main.py --jobs 8
+  
+  # Overlap Jira fetches with computing and rendering earlier teams
+  python3 main.py --pipeline
+  
+  # Stay running and regenerate reports on a schedule
+  python3 main.py --daemon --upload
+  
+  # Show where the time goes and write a Chrome trace
+  python3 main.py --profile profile.json
         """
     )
     parser.add_argument(
@@ -161,9 +642,107 @@ Examples:
         action='store_true',
         help='Upload generated reports to Confluence (requires CONFLUENCE_PAGE_ID in .env)'
     )
+    parser.add_argument(
+        '--portfolio',
+        action='store_true',
+        help='Compute an org-wide roll-up across all teams instead of per-team reports'
+    )
+    parser.add_argument(
+        '--consolidated',
+        action='store_true',
+        help='Build a single deck with a section per team plus portfolio summary slides'
+    )
+    parser.add_argument(
+        '--burndown',
+        action='store_true',
+        help='Replay issue changelogs to add burndown and scope change slides (or set FETCH_CHANGELOGS=true)'
+    )
+    parser.add_argument(
+        '--chart-backend',
+        choices=['native', 'matplotlib'],
+        default=None,
+        help='Chart rendering backend (default: CHART_BACKEND in .env, or native)'
+    )
+    parser.add_argument(
+        '--pdf',
+        action='store_true',
+        help='Also render each team report as a PDF (no office suite needed)'
+    )
+    parser.add_argument(
+        '--snapshot',
+        action='store_true',
+        help='Write versioned dashboard JSON snapshots and a self-contained HTML report per board (SNAPSHOT_DIR)'
+    )
+    parser.add_argument(
+        '--template',
+        default=None,
+        help='PowerPoint template with pre-styled layouts and named placeholders (default: PPT_TEMPLATE in .env)'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='Process this many teams concurrently, output kept per team (default: PARALLEL_JOBS in .env, or 1)'
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Run fetch, compute and render as overlapping stages (PIPELINE_*_WORKERS in .env), takes precedence over --jobs'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Stay running and regenerate reports on a schedule (DAEMON_SCHEDULE / TEAM_SCHEDULES in .env)'
+    )
+    parser.add_argument(
+        '--run-now',
+        action='store_true',
+        help='With --daemon, generate all reports once at startup before waiting for the schedule'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached team summaries and re-fetch all teams from Jira'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='TRACE_FILE',
+        help='Print per-stage timing, HTTP and cache statistics at the end; optionally write a Chrome trace file'
+    )
     
     args = parser.parse_args()
+    if args.consolidated:
+        # The consolidated deck is built team by team into one presentation
+        ignored = [flag for flag, used in (('--pdf', args.pdf), ('--snapshot', args.snapshot),
+                                           ('--jobs', args.jobs is not None), ('--pipeline', args.pipeline)) if used]
+        if ignored:
+            parser.error(f"--consolidated cannot be combined with {', '.join(ignored)}")
+    if args.jobs is None:
+        args.jobs = config.Config.PARALLEL_JOBS
+    
+    if args.profile is None:
+        run(args)
+        return
     
+    from profiler import profiler
+    profiler.install()
+    try:
+        run(args)
+    finally:
+        print("\n" + "="*60)
+        print("PROFILE")
+        print("="*60)
+        print(profiler.summary())
+        if args.profile:
+            print(f"\n✓ Trace written to {profiler.write_trace(args.profile)} (open in chrome://tracing or Perfetto)")
+        print("="*60)
+
+
+def run(args):
+    """Generate reports in the mode selected on the command line"""
     print("="*60)
     print("Jira Velocity Metrics Generator")
     print("="*60)
@@ -194,16 +773,98 @@ Examples:
     
     print(f"\nFound {len(teams)} team(s) to process\n")
     
+    if args.portfolio:
+        if not generate_portfolio_report(teams, refresh=args.refresh):
+            sys.exit(1)
+        return
+    
+    if args.daemon:
+        snapshot_writer = None
+        if args.snapshot:
+            from snapshot import SnapshotWriter
+            snapshot_writer = SnapshotWriter()
+            snapshot_writer.write_boards(teams)
+        if not run_daemon(teams, upload_to_confluence=args.upload,
+                          include_changelog=args.burndown or config.Config.FETCH_CHANGELOGS,
+                          chart_backend=args.chart_backend, template=args.template, pdf=args.pdf,
+                          snapshot_writer=snapshot_writer, run_now=args.run_now):
+            sys.exit(1)
+        return
+    
+    metrics_cache = MetricsCache(config.Config.METRICS_CACHE_SIZE) if config.Config.METRICS_CACHE_ENABLED else None
+    
+    if args.consolidated:
+        if not generate_consolidated_report(teams, upload_to_confluence=args.upload,
+                                            include_changelog=args.burndown or config.Config.FETCH_CHANGELOGS,
+                                            metrics_cache=metrics_cache, chart_backend=args.chart_backend,
+                                            template=args.template):
+            sys.exit(1)
+        return
+    
+    # Team summaries are cached as a side effect for later portfolio roll-ups
+    portfolio = PortfolioAggregator(config.Config.AI_ADOPTION_DATE)
+    
+    snapshot_writer = None
+    if args.snapshot:
+        from snapshot import SnapshotWriter
+        snapshot_writer = SnapshotWriter()
+        snapshot_writer.write_boards(teams)
+    
+    # Uploads run on a background worker while the next team is generated
+    upload_queue = None
+    if args.upload and os.getenv('CONFLUENCE_PAGE_ID', ''):
+        try:
+            from confluence_uploader import ConfluenceUploader
+            from upload_queue import UploadQueue
+            upload_queue = UploadQueue(ConfluenceUploader())
+        except ValueError as e:
+            print(f"⚠ Confluence upload skipped: {str(e)}")
+    
+    def run_team(team):
+        return generate_report_for_team(team, upload_to_confluence=args.upload, portfolio=portfolio,
+                                        include_changelog=args.burndown or config.Config.FETCH_CHANGELOGS,
+                                        metrics_cache=metrics_cache, chart_backend=args.chart_backend,
+                                        template=args.template, pdf=args.pdf, snapshot_writer=snapshot_writer,
+                                        upload_queue=upload_queue)
+    
     # Generate reports for each team
-    success_count = 0
-    for team in teams:
-        if generate_report_for_team(team, upload_to_confluence=args.upload):
-            success_count += 1
+    if args.pipeline:
+        results = generate_reports_pipeline(teams, upload_to_confluence=args.upload, portfolio=portfolio,
+                                            include_changelog=args.burndown or config.Config.FETCH_CHANGELOGS,
+                                            metrics_cache=metrics_cache, chart_backend=args.chart_backend,
+                                            template=args.template, pdf=args.pdf, snapshot_writer=snapshot_writer,
+                                            upload_queue=upload_queue)
+    elif args.jobs > 1 and len(teams) > 1:
+        from parallel_runner import run_teams_parallel
+        print(f"Processing teams with {args.jobs} parallel jobs (output is shown per team as each finishes)")
+        results = run_teams_parallel(teams, run_team, args.jobs)
+    else:
+        results = [run_team(team) for team in teams]
+    success_count = sum(1 for ok in results if ok)
+    failed_teams = [team['name'] for team, ok in zip(teams, results) if not ok]
+    
+    if upload_queue is not None:
+        print(f"\nWaiting for Confluence uploads to finish...")
+        upload_queue.close()
+        upload_counts = upload_queue.counts()
+        # One page update for the whole run
+        if upload_counts['uploaded']:
+            print(f"Adding {upload_counts['uploaded']} report link(s) to Confluence page content...")
+            try:
+                upload_queue.uploader.update_reports_section()
+            except Exception as e:
+                print(f"⚠ Confluence page update failed: {str(e)}")
     
     print("\n" + "="*60)
     print(f"Completed: {success_count}/{len(teams)} reports generated successfully")
-    if args.upload:
-        print(f"Reports uploaded to Confluence: {success_count}/{len(teams)}")
+    if failed_teams:
+        print(f"Failed: {', '.join(failed_teams)}")
+    if upload_queue is not None:
+        print(f"Confluence uploads: {upload_queue.summary()}")
+    elif args.upload:
+        print(f"Reports uploaded to Confluence: 0/{len(teams)}")
+    if metrics_cache is not None:
+        print(f"Metrics cache: {metrics_cache.summary()}")
     print("="*60)
 
 
@@ -0,0 +1,177 @@
+"""Content-hash memoization of computed metrics"""
+import os
+import json
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional
+from datetime import date
+import config
+
+
+def stable_hash(obj) -> str:
+    """Hash a JSON-serializable object independent of dict ordering"""
+    payload = json.dumps(obj, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MetricsCache:
+    """Two-tier (in-memory LRU + on-disk JSON) cache for metrics results
+
+    Entries are keyed by a hash of the inputs (see compute_key), so unchanged
+    board state maps to the same entry across runs. Files on disk (entries and
+    artifacts) are evicted least recently used first, by modification time,
+    once they exceed max_bytes.
+    """
+
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None, use_disk: bool = True,
+                 max_bytes: Optional[int] = None):
+        """Initialize cache"""
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir or os.path.join(config.Config.CACHE_DIR, 'metrics')
+        self.max_bytes = max_bytes if max_bytes is not None else config.Config.METRICS_CACHE_MAX_MB * 1024 * 1024
+        self.use_disk = use_disk
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def compute_key(current_sprint: Dict, historical_sprints: List[Dict], ai_adoption_date: date) -> str:
+        """Build a stable key from sprint ids, issue update timestamps and the adoption date"""
+        sprints = []
+        for sprint in ([current_sprint] if current_sprint else []) + list(historical_sprints):
+            metrics = sprint.get('metrics', {})
+            issues = metrics.get('issues')
+            if issues is not None:
+                issue_state = [(issue.get('key'), issue.get('updated')) for issue in issues]
+                # Fetched fields (e.g. breakdowns) change the result shape
+                issue_state.append(sorted(issues[0].keys()) if issues else [])
+            else:
+                # Summary-only sprints carry aggregates instead of issues
+                issue_state = {k: v for k, v in metrics.items() if k != 'issues'}
+            sprints.append({
+                'id': sprint.get('id'),
+                'state': sprint.get('state'),
+                'start_date': sprint.get('start_date'),
+                'end_date': sprint.get('end_date'),
+                'issues': issue_state,
+                'burndown': stable_hash(sprint['burndown']) if sprint.get('burndown') else None
+            })
+
+        return stable_hash({
+            'ai_adoption_date': ai_adoption_date.isoformat(),
+            'sprints': sprints
+        })
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get a cached result (a copy), checking memory first and then disk"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return copy.deepcopy(self._entries[key])
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+            self._remember(key, value)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict):
+        """Store a result in both tiers"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(key, value)
+
+        if self.use_disk:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{self._disk_path(key)}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(value, f)
+                os.replace(tmp_path, self._disk_path(key))
+                self._evict()
+            except (OSError, TypeError) as e:
+                print(f"WARNING: Could not write metrics cache entry: {e}")
+
+    def artifact_path(self, key: str, suffix: str) -> str:
+        """Path for a rendered artifact (e.g. a deck) derived from a cached result
+
+        An existing artifact is marked as recently used. Old files are evicted
+        first, so the cache stays within max_bytes plus the artifact about to
+        be written.
+        """
+        safe_suffix = ''.join(c if c.isalnum() or c in '._-' else '_' for c in suffix)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f"{key}_{safe_suffix}")
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._evict()
+        return path
+
+    def summary(self) -> str:
+        """Human readable hit/miss summary"""
+        lookups = self.stats['hits'] + self.stats['disk_hits'] + self.stats['misses']
+        hits = self.stats['hits'] + self.stats['disk_hits']
+        rate = (hits / lookups * 100) if lookups else 0
+        return (f"{hits}/{lookups} hits ({rate:.0f}%) - "
+                f"memory: {self.stats['hits']}, disk: {self.stats['disk_hits']}, misses: {self.stats['misses']}")
+
+    def _remember(self, key: str, value: Dict):
+        """Insert into the in-memory LRU (caller holds the lock)"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        """Read an entry from the on-disk tier"""
+        if not self.use_disk:
+            return None
+        try:
+            with open(self._disk_path(key)) as f:
+                value = json.load(f)
+            os.utime(self._disk_path(key), None)
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def _evict(self):
+        """Remove least recently used files until the on-disk tier is under max_bytes"""
+        entries = []
+        total = 0
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _disk_path(self, key: str) -> str:
+        """Get on-disk path for a key"""
+        return os.path.join(self.cache_dir, f"{key}.json")
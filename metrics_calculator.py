@@ -4,12 +4,59 @@ from datetime import date, datetime
 import config
 
 
+# Issue statuses counted as completed work
+COMPLETED_STATUSES = ('done', 'closed', 'resolved')
+
+# Issue attributes metrics are broken down by when available
+BREAKDOWN_ATTRIBUTES = ('assignee', 'components')
+
+
+def extract_ai_points_from_labels(labels):
+    """Extract AI points saved from labels (AI1 = 1 point, AI2 = 2 points, etc.)
+    
+    Only accepts labels in format: AI followed immediately by a number (1-999)
+    Ignores invalid formats like AI2121212, AIJHS, AI 1 (with space), etc.
+    """
+    if not labels:
+        return None
+    for label in labels:
+        if not isinstance(label, str):
+            continue
+            
+        label_upper = label.upper().strip()
+        
+        # Must start with "AI" and have something after it
+        if not label_upper.startswith('AI') or len(label_upper) <= 2:
+            continue
+        
+        # Extract the part after "AI" (must be immediately after, no spaces)
+        after_ai = label_upper[2:]
+        
+        # Must be only digits (no letters, no special chars, no spaces)
+        if not after_ai.isdigit():
+            continue
+        
+        try:
+            points = int(after_ai)
+            # Only accept reasonable values (1-999, 0 is invalid)
+            if 1 <= points <= 999:
+                return float(points)
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+
 class MetricsCalculator:
     """Calculate velocity metrics and AI impact"""
     
-    def __init__(self, ai_adoption_date: date):
-        """Initialize calculator with AI adoption date"""
+    def __init__(self, ai_adoption_date: date, cache=None):
+        """Initialize calculator with AI adoption date
+        
+        If a MetricsCache is given, generate_comprehensive_metrics results are
+        memoized under a hash of the sprint/issue state and adoption date.
+        """
         self.ai_adoption_date = ai_adoption_date
+        self.cache = cache
     
     def calculate_velocity(self, sprints: List[Dict]) -> Dict:
         """Calculate average velocity from sprint data"""
@@ -108,42 +155,7 @@ class MetricsCalculator:
         total_story_points = metrics.get('total_story_points', 0) or 0
         completed_story_points = metrics.get('completed_story_points', 0) or 0
         
-        # Calculate total points saved from labels (AI1, AI2, etc.)
-        # Use ai_points_saved field if available, otherwise extract from labels
-        def extract_ai_points_from_labels(labels):
-            """Extract AI points saved from labels (AI1 = 1 point, AI2 = 2 points, etc.)
-            
-            Only accepts labels in format: AI followed immediately by a number (1-999)
-            Ignores invalid formats like AI2121212, AIJHS, AI 1 (with space), etc.
-            """
-            if not labels:
-                return None
-            for label in labels:
-                if not isinstance(label, str):
-                    continue
-                    
-                label_upper = label.upper().strip()
-                
-                # Must start with "AI" and have something after it
-                if not label_upper.startswith('AI') or len(label_upper) <= 2:
-                    continue
-                
-                # Extract the part after "AI" (must be immediately after, no spaces)
-                after_ai = label_upper[2:]
-                
-                # Must be only digits (no letters, no special chars, no spaces)
-                if not after_ai.isdigit():
-                    continue
-                
-                try:
-                    points = int(after_ai)
-                    # Only accept reasonable values (1-999, 0 is invalid)
-                    if 1 <= points <= 999:
-                        return float(points)
-                except (ValueError, AttributeError):
-                    continue
-            return None
-        
+        # Calculate total points saved (ai_points_saved field, else AI1, AI2, ... labels)
         total_points_saved = 0
         completed_points_saved = 0
         
@@ -213,6 +225,119 @@ class MetricsCalculator:
             'has_ai_data': total_ai_story_points > 0
         }
     
+    def calculate_scope_change_history(self, sprints: List[Dict]) -> List[Dict]:
+        """Collect per-sprint scope change from changelog-based burndowns"""
+        history = []
+        for sprint in sprints:
+            burndown = sprint.get('burndown')
+            if not burndown:
+                continue
+            history.append({
+                'sprint_name': sprint.get('name', 'Unknown'),
+                'initial_commitment': burndown.get('initial_commitment', 0),
+                'scope_added': burndown.get('scope_added', 0),
+                'scope_removed': burndown.get('scope_removed', 0),
+                're_estimated_points': burndown.get('re_estimated_points', 0),
+                'scope_change_percent': burndown.get('scope_change_percent', 0)
+            })
+        return history
+    
+    def build_issue_columns(self, issues: List[Dict], attributes: List[str]) -> Dict[str, list]:
+        """Convert issue dicts into a columnar issue set (one list per field)"""
+        columns = {
+            'story_points': [],
+            'completed': [],
+            'ai_points_saved': [],
+            'is_defect': []
+        }
+        for attribute in attributes:
+            columns[attribute] = []
+        
+        for issue in issues:
+            columns['story_points'].append(issue.get('story_points') or 0)
+            columns['completed'].append((issue.get('status') or '').lower() in COMPLETED_STATUSES)
+            # Counted as in calculate_current_sprint_metrics (label fallback, positive savings only),
+            # so breakdowns add up to the sprint totals
+            saved = issue.get('ai_points_saved') or extract_ai_points_from_labels(issue.get('labels', [])) or 0
+            columns['ai_points_saved'].append(saved if saved > 0 else 0)
+            columns['is_defect'].append(bool(issue.get('is_defect')))
+            for attribute in attributes:
+                columns[attribute].append(issue.get(attribute))
+        
+        return columns
+    
+    def group_by(self, issues: List[Dict], attributes: List[str]) -> Dict[str, Dict]:
+        """Aggregate points, completed points, AI points saved and defects by issue attributes
+        
+        All attributes are aggregated in a single pass over a columnar issue set.
+        List-valued attributes (e.g. components) count the issue once per value;
+        missing values are grouped under 'Unassigned'.
+        """
+        columns = self.build_issue_columns(issues, attributes)
+        story_points = columns['story_points']
+        completed = columns['completed']
+        ai_points_saved = columns['ai_points_saved']
+        is_defect = columns['is_defect']
+        
+        # Accumulators are lists: [issues, story points, completed points, AI saved, defects]
+        groups = {attribute: {} for attribute in attributes}
+        key_columns = [(groups[attribute], columns[attribute]) for attribute in attributes]
+        
+        for i in range(len(story_points)):
+            points = story_points[i]
+            done_points = points if completed[i] else 0
+            saved = ai_points_saved[i]
+            defect = 1 if is_defect[i] else 0
+            
+            for group, keys in key_columns:
+                key = keys[i]
+                for value in (key if isinstance(key, list) else (key,)) or ('Unassigned',):
+                    if value is None or value == '':
+                        value = 'Unassigned'
+                    acc = group.get(value)
+                    if acc is None:
+                        acc = group[value] = [0, 0, 0, 0, 0]
+                    acc[0] += 1
+                    acc[1] += points
+                    acc[2] += done_points
+                    acc[3] += saved
+                    acc[4] += defect
+        
+        return {
+            attribute: {
+                value: {
+                    'issue_count': acc[0],
+                    'story_points': round(acc[1], 2),
+                    'completed_story_points': round(acc[2], 2),
+                    'ai_points_saved': round(acc[3], 2),
+                    'defect_count': acc[4]
+                }
+                for value, acc in sorted(group.items(), key=lambda item: item[1][1], reverse=True)
+            }
+            for attribute, group in groups.items()
+        }
+    
+    def calculate_breakdowns(self, sprint: Dict) -> Dict:
+        """Calculate per-assignee and per-component breakdowns for a sprint"""
+        if not sprint:
+            return {}
+        
+        issues = sprint.get('metrics', {}).get('issues', [])
+        if not issues:
+            return {}
+        
+        # Only break down by attributes that were fetched for this sprint
+        attributes = [attribute for attribute in BREAKDOWN_ATTRIBUTES if attribute in issues[0]]
+        if not attributes:
+            return {}
+        
+        breakdowns = self.group_by(issues, attributes)
+        if 'assignee' in breakdowns:
+            breakdowns['developer_story_points'] = {
+                name: values['story_points'] for name, values in breakdowns['assignee'].items()
+            }
+        return breakdowns
+    
     def _is_before_ai_adoption(self, sprint_end_date) -> bool:
         """Check if sprint ended before AI adoption"""
         if isinstance(sprint_end_date, str):
@@ -229,13 +354,26 @@ class MetricsCalculator:
     
     def generate_comprehensive_metrics(self, current_sprint: Dict, historical_sprints: List[Dict]) -> Dict:
         """Generate comprehensive metrics report"""
+        if self.cache is None:
+            return self._compute_comprehensive_metrics(current_sprint, historical_sprints)
+        
+        key = self.cache.compute_key(current_sprint, historical_sprints, self.ai_adoption_date)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._compute_comprehensive_metrics(current_sprint, historical_sprints)
+            result['cache_key'] = key
+            self.cache.put(key, result)
+        return result
+    
+    def _compute_comprehensive_metrics(self, current_sprint: Dict, historical_sprints: List[Dict]) -> Dict:
+        """Compute comprehensive metrics without memoization"""
         baseline_velocity = self.calculate_baseline_velocity(historical_sprints)
         post_ai_velocity = self.calculate_post_ai_velocity(historical_sprints)
         velocity_improvement = self.calculate_velocity_improvement(baseline_velocity, post_ai_velocity)
         defect_metrics = self.calculate_defect_metrics(historical_sprints)
         current_sprint_metrics = self.calculate_current_sprint_metrics(current_sprint)
         
-        return {
+        result = {
             'current_sprint': current_sprint_metrics,
             'baseline_velocity': baseline_velocity,
             'post_ai_velocity': post_ai_velocity,
@@ -243,3 +381,19 @@ class MetricsCalculator:
             'defect_metrics': defect_metrics,
             'ai_adoption_date': self.ai_adoption_date.isoformat()
         }
+        
+        breakdowns = self.calculate_breakdowns(current_sprint)
+        if breakdowns:
+            result['breakdowns'] = breakdowns
+        
+        # Changelog-based burndown and scope change (when changelogs were fetched)
+        if current_sprint and current_sprint.get('burndown'):
+            result['burndown'] = current_sprint['burndown']
+        scope_sprints = list(historical_sprints)
+        if current_sprint and all(s.get('id') != current_sprint.get('id') for s in historical_sprints):
+            scope_sprints.append(current_sprint)
+        scope_history = self.calculate_scope_change_history(scope_sprints)
+        if scope_history:
+            result['scope_change_history'] = scope_history
+        
+        return result
@@ -0,0 +1,95 @@
+"""Run per-team work concurrently while keeping each team's output together"""
+import io
+import sys
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+
+class ThreadOutput(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr that buffers writes per thread
+
+    Threads inside capture() write to their own buffer; all other threads
+    (and threads outside capture()) write straight to the wrapped stream.
+    """
+
+    def __init__(self, stream):
+        """Initialize proxy around the real stream"""
+        self.stream = stream
+        self._local = threading.local()
+
+    @contextmanager
+    def capture(self, buffer: Optional[io.StringIO] = None):
+        """Buffer this thread's output for the duration of the block"""
+        buffer = buffer if buffer is not None else io.StringIO()
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+    def write(self, text: str) -> int:
+        """Write to this thread's buffer, or through to the stream"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        """Flush the underlying stream"""
+        self.stream.flush()
+
+    def writable(self) -> bool:
+        """Output proxies are always writable"""
+        return True
+
+    def isatty(self) -> bool:
+        """Report the underlying stream's terminal status"""
+        return self.stream.isatty()
+
+
+def run_teams_parallel(teams: List[Dict], worker: Callable[[Dict], bool], jobs: int) -> List[bool]:
+    """Run worker(team) for each team on `jobs` threads and return results in team order
+
+    Jira fetches and Confluence calls are I/O bound and overlap across threads;
+    matplotlib charts are rendered in the shared process pool (charts.py).
+    Each team's output (stdout and stderr) is buffered and printed as one
+    block when the team finishes, so logs never interleave. An exception in
+    worker counts as a failure for that team only.
+    """
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    stdout, stderr = ThreadOutput(real_stdout), ThreadOutput(real_stderr)
+    print_lock = threading.Lock()
+    results = [False] * len(teams)
+
+    def run(team: Dict) -> bool:
+        with stdout.capture() as buffer, stderr.capture(buffer):
+            try:
+                ok = bool(worker(team))
+            except Exception as e:
+                print(f"\n✗ Error generating report for {team['name']}: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                ok = False
+        with print_lock:
+            real_stdout.write(buffer.getvalue())
+            real_stdout.flush()
+        return ok
+
+    sys.stdout, sys.stderr = stdout, stderr
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix='team') as executor:
+            futures = {executor.submit(run, team): i for i, team in enumerate(teams)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                results[i] = future.result()
+                with print_lock:
+                    status = "✓" if results[i] else "✗"
+                    real_stdout.write(f"\n[{done}/{len(teams)}] {status} {teams[i]['name']}\n")
+                    real_stdout.flush()
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+
+    return results
+
@@ -0,0 +1,176 @@
+"""Render metrics reports directly to PDF with matplotlib"""
+import io
+from datetime import datetime
+from typing import Dict, List, Optional, BinaryIO, Union
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+from charts import (
+    draw_chart, velocity_chart_spec, defect_chart_spec, ai_comparison_chart_spec,
+    burndown_chart_spec, scope_change_chart_spec
+)
+
+
+# Page size matches the 10" x 7.5" slides of the PowerPoint report
+PAGE_SIZE = (10, 7.5)
+TITLE_COLOR = '#003366'
+LABEL_COLOR = '#404040'
+GOOD_COLOR = '#008000'
+BAD_COLOR = '#800000'
+
+
+class PDFReportGenerator:
+    """Generate multi-page PDF reports from comprehensive metrics
+
+    Pages mirror the PowerPoint slides and draw the same chart specs, so the
+    PDF needs no office suite and no PPTX conversion step.
+    """
+
+    def generate_pdf(self, team_name: str, metrics: Dict, output: Union[str, BinaryIO]):
+        """Write the report to a file path or writable binary stream"""
+        with PdfPages(output, metadata={'Title': f"{team_name} Sprint Velocity Report"}) as pdf:
+            for page in self.build_pages(team_name, metrics):
+                pdf.savefig(page)
+
+        if isinstance(output, str):
+            print(f"PDF report saved to {output}")
+
+    def generate_pdf_bytes(self, team_name: str, metrics: Dict) -> bytes:
+        """Get the report as PDF bytes"""
+        buffer = io.BytesIO()
+        self.generate_pdf(team_name, metrics, buffer)
+        return buffer.getvalue()
+
+    def build_pages(self, team_name: str, metrics: Dict) -> List[Figure]:
+        """Build one figure per report page"""
+        current = metrics.get('current_sprint', {})
+        pages = [self._title_page(team_name, current.get('sprint_name', 'Current Sprint'))]
+        pages.append(self._current_sprint_page(current))
+        if current.get('has_ai_data', False):
+            pages.append(self._ai_impact_page(current))
+        if metrics.get('burndown'):
+            pages.append(self._burndown_page(metrics['burndown']))
+            pages.append(self._scope_change_page(metrics['burndown'], metrics.get('scope_change_history', [])))
+        pages.append(self._velocity_page(metrics.get('velocity_improvement', {})))
+        pages.append(self._defect_page(metrics.get('defect_metrics', {})))
+        pages.append(self._summary_page(metrics))
+        return pages
+
+    def _title_page(self, team_name: str, sprint_name: str) -> Figure:
+        """Title page"""
+        fig = Figure(figsize=PAGE_SIZE)
+        fig.text(0.5, 0.6, f"{team_name} Sprint Velocity Report", ha='center', va='center',
+                 fontsize=30, fontweight='bold', color=TITLE_COLOR)
+        fig.text(0.5, 0.48, f"Sprint: {sprint_name} | Generated: {datetime.now().strftime('%B %d, %Y')}",
+                 ha='center', va='center', fontsize=14, color=LABEL_COLOR)
+        return fig
+
+    def _current_sprint_page(self, current: Dict) -> Figure:
+        """Current sprint metrics page"""
+        fig = self._page("Current Sprint Metrics")
+        self._metric_grid(fig, [
+            ("Story Points Committed", current.get('committed_story_points', 0), None),
+            ("Story Points Completed", current.get('completed_story_points', 0), None),
+            ("Completion Rate", f"{current.get('completion_rate', 0)}%", None),
+            ("Defects Found", current.get('defect_count', 0), None),
+            ("Total Issues", current.get('total_issues', 0), None),
+            ("Completed Issues", current.get('completed_issues', 0), None),
+        ], columns=2, top=0.8, row_height=0.2)
+        return fig
+
+    def _ai_impact_page(self, current: Dict) -> Figure:
+        """AI impact page"""
+        fig = self._page("AI Impact: Time Saved Analysis")
+        time_saved = current.get('time_saved_total', 0)
+        self._metric_grid(fig, [
+            ("Estimated Story Points (Without AI)", f"{current.get('ai_story_points_committed', 0)} SP", None),
+            ("Actual Story Points (With AI)", f"{current.get('committed_story_points', 0)} SP", None),
+            ("Time Saved", f"{time_saved} SP ({current.get('time_saved_percent', 0)}%)",
+             GOOD_COLOR if time_saved > 0 else LABEL_COLOR),
+        ])
+        self._chart(fig, ai_comparison_chart_spec(current))
+        return fig
+
+    def _burndown_page(self, burndown: Dict) -> Figure:
+        """Daily burndown page"""
+        fig = self._page("Sprint Burndown")
+        remaining = burndown.get('remaining', [])
+        self._metric_grid(fig, [
+            ("Initial Commitment", f"{burndown.get('initial_commitment', 0)} SP", None),
+            ("Remaining", f"{remaining[-1] if remaining else 0} SP", None),
+        ], columns=2)
+        self._chart(fig, burndown_chart_spec(burndown))
+        return fig
+
+    def _scope_change_page(self, burndown: Dict, history: List[Dict]) -> Figure:
+        """Scope change page"""
+        fig = self._page("Scope Change")
+        scope_change = burndown.get('scope_change_percent', 0)
+        self._metric_grid(fig, [
+            ("Scope Added", f"{burndown.get('scope_added', 0)} SP", None),
+            ("Scope Removed", f"{burndown.get('scope_removed', 0)} SP", None),
+            ("Net Scope Change", f"{scope_change}%", BAD_COLOR if scope_change > 0 else GOOD_COLOR),
+        ])
+        if history:
+            self._chart(fig, scope_change_chart_spec(history))
+        return fig
+
+    def _velocity_page(self, improvement: Dict) -> Figure:
+        """Velocity improvement page"""
+        fig = self._page("Velocity Improvement After AI Adoption")
+        improvement_percent = improvement.get('improvement_percent', 0)
+        self._metric_grid(fig, [
+            ("Baseline Velocity (Before AI)", f"{improvement.get('baseline_velocity', 0)} SP", None),
+            ("Post-AI Velocity", f"{improvement.get('post_ai_velocity', 0)} SP", None),
+            ("Improvement", f"{improvement_percent}%", GOOD_COLOR if improvement_percent > 0 else BAD_COLOR),
+        ])
+        self._chart(fig, velocity_chart_spec(improvement))
+        return fig
+
+    def _defect_page(self, defect_metrics: Dict) -> Figure:
+        """Defect metrics page"""
+        fig = self._page("Defect Metrics")
+        reduction_percent = defect_metrics.get('defect_reduction_percent', 0)
+        self._metric_grid(fig, [
+            ("Avg Defects (Before AI)", defect_metrics.get('baseline_avg_defects', 0), None),
+            ("Avg Defects (After AI)", defect_metrics.get('post_ai_avg_defects', 0), None),
+            ("Defect Reduction", f"{reduction_percent}%", GOOD_COLOR if reduction_percent > 0 else BAD_COLOR),
+        ])
+        self._chart(fig, defect_chart_spec(defect_metrics))
+        return fig
+
+    def _summary_page(self, metrics: Dict) -> Figure:
+        """Key takeaways page"""
+        fig = self._page("Key Takeaways")
+        points = [
+            f"• Story Points Committed: {metrics.get('current_sprint', {}).get('committed_story_points', 0)}",
+            f"• Velocity Improvement: {metrics.get('velocity_improvement', {}).get('improvement_percent', 0)}%",
+            f"• Defect Reduction: {metrics.get('defect_metrics', {}).get('defect_reduction_percent', 0)}%",
+            f"• AI Adoption Date: {metrics.get('ai_adoption_date', 'N/A')}",
+        ]
+        for i, point in enumerate(points):
+            fig.text(0.1, 0.75 - i * 0.1, point, fontsize=18, color=LABEL_COLOR)
+        return fig
+
+    def _page(self, title: str) -> Figure:
+        """Blank page with a title"""
+        fig = Figure(figsize=PAGE_SIZE)
+        fig.text(0.05, 0.93, title, fontsize=24, fontweight='bold', color=TITLE_COLOR, va='center')
+        return fig
+
+    def _metric_grid(self, fig: Figure, boxes: List[tuple], columns: Optional[int] = None,
+                     top: float = 0.8, row_height: float = 0.2):
+        """Draw labelled metric values in a grid (label, value, value color)"""
+        columns = columns or len(boxes)
+        width = 0.9 / columns
+        for i, (label, value, color) in enumerate(boxes):
+            x = 0.05 + (i % columns) * width + width / 2
+            y = top - (i // columns) * row_height
+            fig.text(x, y, label, ha='center', va='center', fontsize=11, fontweight='bold', color=LABEL_COLOR,
+                     bbox=dict(boxstyle='round', facecolor='#F5F5F5', edgecolor='#C8C8C8'))
+            fig.text(x, y - 0.07, str(value), ha='center', va='center', fontsize=20, fontweight='bold',
+                     color=color or TITLE_COLOR)
+
+    def _chart(self, fig: Figure, spec: Dict):
+        """Draw a chart spec in the lower part of the page"""
+        ax = fig.add_axes([0.1, 0.08, 0.8, 0.52])
+        draw_chart(ax, spec)
@@ -0,0 +1,145 @@
+"""Staged processing with bounded queues between stages"""
+import io
+import sys
+import time
+import queue
+import threading
+from typing import Any, Callable, List, Optional
+from parallel_runner import ThreadOutput
+
+
+class Stage:
+    """A pipeline stage run by `workers` threads
+
+    func(item) returns the item to pass to the next stage, or None to stop
+    processing that item (counted as failed).
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1):
+        """Initialize stage"""
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.stats = {'items': 0, 'failed': 0, 'busy_seconds': 0.0, 'first_start': None, 'last_end': None}
+
+    def throughput(self) -> float:
+        """Items completed per minute while the stage was active"""
+        if self.stats['first_start'] is None:
+            return 0.0
+        active = self.stats['last_end'] - self.stats['first_start']
+        return self.stats['items'] * 60 / active if active > 0 else 0.0
+
+
+class Pipeline:
+    """Run items through stages connected by bounded queues
+
+    Each stage has its own worker threads, so while a later item is in an
+    early stage (e.g. fetching from Jira) an earlier one is in a later stage
+    (e.g. rendering). A full queue blocks the stage feeding it, which caps
+    the number of items held in memory. Output printed while an item is
+    processed is buffered and shown as one block when the item leaves the
+    pipeline.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 2,
+                 describe: Optional[Callable[[Any], str]] = None):
+        """Initialize pipeline"""
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.describe = describe or str
+        self.elapsed_seconds = 0.0
+
+    def run(self, items: List[Any]) -> List[bool]:
+        """Process items through all stages, returning per-item success in input order"""
+        real_stdout, real_stderr = sys.stdout, sys.stderr
+        stdout, stderr = ThreadOutput(real_stdout), ThreadOutput(real_stderr)
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = [False] * len(items)
+        lock = threading.Lock()
+        remaining_workers = [stage.workers for stage in self.stages]
+        finished = [0]
+
+        def finish(index: int, ok: bool, buffer):
+            with lock:
+                results[index] = ok
+                finished[0] += 1
+                real_stdout.write(buffer.getvalue())
+                real_stdout.write(f"\n[{finished[0]}/{len(items)}] {'✓' if ok else '✗'} {self.describe(items[index])}\n")
+                real_stdout.flush()
+
+        def work(position: int):
+            stage = self.stages[position]
+            while True:
+                entry = queues[position].get()
+                if entry is None:
+                    break
+                index, item, buffer = entry
+                start = time.perf_counter()
+                with stdout.capture(buffer), stderr.capture(buffer):
+                    try:
+                        result = stage.func(item)
+                    except Exception as e:
+                        print(f"\n✗ {stage.name} failed for {self.describe(items[index])}: {str(e)}")
+                        import traceback
+                        traceback.print_exc()
+                        result = None
+                end = time.perf_counter()
+                with lock:
+                    stage.stats['busy_seconds'] += end - start
+                    if stage.stats['first_start'] is None or start < stage.stats['first_start']:
+                        stage.stats['first_start'] = start
+                    stage.stats['last_end'] = max(stage.stats['last_end'] or end, end)
+                    stage.stats['items' if result is not None else 'failed'] += 1
+
+                if result is None:
+                    finish(index, False, buffer)
+                elif position + 1 < len(self.stages):
+                    queues[position + 1].put((index, result, buffer))
+                else:
+                    finish(index, True, buffer)
+
+            # The last worker of a stage tells the next stage there is nothing more to come
+            with lock:
+                remaining_workers[position] -= 1
+                last = remaining_workers[position] == 0
+            if last and position + 1 < len(self.stages):
+                for _ in range(self.stages[position + 1].workers):
+                    queues[position + 1].put(None)
+
+        started = time.perf_counter()
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            threads = [
+                threading.Thread(target=work, args=(position,), name=f"{stage.name}-{n}", daemon=True)
+                for position, stage in enumerate(self.stages)
+                for n in range(stage.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for index, item in enumerate(items):
+                queues[0].put((index, item, io.StringIO()))
+            for _ in range(self.stages[0].workers):
+                queues[0].put(None)
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.stdout, sys.stderr = real_stdout, real_stderr
+        self.elapsed_seconds = time.perf_counter() - started
+
+        return results
+
+    def summary(self) -> str:
+        """Per-stage throughput table"""
+        lines = [
+            f"{'Stage':<10} {'Workers':>7} {'Done':>5} {'Failed':>6} {'Busy s':>8} {'Items/min':>9} {'Util':>5}",
+        ]
+        for stage in self.stages:
+            stats = stage.stats
+            active = (stats['last_end'] - stats['first_start']) if stats['first_start'] is not None else 0
+            utilization = stats['busy_seconds'] / (active * stage.workers) * 100 if active > 0 else 0
+            lines.append(
+                f"{stage.name:<10} {stage.workers:>7} {stats['items']:>5} {stats['failed']:>6} "
+                f"{stats['busy_seconds']:>8.1f} {stage.throughput():>9.1f} {utilization:>4.0f}%"
+            )
+        lines.append(f"Total wall time: {self.elapsed_seconds:.1f}s")
+        return "\n".join(lines)
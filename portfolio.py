@@ -0,0 +1,207 @@
+"""Roll up velocity metrics across all configured teams"""
+import os
+import re
+import json
+import time
+from typing import List, Dict, Optional
+from datetime import date, datetime
+from metrics_calculator import MetricsCalculator
+import config
+
+
+class PortfolioAggregator:
+    """Combine per-team metrics into org-wide portfolio metrics
+
+    Each team is reduced to a small summary record (per-sprint completed points,
+    defects and sprint length plus the current sprint metrics). Summaries are
+    cached on disk so a roll-up can be rebuilt without re-fetching from Jira.
+    """
+
+    def __init__(self, ai_adoption_date: date, cache_dir: Optional[str] = None,
+                 sprint_length_days: Optional[int] = None):
+        """Initialize aggregator with AI adoption date and summary cache location"""
+        self.calculator = MetricsCalculator(ai_adoption_date)
+        self.cache_dir = cache_dir or os.path.join(config.Config.CACHE_DIR, 'portfolio')
+        self.sprint_length_days = sprint_length_days or config.Config.SPRINT_LENGTH_DAYS
+        self.team_summaries = []
+
+    def summarize_team(self, team_config: Dict, comprehensive_metrics: Dict,
+                       historical_sprints: List[Dict], save: bool = True) -> Dict:
+        """Reduce a team's metrics to a summary record and optionally cache it"""
+        sprints = []
+        for sprint in historical_sprints:
+            metrics = sprint.get('metrics', {})
+            sprints.append({
+                'id': sprint.get('id'),
+                'name': sprint.get('name', ''),
+                'end_date': self._date_str(sprint.get('end_date')),
+                'length_days': self._sprint_length(sprint.get('start_date'), sprint.get('end_date')),
+                'completed_story_points': metrics.get('completed_story_points', 0) or 0,
+                'defect_count': metrics.get('defect_count', 0) or 0
+            })
+
+        summary = {
+            'team': team_config['name'],
+            'board_id': team_config.get('board_id'),
+            'capacity': team_config.get('capacity', 1.0),
+            'generated_at': time.time(),
+            'current_sprint': comprehensive_metrics.get('current_sprint', {}),
+            'sprints': sprints
+        }
+
+        if save:
+            self.save_team_summary(summary)
+        return summary
+
+    def save_team_summary(self, summary: Dict):
+        """Write a team summary to the on-disk cache"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._cache_path(summary['team']), 'w') as f:
+                json.dump(summary, f)
+        except OSError as e:
+            print(f"WARNING: Could not cache portfolio summary for {summary['team']}: {e}")
+
+    def load_team_summary(self, team_name: str, max_age_hours: Optional[float] = None) -> Optional[Dict]:
+        """Load a cached team summary, ignoring it if older than max_age_hours"""
+        path = self._cache_path(team_name)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path) as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if max_age_hours is not None:
+            age_hours = (time.time() - summary.get('generated_at', 0)) / 3600
+            if age_hours > max_age_hours:
+                return None
+        return summary
+
+    def add_team_summary(self, summary: Dict):
+        """Add a team summary to the roll-up"""
+        self.team_summaries.append(summary)
+
+    def calculate_team_metrics(self, summary: Dict) -> Dict:
+        """Calculate sprint-length normalized metrics for one team"""
+        normalized_sprints = []
+        for sprint in summary.get('sprints', []):
+            scale = self.sprint_length_days / sprint['length_days'] if sprint.get('length_days') else 1.0
+            normalized_sprints.append({
+                'end_date': sprint.get('end_date'),
+                'metrics': {
+                    'completed_story_points': sprint['completed_story_points'] * scale,
+                    'defect_count': sprint['defect_count'] * scale
+                }
+            })
+
+        # Reuse the per-team calculations on the normalized sprint records
+        baseline = self.calculator.calculate_baseline_velocity(normalized_sprints)
+        post_ai = self.calculator.calculate_post_ai_velocity(normalized_sprints)
+        current = summary.get('current_sprint', {})
+
+        return {
+            'team': summary['team'],
+            'capacity': summary.get('capacity', 1.0),
+            'velocity_improvement': self.calculator.calculate_velocity_improvement(baseline, post_ai),
+            'defect_metrics': self.calculator.calculate_defect_metrics(normalized_sprints),
+            'time_saved_total': current.get('time_saved_total', 0),
+            'ai_story_points_committed': current.get('ai_story_points_committed', 0),
+            'committed_story_points': current.get('committed_story_points', 0),
+            'completed_story_points': current.get('completed_story_points', 0),
+            'normalized_sprints': normalized_sprints
+        }
+
+    def calculate_portfolio_metrics(self) -> Dict:
+        """Calculate org-wide metrics with per-team breakdowns
+
+        Velocities are summed across teams (org throughput) while percentages are
+        averaged with each team weighted by its configured capacity.
+        """
+        teams = [self.calculate_team_metrics(summary) for summary in self.team_summaries]
+        total_capacity = sum(team['capacity'] for team in teams)
+
+        def weighted(values):
+            if total_capacity <= 0:
+                return 0
+            return round(sum(team['capacity'] * value for team, value in zip(teams, values)) / total_capacity, 2)
+
+        baseline_velocity = sum(t['velocity_improvement']['baseline_velocity'] for t in teams)
+        post_ai_velocity = sum(t['velocity_improvement']['post_ai_velocity'] for t in teams)
+        time_saved_total = sum(t['time_saved_total'] for t in teams)
+        ai_story_points = sum(t['ai_story_points_committed'] for t in teams)
+
+        # Org-wide trends bucketed by sprint end month: each team's average per
+        # sprint that month, summed across teams like the velocities above (a
+        # month in which a team closed two sprints doesn't count it twice)
+        velocity_trend = {}
+        defect_trend = {}
+        for team in teams:
+            months = {}
+            for sprint in team['normalized_sprints']:
+                month = (sprint.get('end_date') or '')[:7]
+                if month:
+                    months.setdefault(month, []).append(sprint['metrics'])
+            for month, sprints in months.items():
+                velocity_trend[month] = velocity_trend.get(month, 0) + (
+                    sum(metrics['completed_story_points'] for metrics in sprints) / len(sprints)
+                )
+                defect_trend[month] = defect_trend.get(month, 0) + (
+                    sum(metrics['defect_count'] for metrics in sprints) / len(sprints)
+                )
+
+        return {
+            'team_count': len(teams),
+            'total_capacity': total_capacity,
+            'sprint_length_days': self.sprint_length_days,
+            'velocity_improvement': {
+                'baseline_velocity': round(baseline_velocity, 2),
+                'post_ai_velocity': round(post_ai_velocity, 2),
+                'improvement_percent': weighted([t['velocity_improvement']['improvement_percent'] for t in teams]),
+                'improvement_points': round(post_ai_velocity - baseline_velocity, 2),
+                'velocity_per_capacity': round(post_ai_velocity / total_capacity, 2) if total_capacity > 0 else 0
+            },
+            'defect_metrics': {
+                'baseline_avg_defects': round(sum(t['defect_metrics']['baseline_avg_defects'] for t in teams), 2),
+                'post_ai_avg_defects': round(sum(t['defect_metrics']['post_ai_avg_defects'] for t in teams), 2),
+                'defect_reduction_percent': weighted([t['defect_metrics']['defect_reduction_percent'] for t in teams])
+            },
+            'ai_metrics': {
+                'time_saved_total': round(time_saved_total, 2),
+                'ai_story_points_committed': round(ai_story_points, 2),
+                'time_saved_percent': round(time_saved_total / ai_story_points * 100, 2) if ai_story_points > 0 else 0
+            },
+            'velocity_trend': {month: round(value, 2) for month, value in sorted(velocity_trend.items())},
+            'defect_trend': {month: round(value, 2) for month, value in sorted(defect_trend.items())},
+            'teams': [
+                {key: value for key, value in team.items() if key != 'normalized_sprints'}
+                for team in teams
+            ]
+        }
+
+    def _cache_path(self, team_name: str) -> str:
+        """Get cache file path for a team"""
+        safe_name = re.sub(r'[^A-Za-z0-9_-]+', '_', team_name)
+        return os.path.join(self.cache_dir, f"{safe_name}.json")
+
+    def _date_str(self, value) -> Optional[str]:
+        """Normalize a Jira date/datetime string to YYYY-MM-DD"""
+        if isinstance(value, str) and value:
+            return value.split('T')[0]
+        if isinstance(value, date):
+            return value.isoformat()
+        return None
+
+    def _sprint_length(self, start_date, end_date) -> Optional[int]:
+        """Calculate sprint length in days"""
+        start = self._date_str(start_date)
+        end = self._date_str(end_date)
+        if not start or not end:
+            return None
+        try:
+            days = (datetime.strptime(end, '%Y-%m-%d') - datetime.strptime(start, '%Y-%m-%d')).days
+        except ValueError:
+            return None
+        return days if days > 0 else None
@@ -3,26 +3,127 @@ from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
-from typing import Dict
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LABEL_POSITION, XL_LEGEND_POSITION, XL_MARKER_STYLE
+from pptx.enum.dml import MSO_LINE_DASH_STYLE
+from typing import Dict, Optional, BinaryIO
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
+from charts import (
+    ChartCache, render_chart_png, submit_chart_render, velocity_chart_spec, defect_chart_spec, ai_comparison_chart_spec,
+    burndown_chart_spec, scope_change_chart_spec, team_velocity_chart_spec
+)
+from metrics_cache import stable_hash
+import config
 import io
+import re
+
+
+# Chart backends: editable python-pptx charts or matplotlib PNG images
+CHART_BACKENDS = ('native', 'matplotlib')
+
+# Template layout used for slides without a layout named after their slide key
+DEFAULT_TEMPLATE_LAYOUT = 'title only'
 
 
 class PPTGenerator:
     """Generate PowerPoint presentations with metrics"""
     
-    def __init__(self):
-        """Initialize presentation"""
-        self.prs = Presentation()
-        self.prs.slide_width = Inches(10)
-        self.prs.slide_height = Inches(7.5)
+    def __init__(self, chart_backend: Optional[str] = None, chart_cache: Optional[ChartCache] = None,
+                 template: Optional[str] = None):
+        """Initialize presentation
+        
+        chart_backend selects 'native' (python-pptx charts, default) or
+        'matplotlib' (rendered PNG images); defaults to CHART_BACKEND in .env.
+        Rendered matplotlib charts are reused from chart_cache when the chart
+        data has not changed (a default cache is used if CHART_CACHE is enabled).
+        
+        template is an optional .pptx whose slide layouts are named after slide
+        keys ('title', 'current_sprint', 'velocity', ...). Placeholders on those
+        layouts named after a metric label (e.g. 'story_points_committed'),
+        'chart' or 'summary' are filled with values instead of drawing styled
+        boxes; defaults to PPT_TEMPLATE in .env.
+        """
+        self.chart_backend = (chart_backend or config.Config.CHART_BACKEND).lower()
+        if self.chart_backend not in CHART_BACKENDS:
+            raise ValueError(f"Unknown chart backend '{self.chart_backend}'. Use one of: {', '.join(CHART_BACKENDS)}")
+        if chart_cache is None and config.Config.CHART_CACHE_ENABLED:
+            chart_cache = ChartCache()
+        self.chart_cache = chart_cache
+        # Charts rendering in the process pool, placed on their slides before saving
+        self._pending_charts = []
+        # Render futures by chart spec and size, so identical charts are rendered once
+        self._chart_renders = {}
+        
+        self.template = template if template is not None else config.Config.PPT_TEMPLATE
+        if self.template:
+            self.prs = Presentation(self.template)
+            self._template_layouts = {layout.name.lower(): layout for layout in self.prs.slide_layouts}
+            # Fallback for slides whose layout has no title placeholder
+            self._blank_layout = self._template_layouts.get('blank') or min(
+                self.prs.slide_layouts, key=lambda layout: len(layout.placeholders)
+            )
+        else:
+            self.prs = Presentation()
+            self.prs.slide_width = Inches(10)
+            self.prs.slide_height = Inches(7.5)
+            self._template_layouts = {}
+            self._blank_layout = self.prs.slide_layouts[6]
+    
+    def _new_slide(self, title: str, layout_key: str):
+        """Add a slide with a title, using the template layout for layout_key if available"""
+        layout = self._template_layouts.get(layout_key) or self._template_layouts.get(DEFAULT_TEMPLATE_LAYOUT)
+        if layout is not None:
+            slide = self.prs.slides.add_slide(layout)
+            if slide.shapes.title is not None:
+                slide.shapes.title.text = title
+                return slide
+        else:
+            slide = self.prs.slides.add_slide(self._blank_layout)
+        
+        # Title
+        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.8))
+        title_frame = title_box.text_frame
+        title_frame.text = title
+        title_paragraph = title_frame.paragraphs[0]
+        title_paragraph.font.size = Pt(32)
+        title_paragraph.font.bold = True
+        title_paragraph.font.color.rgb = RGBColor(0, 51, 102)
+        return slide
+    
+    def _placeholder(self, slide, name: str):
+        """Find a slide placeholder by the name given to it on the template layout"""
+        if not self._template_layouts:
+            return None
+        for layout_placeholder in slide.slide_layout.placeholders:
+            if layout_placeholder.name.lower() == name:
+                idx = layout_placeholder.placeholder_format.idx
+                for placeholder in slide.placeholders:
+                    if placeholder.placeholder_format.idx == idx:
+                        return placeholder
+        return None
     
-    def create_title_slide(self, team_name: str, sprint_name: str):
+    @staticmethod
+    def _placeholder_name(label: str) -> str:
+        """Template placeholder name for a metric label ("Avg Defects\n(Before AI)" -> avg_defects_before_ai)"""
+        return re.sub(r'[^a-z0-9]+', '_', label.lower()).strip('_')
+    
+    def create_title_slide(self, team_name: str, sprint_name: str, subtitle: Optional[str] = None):
         """Create title slide"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])  # Blank layout
+        subtitle = subtitle or f"Sprint: {sprint_name} | Generated: {datetime.now().strftime('%B %d, %Y')}"
+        
+        layout = self._template_layouts.get('title') or self._template_layouts.get('title slide')
+        if layout is not None:
+            slide = self.prs.slides.add_slide(layout)
+            if slide.shapes.title is not None:
+                slide.shapes.title.text = f"{team_name} Sprint Velocity Report"
+            subtitle_placeholder = self._placeholder(slide, 'subtitle') or next(
+                (ph for ph in slide.placeholders if ph.placeholder_format.idx == 1), None
+            )
+            if subtitle_placeholder is not None:
+                subtitle_placeholder.text_frame.text = subtitle
+            return
+        
+        slide = self.prs.slides.add_slide(self._blank_layout)
         
         # Title
         title_box = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(8), Inches(1.5))
@@ -37,7 +138,7 @@ class PPTGenerator:
         # Subtitle
         subtitle_box = slide.shapes.add_textbox(Inches(1), Inches(3.5), Inches(8), Inches(1))
         subtitle_frame = subtitle_box.text_frame
-        subtitle_frame.text = f"Sprint: {sprint_name} | Generated: {datetime.now().strftime('%B %d, %Y')}"
+        subtitle_frame.text = subtitle
         subtitle_paragraph = subtitle_frame.paragraphs[0]
         subtitle_paragraph.font.size = Pt(18)
         subtitle_paragraph.font.color.rgb = RGBColor(64, 64, 64)
@@ -45,16 +146,7 @@ class PPTGenerator:
     
     def create_current_sprint_slide(self, metrics: Dict):
         """Create slide with current sprint metrics"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        
-        # Title
-        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.8))
-        title_frame = title_box.text_frame
-        title_frame.text = "Current Sprint Metrics"
-        title_paragraph = title_frame.paragraphs[0]
-        title_paragraph.font.size = Pt(32)
-        title_paragraph.font.bold = True
-        title_paragraph.font.color.rgb = RGBColor(0, 51, 102)
+        slide = self._new_slide("Current Sprint Metrics", 'current_sprint')
         
         current = metrics.get('current_sprint', {})
         y_pos = 1.5
@@ -108,20 +200,9 @@ class PPTGenerator:
     
     def create_velocity_improvement_slide(self, metrics: Dict):
         """Create slide showing velocity improvement"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        
-        # Title
-        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.8))
-        title_frame = title_box.text_frame
-        title_frame.text = "Velocity Improvement After AI Adoption"
-        title_paragraph = title_frame.paragraphs[0]
-        title_paragraph.font.size = Pt(32)
-        title_paragraph.font.bold = True
-        title_paragraph.font.color.rgb = RGBColor(0, 51, 102)
+        slide = self._new_slide("Velocity Improvement After AI Adoption", 'velocity')
         
         improvement = metrics.get('velocity_improvement', {})
-        baseline = metrics.get('baseline_velocity', {})
-        post_ai = metrics.get('post_ai_velocity', {})
         
         y_pos = 1.5
         
@@ -152,20 +233,11 @@ class PPTGenerator:
         
         # Chart
         y_pos += 2
-        self._add_velocity_chart(slide, baseline, post_ai, improvement, Inches(1), Inches(y_pos), Inches(8), Inches(3))
+        self._add_velocity_chart(slide, improvement, Inches(1), Inches(y_pos), Inches(8), Inches(3))
     
     def create_defect_metrics_slide(self, metrics: Dict):
         """Create slide with defect metrics"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        
-        # Title
-        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.8))
-        title_frame = title_box.text_frame
-        title_frame.text = "Defect Metrics"
-        title_paragraph = title_frame.paragraphs[0]
-        title_paragraph.font.size = Pt(32)
-        title_paragraph.font.bold = True
-        title_paragraph.font.color.rgb = RGBColor(0, 51, 102)
+        slide = self._new_slide("Defect Metrics", 'defects')
         
         defect_metrics = metrics.get('defect_metrics', {})
         y_pos = 1.5
@@ -201,26 +273,12 @@ class PPTGenerator:
     
     def create_summary_slide(self, metrics: Dict):
         """Create summary slide"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        
-        # Title
-        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.8))
-        title_frame = title_box.text_frame
-        title_frame.text = "Key Takeaways"
-        title_paragraph = title_frame.paragraphs[0]
-        title_paragraph.font.size = Pt(32)
-        title_paragraph.font.bold = True
-        title_paragraph.font.color.rgb = RGBColor(0, 51, 102)
+        slide = self._new_slide("Key Takeaways", 'summary')
         
         current = metrics.get('current_sprint', {})
         improvement = metrics.get('velocity_improvement', {})
         defect_metrics = metrics.get('defect_metrics', {})
         
-        # Summary points
-        summary_box = slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(8), Inches(5))
-        summary_frame = summary_box.text_frame
-        summary_frame.word_wrap = True
-        
         points = [
             f"• Story Points Committed: {current.get('committed_story_points', 0)}",
             f"• Velocity Improvement: {improvement.get('improvement_percent', 0)}%",
@@ -228,6 +286,17 @@ class PPTGenerator:
             f"• AI Adoption Date: {metrics.get('ai_adoption_date', 'N/A')}",
         ]
         
+        # Template bullet placeholder carries its own styling
+        placeholder = self._placeholder(slide, 'summary')
+        if placeholder is not None:
+            placeholder.text_frame.text = '\n'.join(point.lstrip('• ') for point in points)
+            return
+        
+        # Summary points
+        summary_box = slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(8), Inches(5))
+        summary_frame = summary_box.text_frame
+        summary_frame.word_wrap = True
+        
         for i, point in enumerate(points):
             p = summary_frame.add_paragraph()
             p.text = point
@@ -237,8 +306,83 @@ class PPTGenerator:
             if i == 0:
                 p.level = 0
     
+    def create_portfolio_summary_slides(self, portfolio_metrics: Dict, position: Optional[int] = None):
+        """Create portfolio roll-up slides (summary and velocity by team)
+        
+        The slides are appended, or moved to the given position so a
+        consolidated deck can open with the roll-up once all teams are added.
+        """
+        slide = self._new_slide("Portfolio Summary", 'portfolio_summary')
+        
+        improvement = portfolio_metrics.get('velocity_improvement', {})
+        defect_metrics = portfolio_metrics.get('defect_metrics', {})
+        ai_metrics = portfolio_metrics.get('ai_metrics', {})
+        y_pos = 1.5
+        
+        self._add_metric_box(
+            slide, "Teams",
+            f"{portfolio_metrics.get('team_count', 0)} (capacity {portfolio_metrics.get('total_capacity', 0)})",
+            Inches(0.5), Inches(y_pos), Inches(4), Inches(1.2)
+        )
+        self._add_metric_box(
+            slide, f"Velocity per {portfolio_metrics.get('sprint_length_days', 14)}-day Sprint",
+            f"{improvement.get('baseline_velocity', 0)} → {improvement.get('post_ai_velocity', 0)} SP",
+            Inches(5.5), Inches(y_pos), Inches(4), Inches(1.2)
+        )
+        
+        y_pos += 1.5
+        
+        improvement_percent = improvement.get('improvement_percent', 0)
+        self._add_metric_box(
+            slide, "Velocity Improvement",
+            f"{improvement_percent}%",
+            Inches(0.5), Inches(y_pos), Inches(4), Inches(1.2),
+            value_color=RGBColor(0, 128, 0) if improvement_percent > 0 else RGBColor(128, 0, 0)
+        )
+        reduction_percent = defect_metrics.get('defect_reduction_percent', 0)
+        self._add_metric_box(
+            slide, "Defect Reduction",
+            f"{reduction_percent}%",
+            Inches(5.5), Inches(y_pos), Inches(4), Inches(1.2),
+            value_color=RGBColor(0, 128, 0) if reduction_percent > 0 else RGBColor(128, 0, 0)
+        )
+        
+        y_pos += 1.5
+        
+        self._add_metric_box(
+            slide, "AI Time Saved (Current Sprints)",
+            f"{ai_metrics.get('time_saved_total', 0)} SP ({ai_metrics.get('time_saved_percent', 0)}%)",
+            Inches(0.5), Inches(y_pos), Inches(9), Inches(1.2)
+        )
+        
+        chart_slide = self._new_slide("Velocity by Team", 'team_velocity')
+        
+        self._add_chart(chart_slide, team_velocity_chart_spec(portfolio_metrics.get('teams', [])),
+                        Inches(0.5), Inches(1.3), Inches(9), Inches(5.7))
+        
+        if position is not None:
+            self._move_slide(slide, position)
+            self._move_slide(chart_slide, position + 1)
+    
+    def _move_slide(self, slide, position: int):
+        """Move a slide to a new position in the deck"""
+        slide_ids = self.prs.slides._sldIdLst
+        for slide_id in slide_ids:
+            if slide_id.id == slide.slide_id:
+                slide_ids.remove(slide_id)
+                slide_ids.insert(position, slide_id)
+                break
+    
     def _add_metric_box(self, slide, label: str, value, left, top, width, height, value_color=None):
-        """Add a metric box to slide"""
+        """Add a metric box to slide, or fill the template placeholder named after the label"""
+        placeholder = self._placeholder(slide, self._placeholder_name(label))
+        if placeholder is not None:
+            placeholder.text_frame.text = str(value)
+            if value_color is not None:
+                for paragraph in placeholder.text_frame.paragraphs:
+                    paragraph.font.color.rgb = value_color
+            return
+        
         box = slide.shapes.add_textbox(left, top, width, height)
         frame = box.text_frame
         frame.text = f"{label}\n\n{value}"
@@ -265,93 +409,47 @@ class PPTGenerator:
         box.fill.solid()
         box.fill.fore_color.rgb = RGBColor(245, 245, 245)
     
-    def _add_velocity_chart(self, slide, baseline, post_ai, improvement, left, top, width, height):
+    def _add_velocity_chart(self, slide, improvement, left, top, width, height):
         """Add velocity comparison chart"""
-        fig, ax = plt.subplots(figsize=(width.inches, height.inches))
-        
-        categories = ['Baseline\n(Before AI)', 'Post-AI']
-        velocities = [
-            improvement.get('baseline_velocity', 0),
-            improvement.get('post_ai_velocity', 0)
-        ]
-        
-        colors = ['#FF6B6B', '#4ECDC4']
-        bars = ax.bar(categories, velocities, color=colors, alpha=0.8)
-        
-        ax.set_ylabel('Story Points', fontsize=12, fontweight='bold')
-        ax.set_title('Velocity Comparison', fontsize=14, fontweight='bold', pad=20)
-        ax.grid(axis='y', alpha=0.3)
-        
-        # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.1f}',
-                   ha='center', va='bottom', fontsize=12, fontweight='bold')
-        
-        plt.tight_layout()
-        
-        # Save to buffer
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-        buf.seek(0)
-        plt.close()
-        
-        # Add to slide
-        slide.shapes.add_picture(buf, left, top, width, height)
+        self._add_chart(slide, velocity_chart_spec(improvement), left, top, width, height)
     
     def _add_defect_chart(self, slide, defect_metrics, left, top, width, height):
         """Add defect comparison chart"""
-        fig, ax = plt.subplots(figsize=(width.inches, height.inches))
-        
-        categories = ['Baseline\n(Before AI)', 'Post-AI']
-        defects = [
-            defect_metrics.get('baseline_avg_defects', 0),
-            defect_metrics.get('post_ai_avg_defects', 0)
-        ]
-        
-        colors = ['#FF6B6B', '#4ECDC4']
-        bars = ax.bar(categories, defects, color=colors, alpha=0.8)
-        
-        ax.set_ylabel('Average Defects', fontsize=12, fontweight='bold')
-        ax.set_title('Defect Comparison', fontsize=14, fontweight='bold', pad=20)
-        ax.grid(axis='y', alpha=0.3)
-        
-        # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.1f}',
-                   ha='center', va='bottom', fontsize=12, fontweight='bold')
-        
-        plt.tight_layout()
-        
-        # Save to buffer
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-        buf.seek(0)
-        plt.close()
-        
-        # Add to slide
-        slide.shapes.add_picture(buf, left, top, width, height)
+        self._add_chart(slide, defect_chart_spec(defect_metrics), left, top, width, height)
+    
+    def place_pending_charts(self):
+        """Wait for charts rendering in the background and add them to their slides"""
+        pending, self._pending_charts = self._pending_charts, []
+        self._chart_renders = {}
+        for slide, spec, future, left, top, width, height in pending:
+            try:
+                png = future.result()
+            except Exception as e:
+                # A broken worker pool should not lose the chart
+                print(f"WARNING: Background chart rendering failed ({e}), rendering in-process")
+                png = render_chart_png(spec, width.inches, height.inches, optimize=config.Config.CHART_PNG_OPTIMIZE)
+            slide.shapes.add_picture(io.BytesIO(png), left, top, width, height)
     
     def save(self, filename: str):
         """Save presentation to file"""
+        self.place_pending_charts()
         self.prs.save(filename)
         print(f"Presentation saved to {filename}")
     
+    def write_to(self, stream: BinaryIO):
+        """Write presentation to a writable binary file object"""
+        self.place_pending_charts()
+        self.prs.save(stream)
+    
+    def to_bytes(self) -> bytes:
+        """Get presentation as .pptx bytes"""
+        buffer = io.BytesIO()
+        self.write_to(buffer)
+        return buffer.getvalue()
+    
     def create_ai_impact_slide(self, metrics: Dict):
         """Create slide showing AI story points comparison"""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-        
-        # Title
-        title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.8))
-        title_frame = title_box.text_frame
-        title_frame.text = "AI Impact: Time Saved Analysis"
-        title_paragraph = title_frame.paragraphs[0]
-        title_paragraph.font.size = Pt(32)
-        title_paragraph.font.bold = True
-        title_paragraph.font.color.rgb = RGBColor(0, 51, 102)
+        slide = self._new_slide("AI Impact: Time Saved Analysis", 'ai_impact')
         
         current = metrics.get('current_sprint', {})
         
@@ -402,49 +500,208 @@ class PPTGenerator:
     
     def _add_ai_comparison_chart(self, slide, current_metrics, left, top, width, height):
         """Add AI vs Actual story points comparison chart"""
-        fig, ax = plt.subplots(figsize=(width.inches, height.inches))
-        
-        categories = ['Estimated\n(Without AI)', 'Actual\n(With AI)']
-        values = [
-            current_metrics.get('ai_story_points_committed', 0),
-            current_metrics.get('committed_story_points', 0)
-        ]
+        self._add_chart(slide, ai_comparison_chart_spec(current_metrics), left, top, width, height)
+    
+    def create_burndown_slide(self, metrics: Dict):
+        """Create slide with daily burndown rebuilt from issue changelogs"""
+        slide = self._new_slide("Sprint Burndown", 'burndown')
         
-        colors = ['#FF6B6B', '#4ECDC4']
-        bars = ax.bar(categories, values, color=colors, alpha=0.8)
+        burndown = metrics.get('burndown', {})
+        remaining = burndown.get('remaining', [])
         
-        ax.set_ylabel('Story Points', fontsize=12, fontweight='bold')
-        ax.set_title('AI Impact: Story Points Comparison', fontsize=14, fontweight='bold', pad=20)
-        ax.grid(axis='y', alpha=0.3)
+        self._add_burndown_chart(slide, burndown, Inches(0.5), Inches(1.3), Inches(9), Inches(4.5))
         
-        # Add value labels on bars
-        for bar in bars:
-            bar_height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., bar_height,
-                   f'{bar_height:.1f} SP',
-                   ha='center', va='bottom', fontsize=12, fontweight='bold')
+        y_pos = 6.0
+        self._add_metric_box(
+            slide, "Initial Commitment",
+            f"{burndown.get('initial_commitment', 0)} SP",
+            Inches(0.5), Inches(y_pos), Inches(4), Inches(1.2)
+        )
+        self._add_metric_box(
+            slide, "Remaining",
+            f"{remaining[-1] if remaining else 0} SP",
+            Inches(5.5), Inches(y_pos), Inches(4), Inches(1.2)
+        )
+    
+    def create_scope_change_slide(self, metrics: Dict):
+        """Create slide showing scope added, removed and re-estimated mid-sprint"""
+        slide = self._new_slide("Scope Change", 'scope_change')
         
-        # Add time saved annotation
-        time_saved = current_metrics.get('time_saved_total', 0)
-        if time_saved > 0:
-            ax.text(0.5, max(values) * 0.9, 
-                   f'Time Saved: {time_saved} SP ({current_metrics.get("time_saved_percent", 0)}%)',
-                   ha='center', va='center', fontsize=11, fontweight='bold',
-                   bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7))
+        burndown = metrics.get('burndown', {})
+        y_pos = 1.5
         
-        plt.tight_layout()
+        self._add_metric_box(
+            slide, "Scope Added",
+            f"{burndown.get('scope_added', 0)} SP",
+            Inches(0.5), Inches(y_pos), Inches(3), Inches(1.5)
+        )
+        self._add_metric_box(
+            slide, "Scope Removed",
+            f"{burndown.get('scope_removed', 0)} SP",
+            Inches(3.75), Inches(y_pos), Inches(3), Inches(1.5)
+        )
         
-        # Save to buffer
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-        buf.seek(0)
-        plt.close()
+        scope_change = burndown.get('scope_change_percent', 0)
+        self._add_metric_box(
+            slide, "Net Scope Change",
+            f"{scope_change}%",
+            Inches(7), Inches(y_pos), Inches(2.5), Inches(1.5),
+            value_color=RGBColor(128, 0, 0) if scope_change > 0 else RGBColor(0, 128, 0)
+        )
         
-        # Add to slide
-        slide.shapes.add_picture(buf, left, top, width, height)
+        # Chart of scope creep across sprints
+        y_pos += 2
+        history = metrics.get('scope_change_history', [])
+        if history:
+            self._add_scope_change_chart(slide, history, Inches(1), Inches(y_pos), Inches(8), Inches(3.5))
+    
+    def _add_burndown_chart(self, slide, burndown, left, top, width, height):
+        """Add daily burndown line chart"""
+        self._add_chart(slide, burndown_chart_spec(burndown), left, top, width, height)
+    
+    def _add_scope_change_chart(self, slide, history, left, top, width, height):
+        """Add per-sprint scope change chart"""
+        self._add_chart(slide, scope_change_chart_spec(history), left, top, width, height)
+    
+    def _add_chart(self, slide, spec: Dict, left, top, width, height):
+        """Add a chart described by a chart spec using the configured backend"""
+        # A template 'chart' placeholder sets the chart's position and size
+        placeholder = self._placeholder(slide, 'chart')
+        if placeholder is not None:
+            left, top, width, height = placeholder.left, placeholder.top, placeholder.width, placeholder.height
+            placeholder._element.getparent().remove(placeholder._element)
+        
+        if self.chart_backend == 'matplotlib':
+            # Render in the process pool; the picture is placed when the deck is saved.
+            # Identical images share a single media part (python-pptx dedupes by SHA1)
+            render_key = stable_hash([spec, width, height])
+            future = self._chart_renders.get(render_key)
+            if future is None:
+                future = submit_chart_render(spec, width.inches, height.inches, cache=self.chart_cache)
+                self._chart_renders[render_key] = future
+            self._pending_charts.append((slide, spec, future, left, top, width, height))
+        else:
+            self._add_native_chart(slide, spec, left, top, width, height)
+    
+    def _add_native_chart(self, slide, spec: Dict, left, top, width, height):
+        """Add an editable (vector) chart using python-pptx's chart API"""
+        chart_data = CategoryChartData()
+        # Multi-line category labels are a matplotlib convenience
+        chart_data.categories = [str(category).replace('\n', ' ') for category in spec['categories']]
+        for series in spec['series']:
+            chart_data.add_series(series['name'], series['values'])
+        
+        if spec['type'] == 'line':
+            chart_type = XL_CHART_TYPE.LINE
+        else:
+            chart_type = XL_CHART_TYPE.COLUMN_CLUSTERED
+        
+        chart = slide.shapes.add_chart(chart_type, left, top, width, height, chart_data).chart
+        
+        chart.has_title = True
+        chart.chart_title.text_frame.text = spec.get('title', '')
+        title_font = chart.chart_title.text_frame.paragraphs[0].font
+        title_font.size = Pt(14)
+        title_font.bold = True
+        
+        chart.has_legend = bool(spec.get('legend'))
+        if chart.has_legend:
+            chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+            chart.legend.include_in_layout = False
+        
+        value_axis = chart.value_axis
+        value_axis.has_major_gridlines = True
+        value_axis.major_gridlines.format.line.color.rgb = RGBColor(217, 217, 217)
+        value_axis.has_title = True
+        value_axis.axis_title.text_frame.text = spec.get('y_label', '')
+        axis_font = value_axis.axis_title.text_frame.paragraphs[0].font
+        axis_font.size = Pt(12)
+        axis_font.bold = True
+        
+        plot = chart.plots[0]
+        if spec['type'] == 'bar':
+            plot.gap_width = 80
+            if spec.get('overlap'):
+                plot.overlap = 100
+        
+        if spec.get('value_format'):
+            plot.has_data_labels = True
+            data_labels = plot.data_labels
+            data_labels.number_format = self._excel_number_format(spec['value_format'])
+            data_labels.number_format_is_linked = False
+            data_labels.position = XL_LABEL_POSITION.OUTSIDE_END
+            data_labels.font.size = Pt(12)
+            data_labels.font.bold = True
+        
+        for series_spec, series in zip(spec['series'], plot.series):
+            if spec['type'] == 'line':
+                line = series.format.line
+                line.color.rgb = self._rgb(series_spec.get('color', '#404040'))
+                line.width = Pt(1.5 if series_spec.get('dashed') else 2.25)
+                if series_spec.get('dashed'):
+                    line.dash_style = MSO_LINE_DASH_STYLE.DASH
+                series.smooth = False
+                series.marker.style = XL_MARKER_STYLE.CIRCLE if series_spec.get('marker') else XL_MARKER_STYLE.NONE
+            elif series_spec.get('colors'):
+                for point, color in zip(series.points, series_spec['colors']):
+                    point.format.fill.solid()
+                    point.format.fill.fore_color.rgb = self._rgb(color)
+            else:
+                series.format.fill.solid()
+                series.format.fill.fore_color.rgb = self._rgb(series_spec.get('color', '#404040'))
+        
+        if spec.get('annotation'):
+            note_box = slide.shapes.add_textbox(
+                left + int(width * 0.3), top + int(height * 0.2), int(width * 0.4), Inches(0.4)
+            )
+            note_frame = note_box.text_frame
+            note_frame.text = spec['annotation']
+            note_paragraph = note_frame.paragraphs[0]
+            note_paragraph.font.size = Pt(11)
+            note_paragraph.font.bold = True
+            note_paragraph.alignment = PP_ALIGN.CENTER
+            note_box.fill.solid()
+            note_box.fill.fore_color.rgb = RGBColor(144, 238, 144)
+    
+    def _excel_number_format(self, value_format: str) -> str:
+        """Convert a '{:.1f} SP' style format into an Excel number format"""
+        prefix, _, rest = value_format.partition('{')
+        spec, _, suffix = rest.partition('}')
+        decimals = int(spec[-2]) if spec.endswith('f') and spec[-2].isdigit() else 0
+        number = '0.' + '0' * decimals if decimals else '0'
+        return f'{self._quote_format(prefix)}{number}{self._quote_format(suffix)}'
+    
+    def _quote_format(self, text: str) -> str:
+        """Quote literal text inside an Excel number format"""
+        return f'"{text}"' if text else ''
+    
+    def _rgb(self, hex_color: str) -> RGBColor:
+        """Convert '#RRGGBB' to RGBColor"""
+        return RGBColor.from_string(hex_color.lstrip('#'))
     
     def generate_presentation(self, team_name: str, metrics: Dict, output_file: str):
         """Generate complete presentation"""
+        self.build_presentation(team_name, metrics)
+        self.save(output_file)
+    
+    def generate_presentation_stream(self, team_name: str, metrics: Dict,
+                                     stream: Optional[BinaryIO] = None) -> BinaryIO:
+        """Generate complete presentation into a stream without touching disk
+        
+        Writes to the given writable file object, or to a new BytesIO which is
+        returned rewound to the start (ready to serve or upload).
+        """
+        self.build_presentation(team_name, metrics)
+        if stream is None:
+            stream = io.BytesIO()
+            self.write_to(stream)
+            stream.seek(0)
+        else:
+            self.write_to(stream)
+        return stream
+    
+    def build_presentation(self, team_name: str, metrics: Dict):
+        """Add all report slides for a team"""
         sprint_name = metrics.get('current_sprint', {}).get('sprint_name', 'Current Sprint')
         
         self.create_title_slide(team_name, sprint_name)
@@ -455,8 +712,11 @@ class PPTGenerator:
         if current.get('has_ai_data', False):
             self.create_ai_impact_slide(metrics)
         
+        # Add burndown and scope change slides if changelogs were replayed
+        if metrics.get('burndown'):
+            self.create_burndown_slide(metrics)
+            self.create_scope_change_slide(metrics)
+        
         self.create_velocity_improvement_slide(metrics)
         self.create_defect_metrics_slide(metrics)
         self.create_summary_slide(metrics)
-        
-        self.save(output_file)
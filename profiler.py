@@ -0,0 +1,336 @@
+"""Opt-in timing instrumentation for report runs (--profile)"""
+import re
+import sys
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+# Methods timed by install(): (module, class, method, span category)
+INSTRUMENTED = [
+    ('jira_client', 'JiraClient', 'get_current_sprint', 'jira'),
+    ('jira_client', 'JiraClient', 'get_historical_sprints', 'jira'),
+    ('jira_client', 'JiraClient', 'get_sprint_issues', 'jira'),
+    ('jira_client', 'JiraClient', 'get_sprint_burndown', 'jira'),
+    ('jira_client', 'JiraClient', 'get_board_signature', 'jira'),
+    ('jira', 'JIRA', 'issue', 'jira'),
+    ('metrics_calculator', 'MetricsCalculator', 'generate_comprehensive_metrics', 'compute'),
+    ('ppt_generator', 'PPTGenerator', 'build_presentation', 'render'),
+    ('ppt_generator', 'PPTGenerator', 'place_pending_charts', 'render'),
+    ('ppt_generator', 'PPTGenerator', 'save', 'render'),
+    ('pdf_report', 'PDFReportGenerator', 'generate_pdf', 'render'),
+    ('snapshot', 'SnapshotWriter', 'write', 'render'),
+    ('confluence_uploader', 'ConfluenceUploader', 'is_unchanged', 'confluence'),
+    ('confluence_uploader', 'ConfluenceUploader', 'upload_attachment_data', 'confluence'),
+    ('confluence_uploader', 'ConfluenceUploader', 'upload_attachments', 'confluence'),
+    ('confluence_uploader', 'ConfluenceUploader', 'list_attachments', 'confluence'),
+    ('confluence_uploader', 'ConfluenceUploader', 'update_reports_section', 'confluence'),
+]
+
+# Cache lookups counted by install(): (module, class, method, cache name); a None result is a miss
+CACHE_LOOKUPS = [
+    ('metrics_cache', 'MetricsCache', 'get', 'metrics'),
+    ('charts', 'ChartCache', 'get', 'charts'),
+    ('confluence_uploader', 'ConfluenceUploader', '_cached_attachments', 'confluence attachments'),
+]
+
+# Path segments replaced when grouping HTTP requests by endpoint
+ENDPOINT_PATTERNS = [
+    (re.compile(r'/[A-Z][A-Z0-9_]+-\d+(?=/|$)'), '/{key}'),
+    (re.compile(r'/\d+(?=/|$)'), '/{id}'),
+]
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """Group a request by method, host and path with ids replaced, e.g. GET host/rest/api/content/{id}"""
+    parts = urlsplit(url)
+    path = parts.path
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return f"{method} {parts.netloc}{path}"
+
+
+class Profiler:
+    """Collects timed spans, HTTP request stats and cache hit counts
+
+    Spans record wall time and the calling thread's CPU time, so time spent
+    waiting on Jira, Confluence or the chart render pool shows up as wall
+    time without CPU time. Times are inclusive of nested spans; per-stage
+    totals count only the outermost span of each stage.
+    """
+
+    def __init__(self):
+        """Initialize profiler"""
+        self.enabled = False
+        self.started_at = time.perf_counter()
+        self.spans = {}
+        self.stages = {}
+        self.http = {}
+        self.caches = {}
+        self.events = []
+        self.thread_names = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._installed = False
+
+    @contextmanager
+    def span(self, name: str, category: str):
+        """Time a block as a named span in a stage (no-op unless enabled)"""
+        if not self.enabled:
+            yield
+            return
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        outermost = category not in stack
+        stack.append(category)
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - start, time.thread_time() - cpu_start
+            stack.pop()
+            with self._lock:
+                entry = self.spans.setdefault((category, name), {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+                entry['calls'] += 1
+                entry['wall'] += wall
+                entry['cpu'] += cpu
+                if outermost:
+                    stage = self.stages.setdefault(category, {'wall': 0.0, 'cpu': 0.0})
+                    stage['wall'] += wall
+                    stage['cpu'] += cpu
+                self._trace(name, category, start, wall, {'cpu_ms': round(cpu * 1000, 3)})
+
+    def record_http(self, method: str, url: str, status: Optional[int], seconds: float,
+                    bytes_sent: int, bytes_received: int, start: float):
+        """Record one HTTP request"""
+        endpoint = endpoint_name(method, url)
+        with self._lock:
+            entry = self.http.setdefault(endpoint, {'calls': 0, 'errors': 0, 'seconds': 0.0, 'sent': 0, 'received': 0})
+            entry['calls'] += 1
+            entry['errors'] += 0 if status is not None and status < 400 else 1
+            entry['seconds'] += seconds
+            entry['sent'] += bytes_sent
+            entry['received'] += bytes_received
+            self._trace(endpoint, 'http', start, seconds,
+                        {'status': status, 'bytes_sent': bytes_sent, 'bytes_received': bytes_received})
+
+    def record_cache(self, name: str, hit: bool):
+        """Record a cache lookup"""
+        with self._lock:
+            entry = self.caches.setdefault(name, {'hits': 0, 'misses': 0})
+            entry['hits' if hit else 'misses'] += 1
+
+    def _trace(self, name: str, category: str, start: float, seconds: float, args: Dict):
+        """Add a Chrome trace complete event (caller holds the lock)"""
+        self.thread_names[threading.get_ident()] = threading.current_thread().name
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round((start - self.started_at) * 1e6, 1),
+            'dur': round(seconds * 1e6, 1),
+            'pid': 1,
+            'tid': threading.get_ident(),
+            'args': args
+        })
+
+    def install(self):
+        """Enable profiling and wrap the instrumented methods and HTTP requests
+        
+        Modules that are already imported are patched now; the others (e.g. the
+        lazily imported rendering modules) are patched when something first
+        imports them, so a profiled run imports the same modules as a normal one.
+        """
+        self.enabled = True
+        self.started_at = time.perf_counter()
+        if self._installed:
+            return
+        self._installed = True
+
+        patches = {}
+        for module_name, class_name, attribute, category in INSTRUMENTED:
+            patches.setdefault(module_name, []).append(
+                (class_name, attribute, functools.partial(self._timed, name=f"{class_name}.{attribute}", category=category))
+            )
+        for module_name, class_name, attribute, cache_name in CACHE_LOOKUPS:
+            patches.setdefault(module_name, []).append(
+                (class_name, attribute, functools.partial(self._counted, cache_name=cache_name))
+            )
+
+        pending = {}
+        for module_name, module_patches in patches.items():
+            if module_name in sys.modules:
+                _apply_patches(sys.modules[module_name], module_patches)
+            else:
+                pending[module_name] = module_patches
+        if pending:
+            sys.meta_path.insert(0, _PatchOnImport(pending))
+
+        # Every requests call (including the jira library's) goes through Session.send
+        import requests
+        requests.Session.send = self._http(requests.Session.send)
+
+    def _timed(self, func, name: str, category: str):
+        """Wrap func in a span"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.span(name, category):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def _counted(self, func, cache_name: str):
+        """Wrap a cache lookup so hits and misses are counted"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if self.enabled:
+                self.record_cache(cache_name, result is not None)
+            return result
+        return wrapper
+
+    def _http(self, send):
+        """Wrap requests.Session.send to record timing and sizes per endpoint"""
+        profiler = self
+
+        @functools.wraps(send)
+        def wrapper(session, request, **kwargs):
+            if not profiler.enabled:
+                return send(session, request, **kwargs)
+            start = time.perf_counter()
+            response = None
+            try:
+                response = send(session, request, **kwargs)
+                return response
+            finally:
+                received = 0
+                if response is not None:
+                    if kwargs.get('stream'):
+                        # Don't consume streamed bodies; use the declared size
+                        received = int(response.headers.get('Content-Length', 0) or 0)
+                    else:
+                        received = len(response.content or b'')
+                profiler.record_http(
+                    request.method, request.url, response.status_code if response is not None else None,
+                    time.perf_counter() - start, _body_size(request), received, start
+                )
+        return wrapper
+
+    def summary(self) -> str:
+        """Summary tables: stages, slowest spans, HTTP endpoints and caches"""
+        elapsed = time.perf_counter() - self.started_at
+        lines = [f"Total wall time: {elapsed:.2f}s", "", f"{'Stage':<12} {'Wall s':>8} {'CPU s':>8} {'% of run':>8}"]
+        for category, stage in sorted(self.stages.items(), key=lambda item: -item[1]['wall']):
+            share = stage['wall'] / elapsed * 100 if elapsed else 0
+            lines.append(f"{category:<12} {stage['wall']:>8.2f} {stage['cpu']:>8.2f} {share:>7.0f}%")
+        lines.append("(stage times add up across threads, so concurrent stages can exceed 100%)")
+
+        lines += ["", f"{'Span (inclusive)':<60} {'Calls':>6} {'Wall s':>8} {'CPU s':>8} {'Avg ms':>8}"]
+        for (category, name), span in sorted(self.spans.items(), key=lambda item: -item[1]['wall']):
+            lines.append(f"{f'{category}: {name}':<60} {span['calls']:>6} {span['wall']:>8.2f} "
+                         f"{span['cpu']:>8.2f} {span['wall'] / span['calls'] * 1000:>8.1f}")
+
+        if self.http:
+            lines += ["", f"{'HTTP endpoint':<72} {'Calls':>6} {'Errors':>6} {'Wall s':>8} {'KB out':>8} {'KB in':>9}"]
+            for endpoint, entry in sorted(self.http.items(), key=lambda item: -item[1]['seconds']):
+                lines.append(f"{endpoint[:72]:<72} {entry['calls']:>6} {entry['errors']:>6} {entry['seconds']:>8.2f} "
+                             f"{entry['sent'] / 1024:>8.1f} {entry['received'] / 1024:>9.1f}")
+
+        if self.caches:
+            lines += ["", f"{'Cache':<24} {'Hits':>6} {'Misses':>6} {'Hit rate':>8}"]
+            for name, entry in sorted(self.caches.items()):
+                lookups = entry['hits'] + entry['misses']
+                rate = entry['hits'] / lookups * 100 if lookups else 0
+                lines.append(f"{name:<24} {entry['hits']:>6} {entry['misses']:>6} {rate:>7.0f}%")
+        return "\n".join(lines)
+
+    def write_trace(self, path: str) -> str:
+        """Write spans and HTTP requests in Chrome trace format (chrome://tracing, Perfetto)"""
+        with self._lock:
+            events = list(self.events)
+            metadata = [
+                {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': name}}
+                for tid, name in self.thread_names.items()
+            ]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+
+def _apply_patches(module, patches):
+    """Replace class attributes of module with wrapped versions: [(class, attribute, wrap)]"""
+    for class_name, attribute, wrap in patches:
+        owner = getattr(module, class_name, None)
+        if owner is not None and hasattr(owner, attribute):
+            setattr(owner, attribute, wrap(getattr(owner, attribute)))
+
+
+class _PatchOnImport:
+    """Import hook that patches instrumented modules right after they are first imported"""
+
+    def __init__(self, pending: Dict[str, list]):
+        """Initialize hook with {module name: patches} still to apply"""
+        self.pending = pending
+
+    def find_spec(self, name, path, target=None):
+        """Find pending modules with the other finders and wrap their loader"""
+        if name not in self.pending:
+            return None
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, 'find_spec', None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _PatchingLoader(spec.loader, self.pending.pop(name))
+                    if not self.pending and self in sys.meta_path:
+                        sys.meta_path.remove(self)
+                return spec
+        return None
+
+
+class _PatchingLoader:
+    """Loader wrapper that applies patches once the module has executed"""
+
+    def __init__(self, loader, patches: list):
+        """Initialize wrapper around the module's real loader"""
+        self.loader = loader
+        self.patches = patches
+
+    def create_module(self, spec):
+        """Delegate module creation"""
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        """Run the module, then patch it"""
+        self.loader.exec_module(module)
+        _apply_patches(module, self.patches)
+
+    def __getattr__(self, name):
+        """Delegate everything else (get_source, resource readers, ...) to the real loader"""
+        return getattr(self.loader, name)
+
+
+def _body_size(request) -> int:
+    """Size of a prepared request body without reading streamed bodies"""
+    body = request.body
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    if isinstance(body, bytes):
+        return len(body)
+    try:
+        return len(body)
+    except TypeError:
+        return int(request.headers.get('Content-Length', 0) or 0)
+
+
+# Process-wide profiler used by --profile
+profiler = Profiler()
@@ -0,0 +1,158 @@
+"""Cron-style scheduling of team reports for daemon mode"""
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+
+
+class CronSchedule:
+    """Standard 5-field cron expression: minute hour day-of-month month day-of-week
+
+    Fields accept *, numbers, ranges (1-5), lists (1,15) and steps (*/15,
+    8-18/2). Day of week is 0-6 with 0 (or 7) as Sunday. As in cron, when
+    both day fields are restricted a time matches if either one does.
+    """
+
+    FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+
+    def __init__(self, expression: str):
+        """Parse expression, raising ValueError if it is invalid"""
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(parts)}: '{expression}'")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse_field(part, low, high, name) for part, (name, low, high) in zip(parts, self.FIELDS)
+        )
+        # 7 is an alias for Sunday
+        self.weekdays = {day % 7 for day in weekdays}
+        # As in cron, a day field starting with * (including */2) doesn't restrict the day
+        self._any_day = parts[2].startswith('*')
+        self._any_weekday = parts[4].startswith('*')
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int, name: str) -> Set[int]:
+        """Expand one cron field to the set of values it allows"""
+        values = set()
+        for item in field.split(','):
+            value_range, _, step = item.partition('/')
+            try:
+                step = int(step) if step else 1
+                if value_range == '*':
+                    start, end = low, high
+                elif '-' in value_range:
+                    start, end = (int(v) for v in value_range.split('-', 1))
+                else:
+                    start = int(value_range)
+                    end = high if step > 1 else start
+            except ValueError:
+                raise ValueError(f"Invalid cron {name} field: '{field}'")
+            if step < 1 or start < low or end > high or start > end:
+                raise ValueError(f"Cron {name} field out of range ({low}-{high}): '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches(self, moment: datetime) -> bool:
+        """Check whether the schedule fires in the minute of moment"""
+        return (moment.minute in self.minutes and moment.hour in self.hours
+                and moment.month in self.months and self._day_matches(moment))
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First time strictly after moment when the schedule fires"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Skip whole days and hours that can't match, so even sparse schedules are found quickly
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        """Day-of-month / day-of-week part of matches()"""
+        day_ok = moment.day in self.days
+        # datetime.weekday() is Monday=0; cron uses Sunday=0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def __repr__(self) -> str:
+        """Show the expression"""
+        return f"CronSchedule('{self.expression}')"
+
+
+def parse_team_schedules(value: str) -> Dict[str, str]:
+    """Parse 'Team=cron;Other Team=cron' into {team: cron expression}"""
+    schedules = {}
+    for entry in value.split(';'):
+        if '=' not in entry:
+            continue
+        team, expression = entry.split('=', 1)
+        if team.strip() and expression.strip():
+            schedules[team.strip()] = expression.strip()
+    return schedules
+
+
+class ReportScheduler:
+    """Run each team's report job on its own cron schedule until stopped
+
+    Teams due in the same minute are passed to run_due together. SIGINT and
+    SIGTERM stop the loop after the current run.
+    """
+
+    def __init__(self, teams: List[Dict], run_due: Callable[[List[Dict]], None], default_schedule: str,
+                 team_schedules: Optional[Dict[str, str]] = None):
+        """Initialize scheduler, raising ValueError for invalid cron expressions"""
+        team_schedules = team_schedules or {}
+        self.teams = teams
+        self.run_due = run_due
+        self.schedules = {
+            team['name']: CronSchedule(team_schedules.get(team['name'], default_schedule)) for team in teams
+        }
+        # Fail now rather than inside run_forever for expressions that never fire (e.g. 0 0 31 2 *)
+        now = datetime.now()
+        for schedule in self.schedules.values():
+            schedule.next_after(now)
+        self._stop = threading.Event()
+
+    def next_runs(self, now: Optional[datetime] = None) -> Dict[str, datetime]:
+        """Next run time per team"""
+        now = now or datetime.now()
+        return {name: schedule.next_after(now) for name, schedule in self.schedules.items()}
+
+    def stop(self, *_):
+        """Stop the loop (usable as a signal handler)"""
+        self._stop.set()
+
+    def run_forever(self, run_now: bool = False):
+        """Sleep until the next team is due, run it, repeat"""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self.stop)
+
+        if run_now:
+            self.run_due(list(self.teams))
+
+        last_checked = datetime.now()
+        while not self._stop.is_set():
+            next_runs = self.next_runs(last_checked)
+            due_at = min(next_runs.values())
+            print(f"\nNext run: {due_at.strftime('%Y-%m-%d %H:%M')} "
+                  f"({', '.join(name for name, at in next_runs.items() if at == due_at)})")
+            # Sleep in short steps so clock changes and stop requests are noticed
+            while not self._stop.is_set() and datetime.now() < due_at:
+                self._stop.wait(min(30.0, max(0.0, (due_at - datetime.now()).total_seconds())))
+            if self._stop.is_set():
+                break
+
+            due = [team for team in self.teams if next_runs[team['name']] == due_at]
+            self.run_due(due)
+            # Runs that outlast their next slot skip it, as cron does
+            last_checked = max(due_at, datetime.now())
+
+        print("\nScheduler stopped")
@@ -0,0 +1,214 @@
+"""Static JSON snapshots and HTML reports for the web dashboard"""
+import os
+import json
+import html
+from datetime import datetime
+from typing import List, Dict, Optional
+from metrics_cache import stable_hash
+import config
+
+
+def to_metrics_data(metrics: Dict) -> Dict:
+    """Convert comprehensive metrics to the dashboard's MetricsData shape (web/types/index.ts)"""
+    current = metrics.get('current_sprint', {})
+
+    ai_metrics = None
+    if current.get('has_ai_data', False):
+        ai_metrics = {
+            'committedStoryPoints': current.get('committed_story_points', 0),
+            'completedStoryPoints': current.get('completed_story_points', 0),
+            'timeSavedTotal': current.get('time_saved_total', 0),
+            'timeSavedPercent': current.get('time_saved_percent', 0),
+            'aiStoryPointsCommitted': current.get('ai_story_points_committed', 0)
+        }
+
+    return {
+        'currentSprint': {
+            'sprintName': current.get('sprint_name', 'Current Sprint'),
+            'committedStoryPoints': current.get('committed_story_points', 0),
+            'completedStoryPoints': current.get('completed_story_points', 0),
+            'completionRate': current.get('completion_rate', 0),
+            'defectCount': current.get('defect_count', 0)
+        },
+        'aiMetrics': ai_metrics,
+        # Commit data is not collected from Jira, so there are no commit metrics to report
+        'commitMetrics': None
+    }
+
+
+class SnapshotWriter:
+    """Write precomputed dashboard data so it can be served as static files
+
+    Layout under output_dir mirrors the dashboard API paths:
+
+        api/boards                       {"boards": [Board, ...]}
+        api/metrics/<boardId>            latest MetricsData
+        boards/<boardId>/<version>.json  every distinct MetricsData, versioned
+        boards/<boardId>/index.json      version history (newest last)
+        reports/<boardId>.html           self-contained HTML report
+    """
+
+    def __init__(self, output_dir: Optional[str] = None):
+        """Initialize writer"""
+        self.output_dir = output_dir or config.Config.SNAPSHOT_DIR
+
+    def write(self, team_config: Dict, metrics: Dict) -> Dict:
+        """Write a board's snapshot and HTML report, returning the paths written
+
+        A new version is only added when the MetricsData changed since the
+        latest snapshot.
+        """
+        board_id = str(team_config['board_id'])
+        data = to_metrics_data(metrics)
+        content_hash = stable_hash(data)
+
+        board_dir = os.path.join(self.output_dir, 'boards', board_id)
+        index_path = os.path.join(board_dir, 'index.json')
+        index = self._read_json(index_path) or []
+
+        if index and index[-1]['hash'] == content_hash:
+            version_file = index[-1]['file']
+        else:
+            timestamp = datetime.now()
+            version_file = f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{content_hash[:8]}.json"
+            self._write_json(os.path.join(board_dir, version_file), data)
+            index.append({
+                'version': len(index) + 1,
+                'generatedAt': timestamp.isoformat(timespec='seconds'),
+                'hash': content_hash,
+                'file': version_file
+            })
+            self._write_json(index_path, index)
+
+        latest_path = os.path.join(self.output_dir, 'api', 'metrics', board_id)
+        self._write_json(latest_path, data)
+
+        html_path = os.path.join(self.output_dir, 'reports', f"{board_id}.html")
+        self._write_text(html_path, render_html_report(team_config['name'], metrics, data))
+
+        return {
+            'version': os.path.join(board_dir, version_file),
+            'latest': latest_path,
+            'html': html_path
+        }
+
+    def write_boards(self, teams: List[Dict]) -> str:
+        """Write the board list in the dashboard's Board shape"""
+        path = os.path.join(self.output_dir, 'api', 'boards')
+        self._write_json(path, {
+            'boards': [
+                {'id': str(team['board_id']), 'name': team['name'], 'projectKey': team['project_key']}
+                for team in teams
+            ]
+        })
+        return path
+
+    def _read_json(self, path: str):
+        """Read a JSON file, or None if missing or invalid"""
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_json(self, path: str, value):
+        """Write JSON atomically"""
+        self._write_text(path, json.dumps(value, indent=2))
+
+    def _write_text(self, path: str, text: str):
+        """Write a text file atomically so static servers never see partial files"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+def render_html_report(team_name: str, metrics: Dict, data: Optional[Dict] = None) -> str:
+    """Render a self-contained HTML report (inline CSS and SVG charts, no external assets)"""
+    from charts import (
+        render_chart_svg, velocity_chart_spec, defect_chart_spec, ai_comparison_chart_spec,
+        burndown_chart_spec, scope_change_chart_spec
+    )
+
+    data = data or to_metrics_data(metrics)
+    current = metrics.get('current_sprint', {})
+    improvement = metrics.get('velocity_improvement', {})
+    defects = metrics.get('defect_metrics', {})
+    burndown = metrics.get('burndown')
+
+    sections = [
+        ("Current Sprint Metrics", [
+            ("Story Points Committed", current.get('committed_story_points', 0)),
+            ("Story Points Completed", current.get('completed_story_points', 0)),
+            ("Completion Rate", f"{current.get('completion_rate', 0)}%"),
+            ("Defects Found", current.get('defect_count', 0)),
+        ], None)
+    ]
+    if current.get('has_ai_data', False):
+        sections.append(("AI Impact: Time Saved Analysis", [
+            ("Estimated Story Points (Without AI)", f"{current.get('ai_story_points_committed', 0)} SP"),
+            ("Actual Story Points (With AI)", f"{current.get('committed_story_points', 0)} SP"),
+            ("Time Saved", f"{current.get('time_saved_total', 0)} SP ({current.get('time_saved_percent', 0)}%)"),
+        ], ai_comparison_chart_spec(current)))
+    if burndown:
+        remaining = burndown.get('remaining', [])
+        sections.append(("Sprint Burndown", [
+            ("Initial Commitment", f"{burndown.get('initial_commitment', 0)} SP"),
+            ("Remaining", f"{remaining[-1] if remaining else 0} SP"),
+        ], burndown_chart_spec(burndown)))
+        history = metrics.get('scope_change_history', [])
+        sections.append(("Scope Change", [
+            ("Scope Added", f"{burndown.get('scope_added', 0)} SP"),
+            ("Scope Removed", f"{burndown.get('scope_removed', 0)} SP"),
+            ("Net Scope Change", f"{burndown.get('scope_change_percent', 0)}%"),
+        ], scope_change_chart_spec(history) if history else None))
+    sections.append(("Velocity Improvement After AI Adoption", [
+        ("Baseline Velocity (Before AI)", f"{improvement.get('baseline_velocity', 0)} SP"),
+        ("Post-AI Velocity", f"{improvement.get('post_ai_velocity', 0)} SP"),
+        ("Improvement", f"{improvement.get('improvement_percent', 0)}%"),
+    ], velocity_chart_spec(improvement)))
+    sections.append(("Defect Metrics", [
+        ("Avg Defects (Before AI)", defects.get('baseline_avg_defects', 0)),
+        ("Avg Defects (After AI)", defects.get('post_ai_avg_defects', 0)),
+        ("Defect Reduction", f"{defects.get('defect_reduction_percent', 0)}%"),
+    ], defect_chart_spec(defects)))
+
+    body = []
+    for title, boxes, spec in sections:
+        body.append(f"<section><h2>{html.escape(title)}</h2><div class=\"metrics\">")
+        for label, value in boxes:
+            body.append(f"<div class=\"metric\"><span>{html.escape(label)}</span>"
+                        f"<strong>{html.escape(str(value))}</strong></div>")
+        body.append("</div>")
+        if spec:
+            body.append(f"<figure>{render_chart_svg(spec, 8, 3.5)}</figure>")
+        body.append("</section>")
+
+    title = f"{team_name} Sprint Velocity Report"
+    # MetricsData is embedded for scripts that want the raw numbers; '</' is escaped for the script tag
+    embedded = json.dumps(data).replace('</', '<\\/')
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 2rem auto; max-width: 60rem; color: #404040; }}
+h1, h2 {{ color: #003366; }}
+.metrics {{ display: flex; flex-wrap: wrap; gap: 1rem; }}
+.metric {{ flex: 1 1 12rem; background: #F5F5F5; border: 1px solid #C8C8C8; padding: 1rem; text-align: center; }}
+.metric span {{ display: block; font-weight: bold; font-size: 0.9rem; }}
+.metric strong {{ display: block; font-size: 1.6rem; color: #003366; margin-top: 0.5rem; }}
+figure {{ margin: 1rem 0; }}
+figure svg {{ width: 100%; height: auto; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p>Sprint: {html.escape(str(current.get('sprint_name', 'Current Sprint')))} | Generated: {datetime.now().strftime('%B %d, %Y')} | AI Adoption Date: {html.escape(str(metrics.get('ai_adoption_date', 'N/A')))}</p>
+{''.join(body)}
+<script type="application/json" id="metrics-data">{embedded}</script>
+</body>
+</html>
+"""
@@ -0,0 +1,163 @@
+"""Tests for replaying issue changelogs into sprint burndown and scope change"""
+import jira_client
+from burndown import BurndownReplayer
+from jira_client import JiraClient
+
+
+SPRINT_ID = 42
+SPRINT_FIELD = 'customfield_10020'
+POINTS_FIELD = 'customfield_10016'
+
+
+def make_replayer():
+    """Replayer for a finished 5-day sprint (2024-03-04 to 2024-03-08)"""
+    return BurndownReplayer(SPRINT_ID, '2024-03-04', '2024-03-08',
+                            story_point_fields=[POINTS_FIELD], sprint_field_id=SPRINT_FIELD)
+
+
+def change(day, field_id, from_string, to_string, from_value=None, to_value=None):
+    """One changelog history with a single item, on the given day of March 2024"""
+    return {
+        'created': f'2024-03-{day:02d}T10:00:00.000+0000',
+        'items': [{'fieldId': field_id, 'fromString': from_string, 'toString': to_string,
+                   'from': from_value, 'to': to_value}]
+    }
+
+
+def sprint_change(day, added):
+    """Move an issue into (added) or out of the sprint"""
+    ids = ('', str(SPRINT_ID)) if added else (str(SPRINT_ID), '')
+    return change(day, SPRINT_FIELD, '', '', from_value=ids[0], to_value=ids[1])
+
+
+def test_unchanged_issues_are_initial_commitment():
+    """Issues without changes count as committed from the first day"""
+    result = make_replayer().replay([
+        {'id': '1', 'story_points': 3, 'status': 'To Do'},
+        {'id': '2', 'story_points': 5, 'status': 'To Do'},
+    ], [])
+    assert result['committed'] == [8, 8, 8, 8, 8]
+    assert result['initial_commitment'] == 8
+    assert result['scope_added'] == 0 and result['scope_removed'] == 0
+
+
+def test_completion_burns_down_remaining():
+    """Moving an issue to Done lowers remaining but not committed points"""
+    result = make_replayer().replay(
+        [{'id': '1', 'story_points': 5, 'status': 'Done'}],
+        [{'issue_id': '1', 'histories': [change(6, 'status', 'In Progress', 'Done')]}]
+    )
+    assert result['committed'] == [5, 5, 5, 5, 5]
+    assert result['remaining'] == [5, 5, 0, 0, 0]
+
+
+def test_added_issue_is_scope_added():
+    """An issue moved into the sprint after it started is added scope"""
+    result = make_replayer().replay(
+        [{'id': '1', 'story_points': 3, 'status': 'To Do'}],
+        [{'issue_id': '1', 'histories': [sprint_change(5, added=True)]}]
+    )
+    assert result['committed'] == [0, 3, 3, 3, 3]
+    assert result['initial_commitment'] == 0
+    assert result['scope_added'] == 3
+
+
+def test_add_then_remove_counts_both():
+    """An issue added and later removed is added, then removed scope"""
+    removed_issue = {'id': '9', 'story_points': 5, 'status': 'To Do'}
+    result = make_replayer().replay(
+        [{'id': '1', 'story_points': 2, 'status': 'To Do'}],
+        [{'issue_id': '9', 'issue': removed_issue,
+          'histories': [sprint_change(5, added=True), sprint_change(7, added=False)]}]
+    )
+    assert result['committed'] == [2, 7, 7, 2, 2]
+    assert result['scope_added'] == 5
+    assert result['scope_removed'] == 5
+    assert result['daily_scope_change'] == [0, 5, 0, -5, 0]
+
+
+def test_re_estimate_is_not_scope_change():
+    """Changing points of an issue in the sprint counts as a re-estimate"""
+    result = make_replayer().replay(
+        [{'id': '1', 'story_points': 8, 'status': 'To Do'}],
+        [{'issue_id': '1', 'histories': [change(6, POINTS_FIELD, '5', '8')]}]
+    )
+    assert result['committed'] == [5, 5, 8, 8, 8]
+    assert result['re_estimated_points'] == 3
+    assert result['re_estimate_count'] == 1
+    assert result['scope_added'] == 0
+
+
+def test_pages_for_one_issue_in_any_order():
+    """Consecutive records for one issue are merged and replayed in time order"""
+    histories = [change(5, POINTS_FIELD, '2', '3'), change(7, POINTS_FIELD, '3', '5')]
+    issues = [{'id': '1', 'story_points': 5, 'status': 'To Do'}]
+    in_order = make_replayer().replay(issues, [{'issue_id': '1', 'histories': histories}])
+    split = make_replayer().replay(issues, [
+        {'issue_id': '1', 'histories': [histories[1]]},
+        {'issue_id': '1', 'histories': [histories[0]]},
+    ])
+    assert split == in_order
+    assert in_order['committed'] == [2, 3, 3, 5, 5]
+
+
+def test_non_contiguous_records_are_rejected():
+    """An issue's records arriving after another issue's would be replayed twice"""
+    issues = [{'id': '1', 'story_points': 1, 'status': 'To Do'}, {'id': '2', 'story_points': 1, 'status': 'To Do'}]
+    try:
+        make_replayer().replay(issues, [
+            {'issue_id': '1', 'histories': []},
+            {'issue_id': '2', 'histories': []},
+            {'issue_id': '1', 'histories': []},
+        ])
+    except ValueError:
+        return
+    raise AssertionError("Expected ValueError for non-contiguous records")
+
+
+class FakeResponse:
+    """Minimal requests.Response stand-in"""
+
+    def __init__(self, data):
+        self.status_code = 200
+        self.data = data
+        self.text = ''
+
+    def json(self):
+        return self.data
+
+
+def test_sprint_changelogs_include_removed_issues(monkeypatch):
+    """Issues that left the sprint are fetched, carry their final state and merge across pages"""
+    requests_made = []
+    search = {'issues': [
+        {'id': '1', 'fields': {'status': {'name': 'To Do'}, POINTS_FIELD: 2}},
+        {'id': '9', 'key': 'P-9', 'fields': {'status': {'name': 'To Do'}, POINTS_FIELD: 5}},
+    ]}
+    changelog_pages = [
+        {'issueChangeLogs': [{'issueId': '9', 'changeHistories': [sprint_change(5, added=True)]}],
+         'nextPageToken': 'next'},
+        {'issueChangeLogs': [{'issueId': '1', 'changeHistories': []},
+                             {'issueId': '9', 'changeHistories': [sprint_change(7, added=False)]}]},
+    ]
+
+    def fake_post(url, auth=None, json=None):
+        requests_made.append((url, json))
+        return FakeResponse(search if url.endswith('/search/jql') else changelog_pages.pop(0))
+
+    monkeypatch.setattr(jira_client.requests, 'post', fake_post)
+    monkeypatch.setattr(jira_client.config.Config, 'SPRINT_FIELD_ID', SPRINT_FIELD)
+    client = JiraClient.__new__(JiraClient)
+    client.server, client.auth = 'https://jira.example', None
+
+    records = list(client.iter_sprint_changelogs('7', SPRINT_ID, ['1']))
+
+    bulk_payload = [payload for url, payload in requests_made if url.endswith('/bulkfetch')][0]
+    assert bulk_payload['issueIdsOrKeys'] == ['1', '9']
+    assert [record['issue_id'] for record in records] == ['9', '1']
+    assert records[0]['issue']['story_points'] == 5
+    assert len(records[0]['histories']) == 2
+
+    result = make_replayer().replay([{'id': '1', 'story_points': 2, 'status': 'To Do'}], records)
+    assert result['scope_added'] == 5
+    assert result['scope_removed'] == 5
@@ -0,0 +1,66 @@
+"""Tests for the per-team report retention plan"""
+import pytest
+
+from confluence_uploader import ConfluenceUploader, parse_report_file_name
+
+
+def attachment(title, size=1024):
+    """Attachment listing entry"""
+    return {'id': title, 'title': title, 'extensions': {'fileSize': size}}
+
+
+def uploader_with(attachments):
+    """Uploader whose page lists the given attachments (no Confluence connection)"""
+    uploader = ConfluenceUploader.__new__(ConfluenceUploader)
+    uploader.page_id = '123'
+    uploader.iter_attachments = lambda page_id=None, refresh=False: iter(attachments)
+    return uploader
+
+
+def test_parse_report_file_name():
+    """Team names may contain underscores; other files don't match"""
+    team, generated_at = parse_report_file_name('Core_Platform_velocity_report_20240304_071500.pptx')
+    assert team == 'Core_Platform'
+    assert generated_at.isoformat() == '2024-03-04T07:15:00'
+    assert parse_report_file_name('notes.pptx') is None
+    assert parse_report_file_name('Team_velocity_report_20241399_000000.pptx') is None
+
+
+def test_keeps_newest_reports_per_team():
+    """The newest `keep` reports of each team are kept by file timestamp, not listing order"""
+    plan = uploader_with([
+        attachment('Alpha_velocity_report_20240101_070000.pptx', 100),
+        attachment('Alpha_velocity_report_20240301_070000.pptx'),
+        attachment('Beta_velocity_report_20240105_070000.pptx'),
+        attachment('Alpha_velocity_report_20240201_070000.pptx', 200),
+        attachment('diagram.png', 5000),
+        attachment('Alpha_velocity_report_20240215_070000.pptx'),
+    ]).plan_retention(2)
+
+    assert sorted(a['title'] for a in plan['keep']) == [
+        'Alpha_velocity_report_20240215_070000.pptx',
+        'Alpha_velocity_report_20240301_070000.pptx',
+        'Beta_velocity_report_20240105_070000.pptx',
+    ]
+    assert sorted(a['title'] for a in plan['prune']) == [
+        'Alpha_velocity_report_20240101_070000.pptx',
+        'Alpha_velocity_report_20240201_070000.pptx',
+    ]
+    assert plan['prune_bytes'] == 300
+
+
+def test_keep_must_be_positive():
+    """Keeping zero reports would delete everything"""
+    with pytest.raises(ValueError):
+        uploader_with([]).plan_retention(0)
+
+
+def test_dry_run_deletes_nothing():
+    """A dry run reports what would be pruned without removing attachments"""
+    uploader = uploader_with([
+        attachment('Alpha_velocity_report_20240101_070000.pptx', 100),
+        attachment('Alpha_velocity_report_20240201_070000.pptx', 200),
+    ])
+    uploader._remove_attachment = lambda *args: pytest.fail("dry run removed an attachment")
+    summary = uploader.prune_reports(1, dry_run=True)
+    assert summary == {'kept': 1, 'pruned': 1, 'failed': 0, 'bytes_reclaimed': 100, 'dry_run': True}
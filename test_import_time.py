@@ -0,0 +1,80 @@
+"""Check that the metrics-only import path stays fast
+
+Importing main (and the fetch/compute modules) must not load the rendering
+dependencies (matplotlib, python-pptx); those are imported only when a deck
+is built. The import time budget can be adjusted with IMPORT_TIME_BUDGET_MS.
+"""
+import os
+import sys
+import json
+import subprocess
+
+
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', '1000'))
+RENDERING_MODULES = ('matplotlib', 'pptx')
+
+# Runs in a fresh interpreter so modules imported by other tests don't hide regressions
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import main
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({
+    'elapsed_ms': elapsed_ms,
+    'loaded': [name for name in %r if name in sys.modules]
+}))
+"""
+
+
+def measure_import():
+    """Import main in a subprocess and report elapsed time and loaded rendering modules"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE % (RENDERING_MODULES,)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_metrics_path_skips_rendering_imports():
+    """Importing main must not load matplotlib or python-pptx"""
+    probe = measure_import()
+    assert probe['loaded'] == [], f"Rendering modules imported eagerly: {probe['loaded']}"
+
+
+def test_profiling_keeps_rendering_imports_lazy():
+    """--profile instruments rendering modules without importing them up front"""
+    probe = """
+import sys, json
+import main
+from profiler import profiler
+profiler.install()
+loaded = [name for name in %r if name in sys.modules]
+import ppt_generator
+print(json.dumps({'loaded': loaded, 'patched': hasattr(ppt_generator.PPTGenerator.save, '__wrapped__')}))
+""" % (RENDERING_MODULES + ('ppt_generator', 'pdf_report', 'snapshot'),)
+    result = subprocess.run(
+        [sys.executable, '-c', probe],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    outcome = json.loads(result.stdout.strip().splitlines()[-1])
+    assert outcome['loaded'] == [], f"Profiler imported modules eagerly: {outcome['loaded']}"
+    assert outcome['patched'], "Module imported after install() was not instrumented"
+
+
+def test_metrics_path_import_budget():
+    """Importing main must stay within the import time budget"""
+    probe = measure_import()
+    assert probe['elapsed_ms'] <= IMPORT_TIME_BUDGET_MS, (
+        f"Importing main took {probe['elapsed_ms']:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)"
+    )
+
+
+if __name__ == "__main__":
+    probe = measure_import()
+    print(f"Import time: {probe['elapsed_ms']:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)")
+    print(f"Rendering modules loaded: {', '.join(probe['loaded']) or 'none'}")
+    ok = not probe['loaded'] and probe['elapsed_ms'] <= IMPORT_TIME_BUDGET_MS
+    print("✓ Import check passed" if ok else "✗ Import check failed")
+    sys.exit(0 if ok else 1)
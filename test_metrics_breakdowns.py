@@ -0,0 +1,54 @@
+"""Tests for per-assignee and per-component sprint breakdowns"""
+from datetime import date
+
+from metrics_calculator import MetricsCalculator
+
+
+ISSUES = [
+    {'id': '1', 'story_points': 3, 'status': 'Done', 'labels': ['AI2'], 'is_defect': False,
+     'assignee': 'Ana', 'components': ['API', 'UI']},
+    {'id': '2', 'story_points': 5, 'status': 'In Progress', 'ai_points_saved': 1, 'is_defect': True,
+     'assignee': 'Ben', 'components': []},
+    {'id': '3', 'story_points': 2, 'status': 'Closed', 'ai_points_saved': -1, 'labels': [], 'is_defect': False,
+     'assignee': None, 'components': ['API']},
+]
+
+
+def calculator():
+    """Calculator without a metrics cache"""
+    return MetricsCalculator(date(2024, 1, 1))
+
+
+def test_group_by_aggregates_each_attribute():
+    """Points, completed points and defects are summed per value; missing values are 'Unassigned'"""
+    groups = calculator().group_by(ISSUES, ['assignee', 'components'])
+
+    assert groups['assignee'] == {
+        'Ben': {'issue_count': 1, 'story_points': 5, 'completed_story_points': 0,
+                'ai_points_saved': 1, 'defect_count': 1},
+        'Ana': {'issue_count': 1, 'story_points': 3, 'completed_story_points': 3,
+                'ai_points_saved': 2.0, 'defect_count': 0},
+        'Unassigned': {'issue_count': 1, 'story_points': 2, 'completed_story_points': 2,
+                       'ai_points_saved': 0, 'defect_count': 0},
+    }
+    # List values count the issue once per value; an empty list is 'Unassigned'
+    assert groups['components']['API']['story_points'] == 5
+    assert groups['components']['UI']['story_points'] == 3
+    assert groups['components']['Unassigned']['issue_count'] == 1
+
+
+def test_breakdown_ai_savings_reconcile_with_sprint_total():
+    """AI points saved per assignee add up to the sprint's time saved (label fallback, positive only)"""
+    sprint = {'metrics': {'issues': ISSUES, 'total_story_points': 10, 'completed_story_points': 5}}
+    calc = calculator()
+    total = calc.calculate_current_sprint_metrics(sprint)['time_saved_total']
+    breakdowns = calc.calculate_breakdowns(sprint)
+    assert sum(values['ai_points_saved'] for values in breakdowns['assignee'].values()) == total == 3
+    assert breakdowns['developer_story_points'] == {'Ben': 5, 'Ana': 3, 'Unassigned': 2}
+
+
+def test_breakdowns_need_fetched_fields():
+    """Sprints fetched without breakdown fields have no breakdowns"""
+    issues = [{key: value for key, value in issue.items() if key not in ('assignee', 'components')}
+              for issue in ISSUES]
+    assert calculator().calculate_breakdowns({'metrics': {'issues': issues}}) == {}
@@ -0,0 +1,50 @@
+"""Tests for the metrics cache's on-disk size cap"""
+import os
+
+from metrics_cache import MetricsCache
+
+
+def age(path, seconds_ago):
+    """Set a file's modification time into the past"""
+    when = os.path.getmtime(path) - seconds_ago
+    os.utime(path, (when, when))
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    """Once over max_bytes, the oldest files go first and recently read entries survive"""
+    cache = MetricsCache(cache_dir=str(tmp_path), max_bytes=10 ** 6)
+    for n, key in enumerate(('a', 'b', 'c')):
+        cache.put(key, {'payload': 'x' * 400})
+        age(cache._disk_path(key), 100 - n)     # a oldest, c newest
+
+    # Reading 'a' from disk (fresh cache, empty memory tier) marks it recently used
+    assert MetricsCache(cache_dir=str(tmp_path)).get('a') is not None
+
+    cache.max_bytes = 900
+    cache.put('d', {'payload': 'x' * 400})
+
+    assert sorted(os.listdir(tmp_path)) == ['a.json', 'd.json']
+
+
+def test_artifacts_count_towards_the_cap(tmp_path):
+    """Cached decks are evicted with the JSON entries, and reuse refreshes them"""
+    cache = MetricsCache(cache_dir=str(tmp_path), max_bytes=1500)
+    old_deck = cache.artifact_path('k1', 'Team_native_20240101.pptx')
+    with open(old_deck, 'wb') as f:
+        f.write(b'0' * 1000)
+    age(old_deck, 100)
+
+    new_deck = cache.artifact_path('k2', 'Team_native_20240102.pptx')
+    with open(new_deck, 'wb') as f:
+        f.write(b'0' * 1000)
+    cache.artifact_path('k3', 'Team_native_20240103.pptx')
+
+    assert not os.path.exists(old_deck)
+    assert os.path.exists(new_deck)
+
+
+def test_unsafe_suffix_characters_are_replaced(tmp_path):
+    """Team names with spaces or slashes stay inside the cache directory"""
+    path = MetricsCache(cache_dir=str(tmp_path)).artifact_path('key', 'Team A/B.pptx')
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.basename(path) == 'key_Team_A_B.pptx'
@@ -0,0 +1,62 @@
+"""Tests for the staged pipeline used by --pipeline"""
+import time
+
+from pipeline import Pipeline, Stage
+
+
+def test_results_in_input_order_with_failures(capsys):
+    """Failed items (None or an exception) are False; others reach the last stage"""
+    def fetch(item):
+        time.sleep(0.01 * (5 - item['n']))   # later items finish fetching first
+        return item
+
+    def compute(item):
+        if item['n'] == 1:
+            return None
+        if item['n'] == 3:
+            raise RuntimeError("boom")
+        item['value'] = item['n'] * 10
+        return item
+
+    done = []
+    pipeline = Pipeline([
+        Stage('fetch', fetch, workers=3),
+        Stage('compute', compute, workers=2),
+        Stage('render', lambda item: done.append(item['value']) or item, workers=2),
+    ], queue_size=1, describe=lambda item: f"item {item['n']}")
+
+    results = pipeline.run([{'n': n} for n in range(5)])
+
+    assert results == [True, False, True, False, True]
+    assert sorted(done) == [0, 20, 40]
+    assert [stage.stats['items'] for stage in pipeline.stages] == [5, 3, 3]
+    assert [stage.stats['failed'] for stage in pipeline.stages] == [0, 2, 0]
+    output = capsys.readouterr().out
+    assert "✗ compute failed for item 3: boom" in output
+    assert output.count("✓ item") == 3 and output.count("✗ item") == 2
+
+
+def test_each_items_output_is_printed_together(capsys):
+    """Output printed while an item is processed appears as one block before its status line"""
+    def stage(name):
+        def run(item):
+            print(f"{item} {name}")
+            time.sleep(0.005)
+            return item
+        return run
+
+    pipeline = Pipeline([Stage('a', stage('a'), workers=3), Stage('b', stage('b'), workers=3)])
+    pipeline.run(['x', 'y', 'z'])
+
+    lines = [line for line in capsys.readouterr().out.splitlines() if line]
+    for item in ('x', 'y', 'z'):
+        start = lines.index(f"{item} a")
+        assert lines[start + 1] == f"{item} b"
+        assert lines[start + 2].endswith(f"✓ {item}")
+
+
+def test_more_workers_than_items_and_empty_input():
+    """Every worker gets an end-of-input marker, so run() returns with few or no items"""
+    stages = [Stage('one', lambda item: item, workers=4), Stage('two', lambda item: item, workers=3)]
+    assert Pipeline(stages).run(['only']) == [True]
+    assert Pipeline([Stage('one', lambda item: item, workers=2)]).run([]) == []
@@ -0,0 +1,64 @@
+"""Tests for the org-wide portfolio roll-up"""
+from datetime import date
+
+from portfolio import PortfolioAggregator
+
+
+def summary(team, sprints, capacity=1.0):
+    """Team summary record with (start, end, completed points, defects) sprints"""
+    aggregator = PortfolioAggregator(date(2024, 3, 1))
+    return {
+        'team': team,
+        'capacity': capacity,
+        'current_sprint': {},
+        'sprints': [
+            {'end_date': end, 'length_days': aggregator._sprint_length(start, end),
+             'completed_story_points': points, 'defect_count': defects}
+            for start, end, points, defects in sprints
+        ]
+    }
+
+
+def aggregator_with(*summaries, sprint_length_days=14):
+    """Aggregator holding the given team summaries (no disk cache writes)"""
+    aggregator = PortfolioAggregator(date(2024, 3, 1), cache_dir='unused', sprint_length_days=sprint_length_days)
+    for team_summary in summaries:
+        aggregator.add_team_summary(team_summary)
+    return aggregator
+
+
+def test_monthly_trend_averages_sprints_per_team():
+    """Two sprints ending in one month count as one month of velocity, not double"""
+    alpha = summary('Alpha', [
+        ('2024-01-01', '2024-01-15', 20, 2),
+        ('2024-01-15', '2024-01-29', 30, 4),
+        ('2024-01-29', '2024-02-12', 40, 0),
+    ])
+    beta = summary('Beta', [('2024-01-16', '2024-01-30', 10, 1)])
+
+    metrics = aggregator_with(alpha, beta).calculate_portfolio_metrics()
+
+    assert metrics['velocity_trend'] == {'2024-01': 35, '2024-02': 40}
+    assert metrics['defect_trend'] == {'2024-01': 4, '2024-02': 0}
+
+
+def test_sprint_length_normalization():
+    """One-week sprints are scaled to the configured two-week length"""
+    weekly = summary('Weekly', [('2024-01-01', '2024-01-08', 10, 1)])
+    metrics = aggregator_with(weekly).calculate_portfolio_metrics()
+    assert metrics['velocity_trend'] == {'2024-01': 20}
+    assert metrics['defect_trend'] == {'2024-01': 2}
+
+
+def test_velocities_sum_and_percentages_weight_by_capacity():
+    """Org velocity is the sum over teams; improvement % is capacity weighted"""
+    before, after = '2024-02-01', '2024-04-01'
+    small = summary('Small', [('2024-01-18', before, 10, 0), ('2024-03-18', after, 20, 0)], capacity=1)
+    large = summary('Large', [('2024-01-18', before, 30, 0), ('2024-03-18', after, 30, 0)], capacity=3)
+
+    improvement = aggregator_with(small, large).calculate_portfolio_metrics()['velocity_improvement']
+
+    assert improvement['baseline_velocity'] == 40
+    assert improvement['post_ai_velocity'] == 50
+    assert improvement['improvement_percent'] == 25      # (1 * 100% + 3 * 0%) / 4
+    assert improvement['velocity_per_capacity'] == 12.5
@@ -0,0 +1,106 @@
+"""Tests for cron parsing and next-run calculation used by daemon mode"""
+from datetime import datetime
+
+import pytest
+
+from scheduler import CronSchedule, ReportScheduler, parse_team_schedules
+
+
+def test_parse_fields():
+    """Lists, ranges, steps and the Sunday alias expand to value sets"""
+    schedule = CronSchedule('*/15 8-18/2 1,15 * 7')
+    assert schedule.minutes == {0, 15, 30, 45}
+    assert schedule.hours == {8, 10, 12, 14, 16, 18}
+    assert schedule.days == {1, 15}
+    assert schedule.months == set(range(1, 13))
+    assert schedule.weekdays == {0}
+
+
+@pytest.mark.parametrize('expression', [
+    '* * * *',          # too few fields
+    '60 * * * *',       # minute out of range
+    '* 24 * * *',
+    '* * 0 * *',
+    '* * * 13 *',
+    '* * * * 8',
+    '5-1 * * * *',      # reversed range
+    '*/0 * * * *',      # zero step
+    'a * * * *',
+])
+def test_invalid_expressions(expression):
+    """Malformed or out-of-range fields raise ValueError"""
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_matches():
+    """matches() checks the minute a moment falls in"""
+    schedule = CronSchedule('30 7 * * 1-5')
+    assert schedule.matches(datetime(2024, 3, 4, 7, 30, 59))       # Monday
+    assert not schedule.matches(datetime(2024, 3, 4, 7, 31))
+    assert not schedule.matches(datetime(2024, 3, 3, 7, 30))       # Sunday
+
+
+def test_next_after_is_strictly_later():
+    """A moment exactly on a firing time returns the following one"""
+    schedule = CronSchedule('0 * * * *')
+    assert schedule.next_after(datetime(2024, 3, 4, 7, 0)) == datetime(2024, 3, 4, 8, 0)
+    assert schedule.next_after(datetime(2024, 3, 4, 7, 59, 30)) == datetime(2024, 3, 4, 8, 0)
+
+
+def test_next_after_weekdays_skip_weekend():
+    """Weekday schedules skip from Friday to Monday"""
+    schedule = CronSchedule('0 7 * * 1-5')
+    assert schedule.next_after(datetime(2024, 3, 8, 8, 0)) == datetime(2024, 3, 11, 7, 0)
+
+
+def test_next_after_rolls_over_month_and_year():
+    """Month and year boundaries are crossed"""
+    assert CronSchedule('0 0 1 * *').next_after(datetime(2024, 12, 15)) == datetime(2025, 1, 1)
+    assert CronSchedule('0 0 31 * *').next_after(datetime(2024, 4, 1)) == datetime(2024, 5, 31)
+
+
+def test_next_after_leap_day():
+    """Sparse schedules such as 29 February are found years ahead"""
+    assert CronSchedule('0 0 29 2 *').next_after(datetime(2024, 3, 1)) == datetime(2028, 2, 29)
+
+
+def test_day_of_month_or_weekday_when_both_restricted():
+    """With both day fields restricted a day matches if either does"""
+    schedule = CronSchedule('0 9 13 * 5')
+    # Wednesday 2024-03-13 matches by day of month, Friday 2024-03-15 by weekday
+    assert schedule.next_after(datetime(2024, 3, 12)) == datetime(2024, 3, 13, 9, 0)
+    assert schedule.next_after(datetime(2024, 3, 13, 9, 0)) == datetime(2024, 3, 15, 9, 0)
+
+
+def test_stepped_star_day_is_unrestricted():
+    """*/2 in the day field is unrestricted (as in cron), so the weekday must also match"""
+    schedule = CronSchedule('0 9 */2 * 1')
+    # 2024-03-04 is an even-numbered Monday, 2024-03-11 an odd-numbered one
+    assert schedule.next_after(datetime(2024, 3, 1)) == datetime(2024, 3, 11, 9, 0)
+    assert not schedule.matches(datetime(2024, 3, 5, 9, 0))        # odd day, Tuesday
+
+
+def test_never_firing_expression_raises():
+    """31 February never fires"""
+    with pytest.raises(ValueError):
+        CronSchedule('0 0 31 2 *').next_after(datetime(2024, 1, 1))
+
+
+def test_scheduler_validates_at_construction():
+    """ReportScheduler rejects schedules that never fire before it starts running"""
+    teams = [{'name': 'Alpha'}, {'name': 'Beta'}]
+    with pytest.raises(ValueError):
+        ReportScheduler(teams, lambda due: None, '0 7 * * *', {'Beta': '0 0 30 2 *'})
+
+
+def test_team_schedules_override_default():
+    """Per-team schedules replace the default for that team only"""
+    teams = [{'name': 'Alpha'}, {'name': 'Beta Team'}]
+    schedules = parse_team_schedules('Beta Team=30 6 * * 1; bad entry;=0 0 * * *')
+    assert schedules == {'Beta Team': '30 6 * * 1'}
+    scheduler = ReportScheduler(teams, lambda due: None, '0 7 * * *', schedules)
+    assert scheduler.next_runs(datetime(2024, 3, 4, 8, 0)) == {
+        'Alpha': datetime(2024, 3, 5, 7, 0),
+        'Beta Team': datetime(2024, 3, 11, 6, 30),
+    }
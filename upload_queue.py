@@ -0,0 +1,101 @@
+"""Background Confluence uploads pipelined with report generation"""
+import time
+import queue
+import threading
+from typing import Dict, List, Optional
+import config
+
+
+class UploadQueue:
+    """Upload reports on a worker thread while the next team is processed
+
+    Jobs wait in a bounded queue, so generation blocks instead of piling up
+    finished decks when uploads fall behind. Failed uploads are retried with
+    exponential backoff. close() waits for all uploads and returns the
+    per-report results.
+    """
+
+    def __init__(self, uploader, max_pending: Optional[int] = None, max_retries: Optional[int] = None,
+                 backoff_seconds: Optional[float] = None):
+        """Initialize queue and start the worker thread"""
+        self.uploader = uploader
+        self.max_retries = max_retries if max_retries is not None else config.Config.UPLOAD_MAX_RETRIES
+        self.backoff_seconds = backoff_seconds if backoff_seconds is not None else config.Config.UPLOAD_RETRY_BACKOFF
+        self._jobs = queue.Queue(maxsize=max_pending or config.Config.UPLOAD_QUEUE_SIZE)
+        self._results = []
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name='confluence-upload', daemon=True)
+        self._worker.start()
+
+    def submit(self, report_key: str, file_path: str, comment: str = "", content_hash: Optional[str] = None):
+        """Queue a report for upload (blocks while the queue is full)"""
+        self._jobs.put({
+            'report_key': report_key,
+            'file_path': file_path,
+            'comment': comment,
+            'content_hash': content_hash
+        })
+
+    def close(self) -> List[Dict]:
+        """Wait for queued uploads to finish and return their results"""
+        self._jobs.put(None)
+        self._worker.join()
+        with self._lock:
+            return list(self._results)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of reports per status ('uploaded', 'unchanged', 'failed')"""
+        counts = {'uploaded': 0, 'unchanged': 0, 'failed': 0}
+        with self._lock:
+            for result in self._results:
+                counts[result['status']] += 1
+        return counts
+
+    def summary(self) -> str:
+        """Human readable upload summary"""
+        counts = self.counts()
+        total = sum(counts.values())
+        return (f"{counts['uploaded'] + counts['unchanged']}/{total} up to date - uploaded: {counts['uploaded']}, "
+                f"unchanged: {counts['unchanged']}, failed: {counts['failed']}")
+
+    def _run(self):
+        """Worker loop"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            status, attempts = self._upload(job)
+            with self._lock:
+                self._results.append({
+                    'report_key': job['report_key'],
+                    'file_path': job['file_path'],
+                    'status': status,
+                    'attempts': attempts
+                })
+
+    def _upload(self, job: Dict):
+        """Upload one report with retries, returning (status, attempts)"""
+        report_key = job['report_key']
+        content_hash = job['content_hash']
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if (content_hash and config.Config.CONFLUENCE_SKIP_UNCHANGED
+                        and self.uploader.is_unchanged(report_key, content_hash)):
+                    print(f"[upload] {report_key}: metrics unchanged since the last upload, skipped")
+                    return 'unchanged', attempt
+                if self.uploader.upload_attachment(job['file_path'], comment=job['comment'],
+                                                   report_key=report_key, content_hash=content_hash):
+                    print(f"[upload] {report_key}: uploaded")
+                    return 'uploaded', attempt
+            except Exception as e:
+                print(f"[upload] {report_key}: error: {str(e)}")
+
+            if attempt > self.max_retries:
+                print(f"[upload] {report_key}: giving up after {attempt} attempt(s)")
+                return 'failed', attempt
+            delay = self.backoff_seconds * (2 ** (attempt - 1))
+            print(f"[upload] {report_key}: retrying in {delay:.0f}s")
+            time.sleep(delay)